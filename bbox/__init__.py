@@ -1,5 +1,10 @@
-from .bbox import BoundingBox
+from .array import BoundingBoxArray, FloatBoundingBoxArray
+from .bbox import BoundingBox, FloatBoundingBox, FrozenBoundingBox, FrozenFloatBoundingBox
+from .rotated import RotatedBoundingBox, RotatedBoundingBoxArray
 
 __all__ = [
-    'BoundingBox'
+    'BoundingBox', 'BoundingBoxArray',
+    'FloatBoundingBox', 'FloatBoundingBoxArray',
+    'FrozenBoundingBox', 'FrozenFloatBoundingBox',
+    'RotatedBoundingBox', 'RotatedBoundingBoxArray'
 ]
@@ -0,0 +1,375 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .bbox import BoundingBox, FloatBoundingBox
+
+if TYPE_CHECKING:
+    from .pipeline import Pipeline
+
+
+def _as_column(values, name: str) -> np.ndarray:
+    """
+    Convert the values into an integer column.
+
+    Args:
+        values (ArrayLike): The values of the column.
+        name (str): The name of the column, used in the error message.
+
+    Raises:
+        ValueError: If the values are not one-dimensional or not integral.
+
+    Returns:
+        np.ndarray: The column in `int64`.
+    """
+    column = np.asarray(values)
+    if column.ndim != 1:
+        raise ValueError(f'expected 1-dimensional {name}, got {column.ndim} dimensions')
+    if column.dtype.kind in 'biu':
+        return column.astype(np.int64, copy=False)
+    if column.dtype.kind == 'f':
+        integral = column.astype(np.int64)
+        if not np.array_equal(integral, column):
+            raise ValueError(f'expected integral {name}')
+        return integral
+    raise ValueError(f'expected numeric {name}, got {column.dtype}')
+
+
+def _as_float_column(values, name: str) -> np.ndarray:
+    """
+    Convert the values into a float column.
+
+    Args:
+        values (ArrayLike): The values of the column.
+        name (str): The name of the column, used in the error message.
+
+    Raises:
+        ValueError: If the values are not one-dimensional or not numeric.
+
+    Returns:
+        np.ndarray: The column in `float64`.
+    """
+    column = np.asarray(values)
+    if column.ndim != 1:
+        raise ValueError(f'expected 1-dimensional {name}, got {column.ndim} dimensions')
+    if column.dtype.kind not in 'biuf':
+        raise ValueError(f'expected numeric {name}, got {column.dtype}')
+    return column.astype(np.float64, copy=False)
+
+
+def _as_matrix(values, name: str) -> np.ndarray:
+    """
+    Convert the values into an integer matrix with 4 columns.
+
+    Args:
+        values (ArrayLike): The values in shape `(N, 4)`.
+        name (str): The name of the format, used in the error message.
+
+    Raises:
+        ValueError: If the shape of values is not `(N, 4)`.
+
+    Returns:
+        np.ndarray: The matrix in shape `(N, 4)`.
+    """
+    matrix = np.asarray(values)
+    if matrix.size == 0:
+        matrix = matrix.reshape(0, 4)
+    if matrix.ndim != 2 or matrix.shape[1] != 4:
+        raise ValueError(f'expected {name} in shape (N, 4), got {matrix.shape}')
+    return matrix
+
+
+class BoundingBoxArray:
+    """
+    A columnar container of bounding boxes.
+
+    The boxes are stored as four `int64` columns rather than a list of `BoundingBox`, all the operations
+    are vectorized over the columns and follow exactly the same integer semantics as `BoundingBox`.
+
+    Attributes:
+        x (np.ndarray): The x-coordinates of the center points of the bounding boxes.
+        y (np.ndarray): The y-coordinates of the center points of the bounding boxes.
+        w (np.ndarray): The widths of the bounding boxes. Raises error if any of them is negative.
+        h (np.ndarray): The heights of the bounding boxes. Raises error if any of them is negative.
+    """
+    __slots__ = ('x', 'y', 'w', 'h')
+
+    # The type of the single bounding box and the conversion of the columns
+    _box = BoundingBox
+    _dtype = np.int64
+    _column = staticmethod(_as_column)
+    _half = staticmethod(BoundingBox._half)
+
+    def __init__(self, x, y, w, h):
+        x = self._column(x, 'x')
+        y = self._column(y, 'y')
+        w = self._column(w, 'w')
+        h = self._column(h, 'h')
+        if not len(x) == len(y) == len(w) == len(h):
+            raise ValueError(f'expected columns in the same length, got {len(x)}, {len(y)}, {len(w)} and {len(h)}')
+        if (w < 0).any():
+            raise ValueError('w cannot be negative')
+        if (h < 0).any():
+            raise ValueError('h cannot be negative')
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    @classmethod
+    def construct_unchecked(cls, x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray) -> 'BoundingBoxArray':
+        """
+        Initialize the bounding boxes without validation, see `BoundingBox.construct_unchecked`.
+
+        The caller must guarantee that all of the columns are one-dimensional `int64` arrays in the same length
+        and the widths and heights are not negative.
+
+        Args:
+            x (np.ndarray): The x-coordinates of the center points of the bounding boxes.
+            y (np.ndarray): The y-coordinates of the center points of the bounding boxes.
+            w (np.ndarray): The widths of the bounding boxes.
+            h (np.ndarray): The heights of the bounding boxes.
+
+        Returns:
+            BoundingBoxArray: The corresponding bounding boxes.
+        """
+        boxes = cls.__new__(cls)
+        boxes.x = x
+        boxes.y = y
+        boxes.w = w
+        boxes.h = h
+        return boxes
+
+    @classmethod
+    def from_xyxy(cls, xyxy) -> 'BoundingBoxArray':
+        """
+        Initialize the bounding boxes with pairs of diagonal points.
+
+        Args:
+            xyxy (ArrayLike): The diagonal points in shape `(N, 4)`, each row is `(x1, y1, x2, y2)`.
+
+        Returns:
+            BoundingBoxArray: The corresponding bounding boxes.
+
+        Examples:
+            >>> boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (10, 10, 0, 0)])
+            >>> boxes[0] == boxes[1] == BoundingBox.from_xyxy(0, 0, 10, 10)
+            True
+        """
+        xyxy = _as_matrix(xyxy, 'xyxy')
+        x1, y1, x2, y2 = (cls._column(xyxy[:, i], name) for i, name in enumerate(('x1', 'y1', 'x2', 'y2')))
+
+        # Make sure (x1, y1) is at top-left and (x2, y2) is at bottom-right
+        x1, x2 = np.minimum(x1, x2), np.maximum(x1, x2)
+        y1, y2 = np.minimum(y1, y2), np.maximum(y1, y2)
+
+        w = x2 - x1
+        h = y2 - y1
+        return cls.construct_unchecked(x1 + cls._half(w), y1 + cls._half(h), w, h)
+
+    @classmethod
+    def from_tlwh(cls, tlwh) -> 'BoundingBoxArray':
+        """
+        Initialize the bounding boxes with top-left points, widths and heights.
+
+        Args:
+            tlwh (ArrayLike): The boxes in shape `(N, 4)`, each row is `(t, l, w, h)` as `BoundingBox.from_tlwh`.
+
+        Returns:
+            BoundingBoxArray: The corresponding bounding boxes.
+        """
+        tlwh = _as_matrix(tlwh, 'tlwh')
+        t, l, w, h = (cls._column(tlwh[:, i], name) for i, name in enumerate(('t', 'l', 'w', 'h')))
+        return cls(l + cls._half(w), t + cls._half(h), w, h)
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable[BoundingBox]) -> 'BoundingBoxArray':
+        """
+        Initialize the bounding boxes with a collection of `BoundingBox`.
+
+        Args:
+            boxes (Iterable[BoundingBox]): The bounding boxes.
+
+        Returns:
+            BoundingBoxArray: The corresponding bounding boxes.
+        """
+        xywh = np.array([(bbox.x, bbox.y, bbox.w, bbox.h) for bbox in boxes], dtype=cls._dtype).reshape(-1, 4)
+        return cls.construct_unchecked(xywh[:, 0].copy(), xywh[:, 1].copy(), xywh[:, 2].copy(), xywh[:, 3].copy())
+
+    @property
+    def width(self) -> np.ndarray:
+        """
+        The widths of the bounding boxes.
+        """
+        return self.w
+
+    @property
+    def height(self) -> np.ndarray:
+        """
+        The heights of the bounding boxes.
+        """
+        return self.h
+
+    @property
+    def area(self) -> np.ndarray:
+        """
+        The areas of the bounding boxes.
+        """
+        return self.w * self.h
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[BoundingBox]:
+        return iter(self.to_boxes())
+
+    def __getitem__(self, index) -> Union[BoundingBox, 'BoundingBoxArray']:
+        """
+        Select the bounding boxes.
+
+        Args:
+            index (int | slice | ArrayLike): An integer to get a single `BoundingBox`, or a slice,
+                an array of indices or a boolean mask to get a `BoundingBoxArray`.
+
+        Returns:
+            BoundingBox | BoundingBoxArray: The selected bounding box(es).
+        """
+        if isinstance(index, (int, np.integer)):
+            return self._box.construct_unchecked(self.x[index].item(), self.y[index].item(), self.w[index].item(), self.h[index].item())
+        if not isinstance(index, slice):
+            index = np.asarray(index)
+            if index.dtype.kind == 'b' and index.shape != self.x.shape:
+                raise IndexError(f'expected boolean mask in shape {self.x.shape}, got {index.shape}')
+        return self.construct_unchecked(self.x[index], self.y[index], self.w[index], self.h[index])
+
+    def __eq__(self, boxes: 'BoundingBoxArray') -> bool:
+        """
+        Determines whether all the bounding boxes are identical.
+
+        Args:
+            boxes (BoundingBoxArray): The another bounding boxes.
+
+        Returns:
+            bool: `True` if they are identical else `False`
+        """
+        if not isinstance(boxes, BoundingBoxArray):
+            return NotImplemented
+        return (
+            np.array_equal(self.x, boxes.x)
+            and np.array_equal(self.y, boxes.y)
+            and np.array_equal(self.w, boxes.w)
+            and np.array_equal(self.h, boxes.h)
+        )
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(size={len(self)})'
+
+    def anchor(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the edge points of the bounding boxes.
+
+        The value of `index` can refer to the number position on numpad, see `BoundingBox.anchor`.
+
+        Args:
+            index (int): The corresponding number for the pointed position.
+
+        Raises:
+            IndexError: If the index is not between 1 to 9.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The x-coordinates and y-coordinates of the corresponding points.
+        """
+        if not 1 <= index <= 9:
+            raise IndexError(f'expected index between 1 to 9, got {index}')
+        column, row = (index - 1) % 3, (index - 1) // 3
+        dw = self._half(self.w)
+        dh = self._half(self.h)
+        x = self.x + (column - 1) * dw
+        y = self.y + (1 - row) * dh
+        return x, y
+
+    def to_xyxy(self) -> np.ndarray:
+        """
+        Format the bounding boxes in array of `(x1, y1, x2, y2)`
+
+        Returns:
+            np.ndarray: The array in shape `(N, 4)`, each row is `(x1, y1, x2, y2)`
+        """
+        dw = self._half(self.w)
+        dh = self._half(self.h)
+        return np.stack((self.x - dw, self.y - dh, self.x + dw, self.y + dh), axis=1)
+
+    def to_tlwh(self) -> np.ndarray:
+        """
+        Format the bounding boxes in array of `(t, l, w, h)`, same as `BoundingBox.to_tlwh`
+
+        Returns:
+            np.ndarray: The array in shape `(N, 4)`, each row is `(t, l, w, h)`
+        """
+        return np.stack((self.x - self._half(self.w), self.y - self._half(self.h), self.w, self.h), axis=1)
+
+    def to_boxes(self) -> List[BoundingBox]:
+        """
+        Convert the bounding boxes into a list of `BoundingBox`.
+
+        Returns:
+            List[BoundingBox]: The bounding boxes.
+        """
+        return [
+            self._box.construct_unchecked(x, y, w, h)
+            for x, y, w, h in zip(self.x.tolist(), self.y.tolist(), self.w.tolist(), self.h.tolist())
+        ]
+
+    def pipe(self) -> 'Pipeline':
+        """
+        Start a lazy pipeline of transforms over the bounding boxes, see `bbox.pipeline.Pipeline`.
+
+        Returns:
+            Pipeline: The empty pipeline.
+        """
+        # The pipeline is built on the arrays, so it is imported once used
+        from .pipeline import Pipeline
+        return Pipeline(self)
+
+
+class FloatBoundingBoxArray(BoundingBoxArray):
+    """
+    A columnar container of bounding boxes in sub-pixel precision.
+
+    The columns are stored in `float64` and follow the same semantics as `FloatBoundingBox`, the corners are
+    never snapped to the pixels. All the vectorized operations on `BoundingBoxArray` are shared.
+    """
+    __slots__ = ()
+
+    _box = FloatBoundingBox
+    _dtype = np.float64
+    _column = staticmethod(_as_float_column)
+    _half = staticmethod(FloatBoundingBox._half)
+
+    def to_pixels(self) -> BoundingBoxArray:
+        """
+        Round the corners to the nearest pixels.
+
+        Returns:
+            BoundingBoxArray: The corresponding bounding boxes in pixels.
+        """
+        return BoundingBoxArray.from_xyxy(np.rint(self.to_xyxy()))
+
+
+def as_array(boxes: Union[BoundingBoxArray, Iterable[BoundingBox]]) -> BoundingBoxArray:
+    """
+    Convert the bounding boxes into `BoundingBoxArray` if they are not.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes.
+
+    Returns:
+        BoundingBoxArray: The bounding boxes, returned as is if it is already a `BoundingBoxArray`. The ones containing
+            any `FloatBoundingBox` are converted into `FloatBoundingBoxArray`.
+    """
+    if isinstance(boxes, BoundingBoxArray):
+        return boxes
+    boxes = list(boxes)
+    if any(isinstance(bbox, FloatBoundingBox) for bbox in boxes):
+        return FloatBoundingBoxArray.from_boxes(boxes)
+    return BoundingBoxArray.from_boxes(boxes)
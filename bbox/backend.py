@@ -0,0 +1,94 @@
+import importlib
+import importlib.util
+import os
+import warnings
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, List, Optional
+
+_BACKENDS = ('python', 'numba')
+
+# The module of the native kernels, `None` for the pure Python implementation
+_native: Optional[ModuleType] = None
+
+
+def available_backends() -> List[str]:
+    """
+    Get the backends available in the environment, the pure Python one is always available.
+
+    Returns:
+        List[str]: The names of the backends.
+    """
+    return [name for name in _BACKENDS if name == 'python' or importlib.util.find_spec(name) is not None]
+
+
+def get_backend() -> str:
+    """
+    Get the backend of the scalar measurements and transforms.
+
+    Returns:
+        str: The name of the backend, either `python` or `numba`.
+    """
+    return 'python' if _native is None else 'numba'
+
+
+def set_backend(name: str) -> str:
+    """
+    Select the backend of the scalar measurements and transforms, such as `bbox.measure.iou` called
+    in per-object code which cannot be batched.
+
+    The `numba` backend compiles the arithmetic into native kernels, each kernel is compiled on the first call
+    with the types of the bounding boxes. The results are identical to the pure Python ones. It falls back to
+    the pure Python backend with a warning if Numba is not installed, and `auto` selects the fastest available
+    backend. The backend is also selected at import by the environment variable `BBOX_BACKEND`.
+
+    Only `iou`, `giou`, `diou`, `ciou` and `all_ious` of `bbox.measure` and `smallest_enclosing` of
+    `bbox.transform` have native kernels. `intersect`, `union` and `scaling` always run in Python, since calling
+    a kernel costs more than their few comparisons, and `scaling` is dominated by creating the bounding box.
+
+    Args:
+        name (str): The backend, either `python`, `numba` or `auto`.
+
+    Returns:
+        str: The name of the selected backend.
+
+    Examples:
+        >>> from bbox import BoundingBox
+        >>> from bbox.measure import iou
+        >>> set_backend('numba')  # doctest: +SKIP
+        'numba'
+        >>> round(iou(BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)), 4)   # The same score on either backend
+        0.1429
+        >>> set_backend('python')
+        'python'
+    """
+    global _native
+    assert name in _BACKENDS + ('auto',), f'expected backend python, numba or auto, got {name}'
+    if name == 'auto':
+        name = available_backends()[-1]
+    if name == 'numba' and 'numba' not in available_backends():
+        warnings.warn('numba is not installed, fall back to the pure Python backend', RuntimeWarning, stacklevel=2)
+        name = 'python'
+    _native = importlib.import_module('.native', __package__) if name == 'numba' else None
+    return name
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """
+    Select the backend within the context, see `set_backend`.
+
+    Args:
+        name (str): The backend, either `python`, `numba` or `auto`.
+
+    Yields:
+        str: The name of the selected backend.
+    """
+    previous = get_backend()
+    try:
+        yield set_backend(name)
+    finally:
+        set_backend(previous)
+
+
+set_backend(os.environ.get('BBOX_BACKEND', 'python'))
@@ -1,6 +1,14 @@
-from typing import Tuple
+from functools import cached_property
+from typing import Any, Dict, Optional, Tuple
 
-from pydantic import BaseModel, NonNegativeInt
+from pydantic import BaseModel, ConfigDict, NonNegativeFloat, NonNegativeInt
+
+from .instrument import instrumented, register
+
+_object_setattr = object.__setattr__
+
+# The derived geometry cached in `__dict__` by `cached_property`, dropped once a field is changed
+_CACHED = ('_xyxy', 'area')
 
 
 class BoundingBox(BaseModel):
@@ -12,13 +20,60 @@ class BoundingBox(BaseModel):
         y (int): The y-coordinate of the center point of the bounding box.
         w (int): The width of the bounding box. Raises error if it is negative.
         h (int): The height of the bounding box. Raises error if it is negative.
+
+    The corners and area are computed once and cached, the cache is cleared if any attribute is assigned.
     """
     x: int
     y: int
     w: NonNegativeInt
     h: NonNegativeInt
 
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        for key in _CACHED:
+            self.__dict__.pop(key, None)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> 'BoundingBox':
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            for key in _CACHED:
+                copied.__dict__.pop(key, None)
+        return copied
+
+    @staticmethod
+    def _half(length: int) -> int:
+        """
+        The distance from the center to the edges, which snaps the odd length to the even one.
+        """
+        return length // 2
+
+    @classmethod
+    def construct_unchecked(cls, x: int, y: int, w: int, h: int) -> 'BoundingBox':
+        """
+        Initialize a bounding box without validation.
+
+        It is considerably faster than the validated initialization, but it is only safe for the trusted values,
+        such as the ones derived from other bounding boxes. Nothing is checked or converted, so the caller must
+        guarantee that all of them are `int` and the width and height are not negative.
+
+        Args:
+            x (int): The x-coordinate of the center point of the bounding box.
+            y (int): The y-coordinate of the center point of the bounding box.
+            w (int): The width of the bounding box.
+            h (int): The height of the bounding box.
+
+        Returns:
+            BoundingBox: The corresponding bounding box.
+        """
+        bbox = object.__new__(cls)
+        _object_setattr(bbox, '__dict__', {'x': x, 'y': y, 'w': w, 'h': h})
+        _object_setattr(bbox, '__pydantic_fields_set__', {'x', 'y', 'w', 'h'})
+        _object_setattr(bbox, '__pydantic_extra__', None)
+        _object_setattr(bbox, '__pydantic_private__', None)
+        return bbox
+
     @classmethod
+    @instrumented('BoundingBox.from_xyxy', boxes=1)
     def from_xyxy(cls, x1: int, y1: int, x2: int, y2: int) -> 'BoundingBox':
         """
         Initialize a bounding box with pair of diagonal points.
@@ -55,11 +110,12 @@ class BoundingBox(BaseModel):
 
         w = x2 - x1
         h = y2 - y1
-        x = x1 + w // 2
-        y = y1 + h // 2
+        x = x1 + cls._half(w)
+        y = y1 + cls._half(h)
         return cls(x=x, y=y, w=w, h=h)
 
     @classmethod
+    @instrumented('BoundingBox.from_tlwh', boxes=1)
     def from_tlwh(cls, t: int, l: int, w: int, h: int) -> 'BoundingBox':
         """
         Initialize a bounding box with top-left point, width and height.
@@ -73,8 +129,8 @@ class BoundingBox(BaseModel):
         Returns:
             BoundingBox: The corresponding bounding box.
         """
-        x = l + w // 2
-        y = t + h // 2
+        x = l + cls._half(w)
+        y = t + cls._half(h)
         return cls(x=x, y=y, w=w, h=h)
 
     @property
@@ -91,13 +147,19 @@ class BoundingBox(BaseModel):
         """
         return self.h
 
-    @property
+    @cached_property
     def area(self) -> int:
         """
         The area of the bounding box.
         """
         return self.w * self.h
 
+    @cached_property
+    def _xyxy(self) -> Tuple[int, int, int, int]:
+        dw = self._half(self.w)
+        dh = self._half(self.h)
+        return self.x - dw, self.y - dh, self.x + dw, self.y + dh
+
     def __eq__(self, bbox: 'BoundingBox') -> bool:
         """
         Determines whether the bounding boxes are identical.
@@ -118,6 +180,7 @@ class BoundingBox(BaseModel):
             return False
         return True
 
+    @instrumented('BoundingBox.anchor', boxes=1)
     def anchor(self, index: int) -> Tuple[int, int]:
         """
         Get the edge point of the bounding box.
@@ -150,8 +213,8 @@ class BoundingBox(BaseModel):
             ...
             IndexError: expected index between 1 to 9, got 10
         """
-        dw = self.w // 2
-        dh = self.h // 2
+        dw = self._half(self.w)
+        dh = self._half(self.h)
         if index == 1:
             return self.x - dw, self.y + dh
         elif index == 2:
@@ -173,6 +236,7 @@ class BoundingBox(BaseModel):
         else:
             raise IndexError(f'expected index between 1 to 9, got {index}')
 
+    @instrumented('BoundingBox.to_xyxy', boxes=1)
     def to_xyxy(self) -> Tuple[int, int, int, int]:
         """
         Format the bounding box in tuple of `(x1, y1, x2, y2)`
@@ -180,8 +244,9 @@ class BoundingBox(BaseModel):
         Returns:
             Tuple[int, int, int, int]: The tuple in format `(x1, y1, x2, y2)`
         """
-        return self.anchor(7) + self.anchor(3)
+        return self._xyxy
 
+    @instrumented('BoundingBox.to_tlwh', boxes=1)
     def to_tlwh(self) -> Tuple[int, int, int, int]:
         """
         Format the bounding box in tuple of `(t, l, w, h)`
@@ -189,4 +254,77 @@ class BoundingBox(BaseModel):
         Returns:
             Tuple[int, int, int, int]: The tuple in format `(t, l, w, h)`
         """
-        return self.anchor(7) + (self.w, self.h)
+        return self._xyxy[:2] + (self.w, self.h)
+
+
+# The validation of pydantic is inherited rather than defined, so it is registered separately
+register(BoundingBox, '__init__', 'BoundingBox.__init__', boxes=1)
+
+
+class FloatBoundingBox(BoundingBox):
+    """
+    A bounding box in sub-pixel precision, such as the raw output of a detector.
+
+    The center point is exactly at the middle of the corners, so the conversions are never snapped to the pixels.
+    It works with all the functions accepting `BoundingBox`.
+
+    Attributes:
+        x (float): The x-coordinate of the center point of the bounding box.
+        y (float): The y-coordinate of the center point of the bounding box.
+        w (float): The width of the bounding box. Raises error if it is negative.
+        h (float): The height of the bounding box. Raises error if it is negative.
+
+    Examples:
+        >>> bbox = FloatBoundingBox.from_xyxy(0, 0, 5, 3)
+        >>> bbox
+        FloatBoundingBox(x=2.5, y=1.5, w=5.0, h=3.0)
+        >>> bbox.to_xyxy()
+        (0.0, 0.0, 5.0, 3.0)
+    """
+    x: float
+    y: float
+    w: NonNegativeFloat
+    h: NonNegativeFloat
+
+    @staticmethod
+    def _half(length: float) -> float:
+        return length / 2
+
+    def to_pixels(self) -> BoundingBox:
+        """
+        Round the corners to the nearest pixels.
+
+        Returns:
+            BoundingBox: The corresponding bounding box in pixels.
+        """
+        return BoundingBox.from_xyxy(*(round(value) for value in self.to_xyxy()))
+
+
+class FrozenBoundingBox(BoundingBox):
+    """
+    An immutable and hashable bounding box, such as the keys of a dictionary or the members of a set.
+
+    It equals and hashes the same as any frozen bounding box with the same attributes, and raises error if any
+    attribute is assigned.
+
+    Examples:
+        >>> bbox = FrozenBoundingBox(x=5, y=5, w=10, h=10)
+        >>> {bbox: 'zone'}[FrozenBoundingBox.from_xyxy(0, 0, 10, 10)]
+        'zone'
+    """
+    model_config = ConfigDict(frozen=True)
+
+    def __hash__(self) -> int:
+        # Only the attributes are hashed, not the cached geometry in `__dict__` nor the class
+        return hash((self.x, self.y, self.w, self.h))
+
+
+class FrozenFloatBoundingBox(FrozenBoundingBox, FloatBoundingBox):
+    """
+    An immutable and hashable bounding box in sub-pixel precision, see `FrozenBoundingBox` and `FloatBoundingBox`.
+    """
+    # The fields of the first base take precedence, so the ones in sub-pixel precision are declared again
+    x: float
+    y: float
+    w: NonNegativeFloat
+    h: NonNegativeFloat
@@ -0,0 +1,279 @@
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .array import as_array
+from .measure.batch import Boxes
+
+Sizes = Union[Boxes, np.ndarray]
+
+
+class AnchorFitness(NamedTuple):
+    """
+    How well the anchors fit the bounding boxes.
+
+    Attributes:
+        average_iou (float): The mean IoU score of each bounding box with its best anchor.
+        best_possible_recall (float): The ratio of the bounding boxes whose best IoU score is greater than the threshold.
+    """
+    average_iou: float
+    best_possible_recall: float
+
+
+def _as_sizes(boxes: Sizes) -> np.ndarray:
+    """
+    Convert the bounding boxes into their widths and heights in shape `(N, 2)`.
+    """
+    if isinstance(boxes, np.ndarray):
+        assert boxes.ndim == 2 and boxes.shape[1] == 2, f'expected sizes in shape (N, 2), got {boxes.shape}'
+        assert (boxes >= 0).all(), 'sizes cannot be negative'
+        return boxes.astype(np.float64, copy=False)
+    boxes = as_array(boxes)
+    return np.stack((boxes.w, boxes.h), axis=1).astype(np.float64)
+
+
+def anchor_iou(boxes: Sizes, anchors: Sizes) -> np.ndarray:
+    """
+    Compute IoU scores of every pair of the bounding boxes and the anchors as if their center points coincide.
+
+    Only the widths and heights are compared, so it measures how well an anchor can be shifted onto a bounding box.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The bounding boxes, or their widths and
+            heights in shape `(N, 2)`.
+        anchors (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The anchors, or their widths and heights
+            in shape `(K, 2)`.
+
+    Returns:
+        np.ndarray: The IoU scores in shape `(N, K)`.
+
+    Examples:
+        >>> anchor_iou(np.array([(10, 10), (20, 5)]), np.array([(10, 10)]))
+        array([[1.        ],
+               [0.33333333]])
+    """
+    wh1, wh2 = _as_sizes(boxes), _as_sizes(anchors)
+    w1, h1 = wh1[:, 0, None], wh1[:, 1, None]
+    w2, h2 = wh2[:, 0], wh2[:, 1]
+
+    # The intermediate matrices are updated in place, they dominate the cost of clustering
+    inter_area = np.minimum(w1, w2)
+    inter_area *= np.minimum(h1, h2)
+    union_area = (w1 * h1 + 1e-7) + w2 * h2
+    union_area -= inter_area
+    inter_area /= union_area
+    return inter_area
+
+
+def _init_centers(sizes: np.ndarray, weights: np.ndarray, k: int, init: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Choose the initial centers among the sizes, either at random or by k-means++ with distance `1 - iou`.
+
+    The sizes are drawn in proportion to their weights, the numbers of the bounding boxes in the same size.
+    """
+    if init == 'random':
+        return sizes[rng.choice(len(sizes), k, replace=False, p=weights / weights.sum())]
+    centers = [sizes[rng.choice(len(sizes), p=weights / weights.sum())]]
+    distances = 1 - anchor_iou(sizes, centers[0][None])[:, 0]
+    for _ in range(1, k):
+        # The next center is drawn with the probability proportional to the squared distance to the nearest one
+        probabilities = weights * np.square(distances)
+        total = probabilities.sum()
+        index = rng.choice(len(sizes), p=probabilities / total) if total > 0 else rng.integers(len(sizes))
+        centers.append(sizes[index])
+        distances = np.minimum(distances, 1 - anchor_iou(sizes, sizes[index][None])[:, 0])
+    return np.array(centers)
+
+
+def _sorted(centers: np.ndarray) -> np.ndarray:
+    return centers[np.argsort(centers[:, 0] * centers[:, 1], kind='stable')]
+
+
+def kmeans_anchors(
+    boxes: Sizes,
+    k: int = 9,
+    max_iter: int = 300,
+    init: str = 'k-means++',
+    seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Cluster the widths and heights of the bounding boxes into anchors by k-means with distance `1 - iou`.
+
+    Each bounding box is assigned to the anchor with the highest `anchor_iou`, then each anchor is moved to the mean
+    size of its bounding boxes, until the assignments no longer change. An anchor without bounding boxes is moved
+    to the bounding box fitting its anchor the worst. The bounding boxes in the same size are clustered once and
+    weighted by their number, since the sizes in pixels repeat a lot in a large dataset.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The bounding boxes, or their widths and
+            heights in shape `(N, 2)`, at least `k` in total.
+        k (int, optional): The number of anchors. Defaults to 9.
+        max_iter (int, optional): The maximum number of iterations. Defaults to 300.
+        init (str, optional): The initialization, either `k-means++` or `random`. Defaults to `k-means++`.
+        seed (int, optional): The seed of the initialization. Defaults to a random seed.
+
+    Returns:
+        np.ndarray: The widths and heights of the anchors in shape `(k, 2)`, sorted by the areas.
+    """
+    assert k > 0, 'k must be positive'
+    assert max_iter > 0, 'max iterations must be positive'
+    assert init in ('k-means++', 'random'), f'expected init k-means++ or random, got {init}'
+    sizes, weights = np.unique(_as_sizes(boxes), axis=0, return_counts=True)
+    assert len(sizes) >= k, f'expected at least {k} bounding boxes in different sizes, got {len(sizes)}'
+
+    centers = _init_centers(sizes, weights.astype(np.float64), k, init, np.random.default_rng(seed))
+    labels = None
+    for _ in range(max_iter):
+        scores = anchor_iou(sizes, centers)
+        assigned = scores.argmax(axis=1)
+        if labels is not None and np.array_equal(assigned, labels):
+            break
+        labels = assigned
+
+        counts = np.bincount(labels, weights=weights, minlength=k)
+        for axis in range(2):
+            centers[:, axis] = np.bincount(labels, weights=sizes[:, axis] * weights, minlength=k) / np.maximum(counts, 1)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            worst = np.argsort(scores[np.arange(len(sizes)), labels], kind='stable')[:len(empty)]
+            centers[empty] = sizes[worst]
+    return _sorted(centers)
+
+
+class MiniBatchKMeans:
+    """
+    An incremental k-means with distance `1 - iou` over the mini-batches of the bounding boxes, see `kmeans_anchors`.
+
+    The bounding boxes are fed batch by batch with `partial_fit`, such as the chunks or the images streamed from
+    a dataset reader, so the dataset never has to fit in the memory. Each anchor is the running mean size of all the
+    bounding boxes assigned to it. The first batches are buffered until `init_size` bounding boxes for the
+    initialization.
+
+    Args:
+        k (int, optional): The number of anchors. Defaults to 9.
+        init (str, optional): The initialization, either `k-means++` or `random`. Defaults to `k-means++`.
+        init_size (int, optional): The number of bounding boxes for the initialization, at least `k`. Defaults to 1024.
+        seed (int, optional): The seed of the initialization. Defaults to a random seed.
+
+    Examples:
+        >>> clustering = MiniBatchKMeans(k=2, init_size=4, seed=0)
+        >>> for sizes in ([(10, 10), (12, 8)], [(40, 60), (44, 56)], [(10, 12)]):
+        ...     clustering = clustering.partial_fit(np.array(sizes))
+        >>> clustering.anchors
+        array([[10.66666667, 10.        ],
+               [42.        , 58.        ]])
+    """
+
+    def __init__(self, k: int = 9, init: str = 'k-means++', init_size: int = 1024, seed: Optional[int] = None):
+        assert k > 0, 'k must be positive'
+        assert init in ('k-means++', 'random'), f'expected init k-means++ or random, got {init}'
+        assert init_size >= k, f'expected init size at least {k}, got {init_size}'
+        self.k = k
+        self.init = init
+        self.init_size = init_size
+        self._rng = np.random.default_rng(seed)
+        self._centers: Optional[np.ndarray] = None
+        self._counts = np.zeros(k, dtype=np.int64)
+        self._pending: List[np.ndarray] = []
+        self._n_pending = 0
+
+    @property
+    def n_seen(self) -> int:
+        """
+        The number of the bounding boxes fed so far.
+        """
+        return int(self._counts.sum()) + self._n_pending
+
+    @property
+    def anchors(self) -> np.ndarray:
+        """
+        The widths and heights of the current anchors in shape `(k, 2)`, sorted by the areas.
+
+        Raises:
+            RuntimeError: If fewer than `k` bounding boxes in different sizes are fed.
+        """
+        if self._centers is None and not self._initialize():
+            raise RuntimeError(f'expected at least {self.k} bounding boxes in different sizes')
+        return _sorted(self._centers)
+
+    def _initialize(self) -> bool:
+        """
+        Initialize the anchors with the buffered bounding boxes, they are kept buffered if not enough.
+        """
+        sizes = np.concatenate(self._pending) if self._pending else np.empty((0, 2))
+        unique, weights = np.unique(sizes, axis=0, return_counts=True)
+        if len(unique) < self.k:
+            self._pending = [sizes]
+            return False
+        self._pending, self._n_pending = [], 0
+        self._centers = _init_centers(unique, weights.astype(np.float64), self.k, self.init, self._rng)
+        self._update(sizes)
+        return True
+
+    def _update(self, sizes: np.ndarray):
+        labels = anchor_iou(sizes, self._centers).argmax(axis=1)
+        counts = np.bincount(labels, minlength=self.k)
+        total = self._counts + counts
+        for axis in range(2):
+            sums = np.bincount(labels, weights=sizes[:, axis], minlength=self.k)
+            self._centers[:, axis] = np.where(
+                total > 0, (self._centers[:, axis] * self._counts + sums) / np.maximum(total, 1), self._centers[:, axis]
+            )
+        self._counts = total
+
+    def partial_fit(self, boxes: Sizes) -> 'MiniBatchKMeans':
+        """
+        Update the anchors with a batch of the bounding boxes.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The bounding boxes, or their widths and
+                heights in shape `(N, 2)`.
+
+        Returns:
+            MiniBatchKMeans: The clustering itself.
+        """
+        sizes = _as_sizes(boxes)
+        if self._centers is not None:
+            if len(sizes):
+                self._update(sizes)
+            return self
+        self._pending.append(sizes)
+        self._n_pending += len(sizes)
+        if self._n_pending >= self.init_size:
+            self._initialize()
+        return self
+
+    def fit(self, batches: Iterable[Sizes]) -> 'MiniBatchKMeans':
+        """
+        Update the anchors with all the batches, see `partial_fit`.
+
+        Args:
+            batches (Iterable[BoundingBoxArray | Iterable[BoundingBox] | np.ndarray]): The batches of the bounding boxes.
+
+        Returns:
+            MiniBatchKMeans: The clustering itself.
+        """
+        for boxes in batches:
+            self.partial_fit(boxes)
+        return self
+
+
+def anchor_fitness(boxes: Sizes, anchors: Sizes, iou_threshold: float = 0.5) -> AnchorFitness:
+    """
+    Measure how well the anchors fit the bounding boxes.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The bounding boxes, or their widths and
+            heights in shape `(N, 2)`.
+        anchors (BoundingBoxArray | Iterable[BoundingBox] | np.ndarray): The anchors, or their widths and heights
+            in shape `(K, 2)`.
+        iou_threshold (float, optional): The minimum IoU score exclusively for a bounding box to be recalled.
+            Defaults to 0.5.
+
+    Returns:
+        AnchorFitness: The average IoU score and the best possible recall.
+    """
+    best = anchor_iou(boxes, anchors).max(axis=1, initial=0)
+    if not len(best):
+        return AnchorFitness(0.0, 0.0)
+    return AnchorFitness(float(best.mean()), float((best > iou_threshold).mean()))
@@ -0,0 +1,199 @@
+from typing import Dict, List
+
+import numpy as np
+
+from .array import as_array
+from .measure.batch import Boxes, iou_matrix
+
+
+class _ClassRecord:
+    """
+    The accumulated predictions of a class.
+
+    Attributes:
+        scores (np.ndarray): The scores of the predictions in descending order.
+        tp (np.ndarray): Whether the predictions are true positive under each IoU threshold, in shape `(N, T)`.
+        n_gt (int): The number of groundtruths.
+    """
+    __slots__ = ('scores', 'tp', 'n_gt', '_pending')
+
+    def __init__(self, n_thresholds: int):
+        self.scores = np.empty(0, dtype=np.float64)
+        self.tp = np.empty((0, n_thresholds), dtype=bool)
+        self.n_gt = 0
+        self._pending = []
+
+    def append(self, scores: np.ndarray, tp: np.ndarray, n_gt: int):
+        self.n_gt += n_gt
+        if len(scores):
+            self._pending.append((scores, tp))
+            if len(self._pending) >= 64:
+                self.compact()
+
+    def compact(self):
+        """
+        Merge the pending predictions into the sorted arrays.
+        """
+        if not self._pending:
+            return
+        scores = np.concatenate([self.scores] + [scores for scores, _ in self._pending])
+        tp = np.concatenate([self.tp] + [tp for _, tp in self._pending])
+        order = np.argsort(-scores, kind='stable')
+        self.scores, self.tp = scores[order], tp[order]
+        self._pending = []
+
+
+class DetectionEvaluator:
+    """
+    An incremental evaluator of object detection in COCO style.
+
+    The predictions and groundtruths are fed image by image with `update`, only the scores and the matching
+    results of the predictions are kept, so the memory does not grow with the images. The evaluators updated
+    in different processes can be combined with `merge`.
+
+    Args:
+        iou_thresholds (ArrayLike, optional): The IoU thresholds for matching. Defaults to `[0.5, 0.55, ..., 0.95]`.
+        max_detections (int, optional): The maximum number of predictions of each class in an image, the ones
+            with lower scores are ignored. Defaults to 100.
+
+    Examples:
+        >>> from bbox import BoundingBoxArray
+        >>> evaluator = DetectionEvaluator()
+        >>> evaluator.update(
+        ...     BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), scores=[0.9], labels=[0],
+        ...     gt_boxes=BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), gt_labels=[0]
+        ... )
+        >>> evaluator.compute()['AP']
+        1.0
+    """
+
+    def __init__(self, iou_thresholds=None, max_detections: int = 100):
+        if iou_thresholds is None:
+            iou_thresholds = np.linspace(0.5, 0.95, 10)
+        self.iou_thresholds = np.asarray(iou_thresholds, dtype=np.float64)
+        assert self.iou_thresholds.ndim == 1 and len(self.iou_thresholds), 'expected at least one IoU threshold'
+        assert max_detections > 0, 'max detections must be positive'
+        self.max_detections = max_detections
+        self._records: Dict[int, _ClassRecord] = {}
+
+    def _record(self, label: int) -> _ClassRecord:
+        if label not in self._records:
+            self._records[label] = _ClassRecord(len(self.iou_thresholds))
+        return self._records[label]
+
+    def _match(self, scores: np.ndarray, ious: np.ndarray) -> np.ndarray:
+        """
+        Greedily match the predictions sorted by scores to the unmatched groundtruths with the highest IoU.
+        """
+        n_thresholds = len(self.iou_thresholds)
+        thresholds = np.arange(n_thresholds)
+        tp = np.zeros((len(scores), n_thresholds), dtype=bool)
+        if not ious.shape[1]:
+            return tp
+        matched = np.zeros((n_thresholds, ious.shape[1]), dtype=bool)
+        for index in range(len(scores)):
+            candidates = np.where(matched, -1.0, ious[index])
+            best = candidates.argmax(axis=1)
+            hit = candidates[thresholds, best] >= self.iou_thresholds
+            tp[index] = hit
+            matched[thresholds[hit], best[hit]] = True
+        return tp
+
+    def update(self, boxes: Boxes, scores, labels, gt_boxes: Boxes, gt_labels):
+        """
+        Match the predictions to the groundtruths of an image and accumulate the results.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+            scores (ArrayLike): The confidence scores of the predictions in shape `(N,)`.
+            labels (ArrayLike): The class labels of the predictions in shape `(N,)`.
+            gt_boxes (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `M` in total.
+            gt_labels (ArrayLike): The class labels of the groundtruths in shape `(M,)`.
+        """
+        boxes = as_array(boxes)
+        gt_boxes = as_array(gt_boxes)
+        scores = np.asarray(scores, dtype=np.float64)
+        labels = np.asarray(labels, dtype=np.int64)
+        gt_labels = np.asarray(gt_labels, dtype=np.int64)
+        assert scores.shape == labels.shape == (len(boxes),), f'expected scores and labels in shape ({len(boxes)},)'
+        assert gt_labels.shape == (len(gt_boxes),), f'expected groundtruth labels in shape ({len(gt_boxes)},)'
+
+        for label in np.union1d(labels, gt_labels).tolist():
+            pred_indices = np.flatnonzero(labels == label)
+            gt_indices = np.flatnonzero(gt_labels == label)
+            pred_indices = pred_indices[np.argsort(-scores[pred_indices], kind='stable')][:self.max_detections]
+
+            ious = iou_matrix(boxes[pred_indices], gt_boxes[gt_indices])
+            tp = self._match(scores[pred_indices], ious)
+            self._record(label).append(scores[pred_indices], tp, len(gt_indices))
+
+    def merge(self, other: 'DetectionEvaluator') -> 'DetectionEvaluator':
+        """
+        Merge the results accumulated by another evaluator, such as the one updated in another process.
+
+        Args:
+            other (DetectionEvaluator): The another evaluator with the same IoU thresholds.
+
+        Returns:
+            DetectionEvaluator: The evaluator itself.
+        """
+        assert np.array_equal(self.iou_thresholds, other.iou_thresholds), 'expected evaluators with the same IoU thresholds'
+        for label, record in other._records.items():
+            record.compact()
+            self._record(label).append(record.scores, record.tp, record.n_gt)
+        return self
+
+    @property
+    def labels(self) -> List[int]:
+        """
+        The labels seen in the predictions or groundtruths.
+        """
+        return sorted(self._records)
+
+    def compute(self) -> Dict[str, float]:
+        """
+        Compute the metrics over all the accumulated results.
+
+        The precision is interpolated at 101 recall points as COCO, the metrics are averaged over
+        the classes with at least one groundtruth.
+
+        Returns:
+            Dict[str, float]: The metrics including
+                - `AP`: The average precision averaged over the IoU thresholds.
+                - `AP50`, `AP75`, ...: The average precision at each IoU threshold.
+                - `AR`: The maximum recall averaged over the IoU thresholds.
+                Every metric is `nan` if there is no groundtruth.
+        """
+        recall_points = np.linspace(0, 1, 101)
+        precisions, recalls = [], []
+        for record in self._records.values():
+            if not record.n_gt:
+                continue
+            record.compact()
+            tp = np.cumsum(record.tp, axis=0)
+            fp = np.cumsum(~record.tp, axis=0)
+            recall = tp / record.n_gt
+            precision = tp / np.maximum(tp + fp, 1)
+
+            # Make the precision monotonically decreasing then sample at the recall points
+            precision = np.maximum.accumulate(precision[::-1], axis=0)[::-1]
+            average_precision = np.zeros(len(self.iou_thresholds))
+            max_recall = np.zeros(len(self.iou_thresholds))
+            for t in range(len(self.iou_thresholds)):
+                if not len(recall):
+                    continue
+                indices = np.searchsorted(recall[:, t], recall_points, side='left')
+                sampled = np.where(indices < len(recall), precision[np.minimum(indices, len(recall) - 1), t], 0)
+                average_precision[t] = sampled.mean()
+                max_recall[t] = recall[-1, t]
+            precisions.append(average_precision)
+            recalls.append(max_recall)
+
+        metrics = {}
+        precisions = np.array(precisions).reshape(-1, len(self.iou_thresholds))
+        recalls = np.array(recalls).reshape(-1, len(self.iou_thresholds))
+        metrics['AP'] = float(precisions.mean()) if precisions.size else float('nan')
+        for t, threshold in enumerate(self.iou_thresholds.tolist()):
+            metrics[f'AP{round(threshold * 100)}'] = float(precisions[:, t].mean()) if precisions.size else float('nan')
+        metrics['AR'] = float(recalls.mean()) if recalls.size else float('nan')
+        return metrics
@@ -0,0 +1,227 @@
+import math
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from .array import BoundingBoxArray, as_array
+from .bbox import BoundingBox
+from .measure.batch import Boxes, _Geometry, _geometry, _iou, _take
+
+
+class _Level:
+    """
+    The nodes in the same level of the R-tree.
+
+    The children of the i-th node are the consecutive nodes in the next level ranged in
+    `[i * group, min((i + 1) * group, size))`.
+    """
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'group')
+
+    def __init__(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, group: int):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.group = group
+
+    def parents(self, group: int) -> '_Level':
+        starts = np.arange(0, len(self.x1), group)
+        return _Level(
+            np.minimum.reduceat(self.x1, starts),
+            np.minimum.reduceat(self.y1, starts),
+            np.maximum.reduceat(self.x2, starts),
+            np.maximum.reduceat(self.y2, starts),
+            group
+        )
+
+
+def _children(nodes: np.ndarray, group: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expand the nodes into their children.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The position of the parent in `nodes` and the index of the child.
+    """
+    start = nodes * group
+    counts = np.minimum(start + group, size) - start
+    parents = np.repeat(np.arange(len(nodes)), counts)
+    children = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - start, counts)
+    return parents, children
+
+
+def _distance(x1, y1, x2, y2, a1, b1, a2, b2) -> np.ndarray:
+    dx = np.maximum(np.maximum(a1 - x2, x1 - a2), 0)
+    dy = np.maximum(np.maximum(b1 - y2, y1 - b2), 0)
+    return np.sqrt(dx * dx + dy * dy)
+
+
+class BoxIndex:
+    """
+    A static spatial index of bounding boxes.
+
+    The bounding boxes are bulk loaded into an R-tree packed by Sort-Tile-Recursive (STR) algorithm.
+    The queries traverse the tree level by level in vectorized form and are exact, the edges of the
+    bounding boxes follow `to_xyxy`, so the results are identical to `intersect` and `iou`.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes to be indexed.
+        leaf_size (int, optional): The maximum number of bounding boxes in a leaf. Defaults to 16.
+        fanout (int, optional): The maximum number of children of an internal node. Defaults to 16.
+
+    Examples:
+        >>> index = BoxIndex(BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (5, 5, 15, 15), (20, 20, 30, 30)]))
+        >>> index.query_intersecting(BoundingBox.from_xyxy(8, 8, 12, 12))
+        array([0, 1])
+    """
+
+    def __init__(self, boxes: Boxes, leaf_size: int = 16, fanout: int = 16):
+        assert leaf_size > 0, 'leaf size must be positive'
+        assert fanout > 1, 'fanout must be greater than 1'
+        self.boxes = as_array(boxes)
+        self._geometry = _geometry(self.boxes)
+        self._order = self._pack(leaf_size)
+
+        # Build the levels from the entries up to the root
+        g = self._geometry
+        order = self._order
+        entries = _Level(g.x1[order], g.y1[order], g.x2[order], g.y2[order], 0)
+        self._levels: List[_Level] = [entries]
+        if len(order):
+            self._levels.append(entries.parents(leaf_size))
+            while len(self._levels[-1].x1) > 1:
+                self._levels.append(self._levels[-1].parents(fanout))
+        self._levels.reverse()
+
+    def _pack(self, leaf_size: int) -> np.ndarray:
+        """
+        Sort the bounding boxes with STR algorithm, the leaves are the consecutive chunks of the order.
+        """
+        n = len(self.boxes)
+        n_leaves = math.ceil(n / leaf_size)
+        n_slices = max(math.ceil(math.sqrt(n_leaves)), 1)
+        by_x = np.argsort(self.boxes.x, kind='stable')
+        slices = np.arange(n) // (n_slices * leaf_size)
+        return by_x[np.lexsort((self.boxes.y[by_x], slices))]
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _intersecting(self, queries: _Geometry) -> Tuple[np.ndarray, np.ndarray]:
+        q = np.arange(len(queries.x))
+        nodes = np.zeros(len(q), dtype=np.int64)
+        if not len(self):
+            return q[:0], nodes[:0]
+
+        for level, child in zip(self._levels, self._levels[1:] + [None]):
+            overlap_w = np.minimum(level.x2[nodes], queries.x2[q]) - np.maximum(level.x1[nodes], queries.x1[q])
+            overlap_h = np.minimum(level.y2[nodes], queries.y2[q]) - np.maximum(level.y1[nodes], queries.y1[q])
+            mask = (overlap_w > 0) & (overlap_h > 0)
+            q, nodes = q[mask], nodes[mask]
+            if child is not None:
+                parents, nodes = _children(nodes, level.group, len(child.x1))
+                q = q[parents]
+
+        boxes = self._order[nodes]
+        order = np.lexsort((boxes, q))
+        return q[order], boxes[order]
+
+    def query_intersecting(self, bbox: BoundingBox) -> np.ndarray:
+        """
+        Find the bounding boxes intersecting with the query, i.e. `intersect(bbox, boxes[i]) > 0`.
+
+        Args:
+            bbox (BoundingBox): The query bounding box.
+
+        Returns:
+            np.ndarray: The indices of the intersecting bounding boxes in ascending order.
+        """
+        return self._intersecting(_geometry(BoundingBoxArray.from_boxes([bbox])))[1]
+
+    def query_intersecting_many(self, boxes: Boxes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the bounding boxes intersecting with each of the queries.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The query bounding boxes.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The indices of the queries and the indices of the intersecting
+                bounding boxes, sorted by the queries then the bounding boxes.
+        """
+        return self._intersecting(_geometry(as_array(boxes)))
+
+    def query_iou_above(self, bbox: BoundingBox, threshold: float) -> np.ndarray:
+        """
+        Find the bounding boxes whose IoU score with the query is greater than the threshold.
+
+        Args:
+            bbox (BoundingBox): The query bounding box.
+            threshold (float): The IoU threshold.
+
+        Returns:
+            np.ndarray: The indices of the bounding boxes in ascending order.
+        """
+        return self.query_iou_above_many([bbox], threshold)[1]
+
+    def query_iou_above_many(self, boxes: Boxes, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the bounding boxes whose IoU score with each of the queries is greater than the threshold.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The query bounding boxes.
+            threshold (float): The IoU threshold.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The indices of the queries and the indices of the bounding boxes,
+                sorted by the queries then the bounding boxes.
+        """
+        queries = _geometry(as_array(boxes))
+        if threshold >= 0 or not len(self):
+            # IoU score is positive only if the bounding boxes intersect
+            q, b = self._intersecting(queries)
+        else:
+            q, b = np.divmod(np.arange(len(queries.x) * len(self)), len(self))
+        scores = _iou(_take(queries, q), _take(self._geometry, b))
+        mask = scores > threshold
+        return q[mask], b[mask]
+
+    def nearest(self, target: Union[BoundingBox, Tuple[int, int]], k: int = 1) -> np.ndarray:
+        """
+        Find the nearest bounding boxes to a point or a bounding box.
+
+        The distance is the Euclidean distance between the closest points of the two, so it is 0 if the target
+        touches or overlaps the bounding box.
+
+        Args:
+            target (BoundingBox | Tuple[int, int]): The query bounding box or the xy-coordinate of the query point.
+            k (int, optional): The number of bounding boxes to be found. Defaults to 1.
+
+        Returns:
+            np.ndarray: The indices of the `k` nearest bounding boxes, sorted by the distances then the indices.
+        """
+        assert k > 0, 'k must be positive'
+        if isinstance(target, BoundingBox):
+            a1, b1, a2, b2 = target.to_xyxy()
+        else:
+            a1, b1 = a2, b2 = target
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        leaves, entries = self._levels[-2], self._levels[-1]
+        leaf_dist = _distance(leaves.x1, leaves.y1, leaves.x2, leaves.y2, a1, b1, a2, b2)
+        leaf_order = np.argsort(leaf_dist, kind='stable')
+
+        # Visit the leaves from the closest one, stop if the rest are farther than the k-th candidate
+        found = np.empty(0, dtype=np.int64)
+        found_dist = np.empty(0, dtype=np.float64)
+        for leaf in leaf_order.tolist():
+            if len(found) >= k and leaf_dist[leaf] > found_dist[k - 1]:
+                break
+            start = leaf * leaves.group
+            stop = min(start + leaves.group, len(entries.x1))
+            dist = _distance(entries.x1[start:stop], entries.y1[start:stop], entries.x2[start:stop], entries.y2[start:stop], a1, b1, a2, b2)
+            found = np.concatenate((found, self._order[start:stop]))
+            found_dist = np.concatenate((found_dist, dist))
+            order = np.lexsort((found, found_dist))[:k]
+            found, found_dist = found[order], found_dist[order]
+        return found
@@ -0,0 +1,222 @@
+import os
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .array import BoundingBoxArray, FloatBoundingBoxArray, _as_matrix
+
+PathLike = Union[str, os.PathLike]
+
+# The image axis of each column to be scaled if the coordinates are normalized, 0 for x and 1 for y
+_AXES = {
+    'xyxy': (0, 1, 0, 1),
+    'xywh': (0, 1, 0, 1),
+    'ltwh': (0, 1, 0, 1),
+    'tlwh': (1, 0, 0, 1)
+}
+
+
+def _as_numpy(values) -> np.ndarray:
+    """
+    Convert the values into a NumPy array, sharing the memory if possible.
+
+    The tensors supporting DLPack on CPU, such as the ones of PyTorch, are wrapped without copying.
+    """
+    if not isinstance(values, np.ndarray) and hasattr(values, '__dlpack__'):
+        try:
+            return np.from_dlpack(values)
+        except (BufferError, RuntimeError, TypeError):
+            pass
+    return np.asarray(values)
+
+
+def _to_pixels(matrix: np.ndarray, layout: str, image_size: Optional[Tuple[int, int]], subpixel: bool) -> np.ndarray:
+    """
+    Convert the coordinates into integral pixels, the integer matrix in pixels is returned as is.
+    """
+    if image_size is not None:
+        width, height = image_size
+        matrix = matrix * np.array((width, height), dtype=np.float64)[list(_AXES[layout])]
+    if subpixel:
+        return matrix.astype(np.float64, copy=False)
+    if matrix.dtype.kind == 'f':
+        matrix = np.rint(matrix)
+    return matrix
+
+
+def from_array(
+    values,
+    layout: str = 'xyxy',
+    image_size: Optional[Tuple[int, int]] = None,
+    validate: bool = True,
+    subpixel: bool = False
+) -> BoundingBoxArray:
+    """
+    Create the bounding boxes from an array in shape `(N, 4)`, such as the output of a detector.
+
+    The integer array in layout `xywh` is wrapped without copying, the columns of the bounding boxes
+    are the views of the array. The other ones are converted with vectorized operations, the float
+    coordinates are rounded to the nearest pixels.
+
+    Args:
+        values (ArrayLike): The bounding boxes in shape `(N, 4)`, either a NumPy array, a `np.memmap`,
+            a tensor supporting DLPack or `__array__`, or any array-like.
+        layout (str, optional): The layout of each row, one of
+            - `xyxy`: `(x1, y1, x2, y2)`.
+            - `xywh`: `(x, y, w, h)` where `(x, y)` is the center point, same as `BoundingBox`.
+            - `ltwh`: `(x1, y1, w, h)`, such as COCO annotations and `BoundingBoxArray.to_tlwh`.
+            - `tlwh`: `(t, l, w, h)` where `t` is `y1` and `l` is `x1`, same as `BoundingBoxArray.from_tlwh`.
+            Defaults to `xyxy`.
+        image_size (Tuple[int, int], optional): The width and height of the image if the coordinates are
+            normalized into `[0, 1]`. Defaults to the coordinates in pixels.
+        validate (bool, optional): Whether to check the widths and heights are not negative. Defaults to True.
+        subpixel (bool, optional): Whether to keep the coordinates in `FloatBoundingBoxArray` rather than rounding
+            them to the pixels. Defaults to False.
+
+    Raises:
+        ValueError: If the layout is unknown or the shape is not `(N, 4)`.
+
+    Returns:
+        BoundingBoxArray: The corresponding bounding boxes.
+
+    Examples:
+        >>> xywh = np.array([(5, 5, 10, 10), (20, 20, 4, 4)])
+        >>> boxes = from_array(xywh, layout='xywh')
+        >>> np.shares_memory(boxes.x, xywh)
+        True
+    """
+    if layout not in _AXES:
+        raise ValueError(f'expected layout in {", ".join(_AXES)}, got {layout}')
+    cls = FloatBoundingBoxArray if subpixel else BoundingBoxArray
+    matrix = _to_pixels(_as_matrix(_as_numpy(values), layout), layout, image_size, subpixel)
+    if matrix.dtype.kind in 'iu' and matrix.dtype != np.int64:
+        matrix = matrix.astype(np.int64)
+
+    if layout == 'xyxy':
+        # The corners are sorted, so the widths and heights are never negative
+        return cls.from_xyxy(matrix)
+
+    x, y, w, h = (matrix[:, i] for i in range(4))
+    if layout == 'tlwh':
+        x, y = y, x
+    if layout != 'xywh':
+        x = x + cls._half(w)
+        y = y + cls._half(h)
+    if validate:
+        return cls(x, y, w, h)
+    return cls.construct_unchecked(*(column.astype(cls._dtype, copy=False) for column in (x, y, w, h)))
+
+
+def from_buffer(
+    buffer,
+    dtype='float32',
+    layout: str = 'xyxy',
+    count: int = -1,
+    offset: int = 0,
+    image_size: Optional[Tuple[int, int]] = None,
+    validate: bool = True,
+    subpixel: bool = False
+) -> BoundingBoxArray:
+    """
+    Create the bounding boxes from a binary buffer of rows in 4 values, such as the output buffer of ONNX Runtime.
+
+    Args:
+        buffer (Buffer): Any object supporting the buffer protocol, such as `bytes`, `memoryview` or `mmap`.
+        dtype (DTypeLike, optional): The data type of the values. Defaults to `float32`.
+        layout (str, optional): The layout of each row, see `from_array`. Defaults to `xyxy`.
+        count (int, optional): The number of bounding boxes to read. Defaults to all of them.
+        offset (int, optional): The number of bytes to skip at the start of the buffer. Defaults to 0.
+        image_size (Tuple[int, int], optional): The width and height of the image if the coordinates are
+            normalized. Defaults to the coordinates in pixels.
+        validate (bool, optional): Whether to check the widths and heights are not negative. Defaults to True.
+        subpixel (bool, optional): Whether to keep the coordinates in sub-pixel precision, see `from_array`.
+            Defaults to False.
+
+    Returns:
+        BoundingBoxArray: The corresponding bounding boxes.
+    """
+    values = np.frombuffer(buffer, dtype=dtype, count=count * 4 if count >= 0 else -1, offset=offset)
+    return from_array(values.reshape(-1, 4), layout, image_size, validate, subpixel)
+
+
+def _map(path: PathLike, dtype, offset: int) -> np.ndarray:
+    """
+    Map the file into memory in shape `(N, 4)`, `.npy` files are read with their header and the others are raw.
+    """
+    if os.fspath(path).endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset).reshape(-1, 4)
+
+
+def load(
+    path: PathLike,
+    layout: str = 'xywh',
+    dtype='int64',
+    offset: int = 0,
+    image_size: Optional[Tuple[int, int]] = None,
+    validate: bool = True
+) -> BoundingBoxArray:
+    """
+    Load the bounding boxes from a `.npy` file or a raw binary file by memory mapping.
+
+    With `validate=False`, nothing is read until the bounding boxes are accessed, otherwise the widths and heights
+    are scanned once by the validation. The `int64` file in layout `xywh`, such as the one written by `save`, stays
+    on disk, the other ones are converted in memory once.
+
+    Args:
+        path (str | os.PathLike): The path of the file, the ones ending with `.npy` are read as NumPy files.
+        layout (str, optional): The layout of each row, see `from_array`. Defaults to `xywh`.
+        dtype (DTypeLike, optional): The data type of the raw file, ignored for `.npy`. Defaults to `int64`.
+        offset (int, optional): The number of bytes to skip in the raw file, ignored for `.npy`. Defaults to 0.
+        image_size (Tuple[int, int], optional): The width and height of the image if the coordinates are
+            normalized. Defaults to the coordinates in pixels.
+        validate (bool, optional): Whether to check the widths and heights are not negative. Defaults to True.
+
+    Returns:
+        BoundingBoxArray: The corresponding bounding boxes.
+    """
+    return from_array(_map(path, dtype, offset), layout, image_size, validate)
+
+
+def iter_chunks(
+    path: PathLike,
+    chunk_size: int = 1 << 20,
+    layout: str = 'xywh',
+    dtype='int64',
+    offset: int = 0,
+    image_size: Optional[Tuple[int, int]] = None,
+    validate: bool = True
+) -> Iterator[BoundingBoxArray]:
+    """
+    Scan the bounding boxes in a `.npy` file or a raw binary file chunk by chunk.
+
+    Only a chunk is converted in memory at a time, so the file can be larger than the memory.
+
+    Args:
+        path (str | os.PathLike): The path of the file, see `load`.
+        chunk_size (int, optional): The number of bounding boxes in each chunk. Defaults to 1048576.
+        layout (str, optional): The layout of each row, see `from_array`. Defaults to `xywh`.
+        dtype (DTypeLike, optional): The data type of the raw file, ignored for `.npy`. Defaults to `int64`.
+        offset (int, optional): The number of bytes to skip in the raw file, ignored for `.npy`. Defaults to 0.
+        image_size (Tuple[int, int], optional): The width and height of the image if the coordinates are
+            normalized. Defaults to the coordinates in pixels.
+        validate (bool, optional): Whether to check the widths and heights are not negative. Defaults to True.
+
+    Yields:
+        BoundingBoxArray: The bounding boxes in each chunk.
+    """
+    assert chunk_size > 0, 'chunk size must be positive'
+    mapped = _map(path, dtype, offset)
+    for start in range(0, len(mapped), chunk_size):
+        yield from_array(mapped[start:start + chunk_size], layout, image_size, validate)
+
+
+def save(path: PathLike, boxes: BoundingBoxArray):
+    """
+    Save the bounding boxes into a `.npy` file in `int64` layout `xywh`, which `load` maps without copying.
+
+    Args:
+        path (str | os.PathLike): The path of the file.
+        boxes (BoundingBoxArray): The bounding boxes.
+    """
+    np.save(path, np.stack((boxes.x, boxes.y, boxes.w, boxes.h), axis=1).astype(np.int64, copy=False))
@@ -0,0 +1,298 @@
+import functools
+import json
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# The active profiles, the instrumented functions record the calls and the methods are patched only while any
+# of them is active
+_profiles: List['Profile'] = []
+
+
+class _Stats:
+    __slots__ = ('calls', 'boxes', 'total', 'samples')
+
+    def __init__(self, max_samples: int):
+        self.calls = 0
+        self.boxes = 0
+        self.total = 0
+        self.samples = deque(maxlen=max_samples)
+
+
+class Profile:
+    """
+    The call counts, latencies and processed bounding boxes of the instrumented functions.
+
+    The latency of a function includes the instrumented functions called inside, the percentiles are estimated
+    from the recent calls of each function.
+
+    Args:
+        max_samples (int, optional): The number of the recent latencies kept for the percentiles of each function.
+            Defaults to 10000.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        assert max_samples > 0, 'max samples must be positive'
+        self.max_samples = max_samples
+        self._stats: Dict[str, _Stats] = {}
+
+    def add(self, name: str, elapsed: int, boxes: int):
+        """
+        Record a call of the function.
+
+        Args:
+            name (str): The name of the function.
+            elapsed (int): The latency in nanoseconds.
+            boxes (int): The number of bounding boxes processed.
+        """
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _Stats(self.max_samples)
+        stats.calls += 1
+        stats.boxes += boxes
+        stats.total += elapsed
+        stats.samples.append(elapsed)
+
+    def reset(self):
+        self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Summarize the records of each function, the times are in seconds.
+
+        Returns:
+            Dict[str, Dict[str, int | float]]: The `calls`, `boxes`, cumulative `total`, `mean`, `p50`, `p90` and `p99`
+                latencies of each function, sorted by the names.
+        """
+        snapshot = {}
+        for name in sorted(self._stats):
+            stats = self._stats[name]
+            p50, p90, p99 = np.quantile(np.array(stats.samples, dtype=np.float64), (0.5, 0.9, 0.99)) * 1e-9
+            snapshot[name] = {
+                'calls': stats.calls,
+                'boxes': stats.boxes,
+                'total': stats.total * 1e-9,
+                'mean': stats.total / stats.calls * 1e-9,
+                'p50': float(p50),
+                'p90': float(p90),
+                'p99': float(p99)
+            }
+        return snapshot
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Export the snapshot in JSON.
+
+        Args:
+            path (str, optional): The path of the file to write. Defaults to nothing written.
+
+        Returns:
+            str: The snapshot in JSON.
+        """
+        text = json.dumps(self.snapshot(), indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+
+def _count_boxes(args: tuple) -> int:
+    # The single bounding boxes have no length, the arrays count all of theirs
+    count = 0
+    for arg in args:
+        if hasattr(arg, 'w'):
+            count += len(arg) if hasattr(arg, '__len__') else 1
+    return count
+
+
+def _wrap(func: Callable, name: str, boxes: Optional[int]) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiles:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            count = _count_boxes(args) if boxes is None else boxes
+            for profile in _profiles:
+                profile.add(name, elapsed, count)
+    return wrapper
+
+
+class _Target:
+    """
+    A class attribute to be patched while any profile is active, the class is resolved once it is patched.
+    """
+
+    def __init__(self, owner: Union[type, Tuple[str, str]], attribute: str, name: str, boxes: Optional[int]):
+        self._owner = owner
+        self.attribute = attribute
+        self.name = name
+        self.boxes = boxes
+        self._original: Any = None
+
+    def owner(self) -> type:
+        if isinstance(self._owner, tuple):
+            module, qualname = self._owner
+            owner = sys.modules[module]
+            for part in qualname.split('.'):
+                owner = getattr(owner, part)
+            self._owner = owner
+        return self._owner
+
+    def patch(self):
+        # The inherited attribute is patched on the class and deleted afterwards
+        owner = self.owner()
+        self._original = owner.__dict__.get(self.attribute)
+        if isinstance(self._original, (classmethod, staticmethod)):
+            patched = type(self._original)(_wrap(self._original.__func__, self.name, self.boxes))
+        else:
+            patched = _wrap(getattr(owner, self.attribute), self.name, self.boxes)
+        setattr(owner, self.attribute, patched)
+
+    def unpatch(self):
+        owner = self.owner()
+        if self._original is None:
+            delattr(owner, self.attribute)
+        else:
+            setattr(owner, self.attribute, self._original)
+        self._original = None
+
+
+_targets: List[_Target] = []
+
+
+def register(owner: object, attribute: str, name: str, boxes: Optional[int] = None):
+    """
+    Register an attribute of a module or a class to be recorded by the active profiles.
+
+    The attribute of a class is patched on the class only while any profile is active, so the calls are untouched
+    otherwise. The function of a module is replaced once by a recording one, which only checks for the active profiles
+    when none is active. The references to the function taken before it is registered are not recorded.
+
+    Args:
+        owner (module | type): The module or the class owning the function.
+        attribute (str): The name of the attribute.
+        name (str): The name of the function in the records.
+        boxes (int, optional): The number of bounding boxes processed by a call. Defaults to counting the
+            bounding boxes and the lengths of the arrays in the positional arguments.
+    """
+    if not isinstance(owner, (type, tuple)):
+        setattr(owner, attribute, _wrap(getattr(owner, attribute), name, boxes))
+        return
+    target = _Target(owner, attribute, name, boxes)
+    _targets.append(target)
+    if _profiles:
+        target.patch()
+
+
+def instrumented(name: str, boxes: Optional[int] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorate a function or a method to be recorded by the active profiles, see `register`.
+
+    The function is wrapped once, so every reference to it is recorded, such as the ones imported by name or stored
+    in a cache, and the wrapper only checks for the active profiles when none is active. The method is returned as is
+    and only patched on its class while any profile is active, so nothing is added to the calls otherwise.
+    """
+    def decorator(func: Callable) -> Callable:
+        owner, _, attribute = func.__qualname__.rpartition('.')
+        if not owner:
+            return _wrap(func, name, boxes)
+        register((func.__module__, owner), attribute, name, boxes)
+        return func
+    return decorator
+
+
+def _activate(profile: 'Profile'):
+    if not _profiles:
+        for target in _targets:
+            target.patch()
+    _profiles.append(profile)
+
+
+def _deactivate(profile: 'Profile'):
+    _profiles.remove(profile)
+    if not _profiles:
+        for target in reversed(_targets):
+            target.unpatch()
+
+
+_global = Profile()
+
+
+def enable():
+    """
+    Start recording the instrumented functions into the global profile.
+    """
+    if _global not in _profiles:
+        _activate(_global)
+
+
+def disable():
+    """
+    Stop recording into the global profile, the records are kept until `reset`.
+    """
+    if _global in _profiles:
+        _deactivate(_global)
+
+
+def is_enabled() -> bool:
+    return _global in _profiles
+
+
+def reset():
+    """
+    Clear the records of the global profile.
+    """
+    _global.reset()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize the records of the global profile, see `Profile.snapshot`.
+    """
+    return _global.snapshot()
+
+
+def to_json(path: Optional[str] = None) -> str:
+    """
+    Export the snapshot of the global profile in JSON, see `Profile.to_json`.
+    """
+    return _global.to_json(path)
+
+
+@contextmanager
+def profile(max_samples: int = 10000) -> Iterator[Profile]:
+    """
+    Record the instrumented functions called in the block into a new profile.
+
+    The global profile keeps recording if it is enabled, and the nested blocks are recorded by all the
+    enclosing ones.
+
+    Args:
+        max_samples (int, optional): The number of the recent latencies kept for the percentiles of each function.
+            Defaults to 10000.
+
+    Yields:
+        Profile: The profile of the block.
+
+    Examples:
+        >>> from bbox import BoundingBox
+        >>> from bbox.measure import iou
+        >>> with profile() as records:
+        ...     score = iou(BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15))
+        >>> records.snapshot()['measure.iou']['calls']
+        1
+    """
+    scoped = Profile(max_samples)
+    _activate(scoped)
+    try:
+        yield scoped
+    finally:
+        _deactivate(scoped)
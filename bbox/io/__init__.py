@@ -0,0 +1,13 @@
+from .boxfile import BoxFile, BoxFileWriter, BoxRecord
+from .coco import read_coco, write_coco
+from .record import ImageAnnotations
+from .voc import read_voc, write_voc
+from .yolo import read_yolo, write_yolo
+
+__all__ = [
+    'ImageAnnotations',
+    'read_coco', 'write_coco',
+    'read_yolo', 'write_yolo',
+    'read_voc', 'write_voc',
+    'BoxFile', 'BoxFileWriter', 'BoxRecord'
+]
@@ -0,0 +1,366 @@
+import mmap
+import os
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..array import BoundingBoxArray, FloatBoundingBoxArray, as_array
+from ..ingest import PathLike
+from ..measure.batch import Boxes
+
+_MAGIC = b'BBOXCOL1'
+_VERSION = 1
+_COMPRESSED = 1
+
+# magic, version, flags
+_HEADER = struct.Struct('<8sII')
+# footer offset, number of chunks, number of images, magic
+_TRAILER = struct.Struct('<QQQ8s')
+# The byte sizes of the varint columns in a compressed chunk
+_CHUNK_HEADER = struct.Struct('<6Q')
+
+# The integer columns of a chunk in order, followed by the scores in float64
+_COLUMNS = ('x', 'y', 'w', 'h', 'image_id', 'label')
+# Whether the column is delta encoded in a compressed chunk
+_DELTA = (True, True, False, False, True, False)
+
+
+class BoxRecord(NamedTuple):
+    """
+    The bounding boxes of an image stored in a box file.
+
+    Attributes:
+        image_id (int): The id of the image.
+        boxes (BoundingBoxArray): The bounding boxes, `N` in total.
+        labels (np.ndarray): The class ids in shape `(N,)`.
+        scores (np.ndarray): The scores in shape `(N,)`.
+    """
+    image_id: int
+    boxes: BoundingBoxArray
+    labels: np.ndarray
+    scores: np.ndarray
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    return ((values >> np.uint64(1)).view(np.int64)) ^ -(values & np.uint64(1)).view(np.int64)
+
+
+def _encode_varint(values: np.ndarray) -> bytes:
+    """
+    Encode the unsigned integers in LEB128, 7 bits per byte with the highest bit marking continuation.
+    """
+    values = values.astype(np.uint64, copy=False)
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        n_bytes += values >= (np.uint64(1) << np.uint64(shift))
+
+    # The position of each byte in its value
+    positions = np.arange(n_bytes.sum()) - np.repeat(np.cumsum(n_bytes) - n_bytes, n_bytes)
+    repeated = np.repeat(values, n_bytes)
+    encoded = (repeated >> (7 * positions).astype(np.uint64)) & np.uint64(0x7f)
+    encoded |= np.where(positions < np.repeat(n_bytes, n_bytes) - 1, np.uint64(0x80), np.uint64(0))
+    return encoded.astype(np.uint8).tobytes()
+
+
+def _decode_varint(data: bytes, count: int) -> np.ndarray:
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    if not count:
+        return np.empty(0, dtype=np.uint64)
+    ends = np.flatnonzero(encoded < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    positions = np.arange(len(encoded)) - np.repeat(starts, ends - starts + 1)
+    shifted = (encoded & 0x7f).astype(np.uint64) << (7 * positions).astype(np.uint64)
+    return np.bitwise_or.reduceat(shifted, starts)
+
+
+def _encode_chunk(columns: List[np.ndarray], scores: np.ndarray) -> bytes:
+    encoded = []
+    for column, delta in zip(columns, _DELTA):
+        if delta and len(column):
+            column = np.diff(column, prepend=0)
+        encoded.append(_encode_varint(_zigzag(column)))
+    return _CHUNK_HEADER.pack(*map(len, encoded)) + b''.join(encoded) + scores.astype('<f8').tobytes()
+
+
+def _decode_chunk(data, n_rows: int) -> Tuple[List[np.ndarray], np.ndarray]:
+    sizes = _CHUNK_HEADER.unpack_from(data)
+    offset = _CHUNK_HEADER.size
+    columns = []
+    for size, delta in zip(sizes, _DELTA):
+        column = _unzigzag(_decode_varint(data[offset:offset + size], n_rows))
+        columns.append(np.cumsum(column) if delta else column)
+        offset += size
+    scores = np.frombuffer(data, dtype='<f8', count=n_rows, offset=offset)
+    return columns, scores
+
+
+class BoxFileWriter:
+    """
+    A writer of box files, a binary columnar format of bounding boxes with an index of images.
+
+    The file consists of a header, the chunks of consecutive images and a footer of the chunk table and the
+    image index. Each chunk stores the columns `x`, `y`, `w`, `h`, `image_id` and `label` in `int64` followed by
+    `score` in `float64`, so the bounding boxes in sub-pixel precision are rejected. If compressed, the integer columns are encoded in zigzag varint, where `x`, `y` and
+    `image_id` are delta encoded, otherwise they are fixed-width and memory mapped by `BoxFile`.
+
+    Args:
+        path (str | os.PathLike): The path of the file.
+        compress (bool, optional): Whether to compress the integer columns. Ignored if appending to an existing
+            file, which keeps its compression. Defaults to False.
+        chunk_size (int, optional): The number of bounding boxes buffered before writing a chunk. Defaults to 65536.
+        append (bool, optional): Whether to append to the existing file. Defaults to False.
+
+    Examples:
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'boxes.bbox')
+        >>> with BoxFileWriter(path) as writer:
+        ...     writer.write(BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), labels=[1], scores=[0.9])
+        0
+    """
+
+    def __init__(self, path: PathLike, compress: bool = False, chunk_size: int = 1 << 16, append: bool = False):
+        assert chunk_size > 0, 'chunk size must be positive'
+        self.chunk_size = chunk_size
+        self._chunks: List[Tuple[int, int]] = []
+        self._images: List[Tuple[int, int, int, int]] = []
+        self._pending: List[Tuple[List[np.ndarray], np.ndarray]] = []
+        self._n_pending = 0
+
+        if append and os.path.exists(path):
+            self._f = open(path, 'r+b')
+            self.compress, chunks, images, footer = _read_index(self._f)
+            self._chunks = [tuple(chunk) for chunk in chunks.tolist()]
+            self._images = [tuple(image) for image in images.tolist()]
+            self._f.seek(footer)
+            self._f.truncate()
+        else:
+            self._f = open(path, 'wb')
+            self.compress = compress
+            self._f.write(_HEADER.pack(_MAGIC, _VERSION, _COMPRESSED if compress else 0))
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def write(self, boxes: Boxes, labels=None, scores=None, image_id: Optional[int] = None) -> int:
+        """
+        Write the bounding boxes of an image.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes, `N` in total.
+            labels (ArrayLike, optional): The class ids in shape `(N,)`. Defaults to zeros.
+            scores (ArrayLike, optional): The scores in shape `(N,)`. Defaults to ones.
+            image_id (int, optional): The id of the image. Defaults to the index of the image in the file.
+
+        Raises:
+            ValueError: If the bounding boxes are in sub-pixel precision, which are not stored losslessly.
+
+        Returns:
+            int: The index of the image in the file.
+        """
+        boxes = as_array(boxes)
+        if isinstance(boxes, FloatBoundingBoxArray):
+            raise ValueError('expected bounding boxes in integers, got FloatBoundingBoxArray')
+        n = len(boxes)
+        labels = np.zeros(n, dtype=np.int64) if labels is None else np.asarray(labels, dtype=np.int64)
+        scores = np.ones(n, dtype=np.float64) if scores is None else np.asarray(scores, dtype=np.float64)
+        assert labels.shape == scores.shape == (n,), f'expected labels and scores in shape ({n},)'
+        index = len(self._images)
+        image_id = index if image_id is None else int(image_id)
+
+        self._images.append((image_id, len(self._chunks), self._n_pending, n))
+        columns = [boxes.x, boxes.y, boxes.w, boxes.h, np.full(n, image_id, dtype=np.int64), labels]
+        self._pending.append((columns, scores))
+        self._n_pending += n
+        if self._n_pending >= self.chunk_size:
+            self.flush()
+        return index
+
+    def flush(self):
+        """
+        Write the buffered images as a chunk.
+        """
+        if not self._pending:
+            return
+        columns = [np.concatenate(column).astype('<i8', copy=False) for column in zip(*(c for c, _ in self._pending))]
+        scores = np.concatenate([s for _, s in self._pending])
+        offset = self._f.tell()
+        if self.compress:
+            self._f.write(_encode_chunk(columns, scores))
+        else:
+            for column in columns:
+                self._f.write(column.tobytes())
+            self._f.write(scores.astype('<f8').tobytes())
+        self._chunks.append((offset, self._n_pending))
+        self._pending = []
+        self._n_pending = 0
+
+    def close(self):
+        """
+        Write the remaining images and the footer, then close the file.
+        """
+        if self._f.closed:
+            return
+        self.flush()
+        footer = self._f.tell()
+        self._f.write(np.array(self._chunks, dtype='<i8').reshape(-1, 2).tobytes())
+        self._f.write(np.array(self._images, dtype='<i8').reshape(-1, 4).tobytes())
+        self._f.write(_TRAILER.pack(footer, len(self._chunks), len(self._images), _MAGIC))
+        self._f.close()
+
+    def __enter__(self) -> 'BoxFileWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _read_index(f) -> Tuple[bool, np.ndarray, np.ndarray, int]:
+    """
+    Read the compression, the chunk table, the image index and the offset of the footer of a box file.
+    """
+    if f.seek(0, os.SEEK_END) < _HEADER.size + _TRAILER.size:
+        raise ValueError('expected box file with header and footer, the writer may not be closed')
+    f.seek(0)
+    magic, version, flags = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f'expected box file in version {_VERSION}')
+    f.seek(-_TRAILER.size, os.SEEK_END)
+    footer, n_chunks, n_images, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != _MAGIC:
+        raise ValueError('expected box file with footer, the writer may not be closed')
+    f.seek(footer)
+    chunks = np.frombuffer(f.read(n_chunks * 16), dtype='<i8').reshape(-1, 2)
+    images = np.frombuffer(f.read(n_images * 32), dtype='<i8').reshape(-1, 4)
+    return bool(flags & _COMPRESSED), chunks, images, footer
+
+
+class BoxFile:
+    """
+    A reader of box files written by `BoxFileWriter`.
+
+    The file is memory mapped, the bounding boxes of an image are found by the index in constant time.
+    The columns of an uncompressed file are the views of the mapped file without copying, the chunks of
+    a compressed file are decoded on demand and the last one is cached.
+
+    Args:
+        path (str | os.PathLike): The path of the file.
+
+    Examples:
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'boxes.bbox')
+        >>> with BoxFileWriter(path) as writer:
+        ...     writer.write(BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), labels=[1], scores=[0.9])
+        0
+        >>> with BoxFile(path) as f:
+        ...     f[0].boxes.to_xyxy()
+        array([[ 0,  0, 10, 10]])
+    """
+
+    def __init__(self, path: PathLike):
+        with open(path, 'rb') as f:
+            self.compressed, self._chunks, images, _ = _read_index(f)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.image_ids = images[:, 0]
+        self._image_chunks = images[:, 1]
+        self._image_starts = images[:, 2]
+        self._image_counts = images[:, 3]
+        self._cached: Tuple[int, Optional[Tuple[List[np.ndarray], np.ndarray]]] = (-1, None)
+
+    def __len__(self) -> int:
+        return len(self.image_ids)
+
+    @property
+    def n_boxes(self) -> int:
+        """
+        The total number of bounding boxes.
+        """
+        return int(self._chunks[:, 1].sum())
+
+    def _chunk(self, index: int) -> Tuple[List[np.ndarray], np.ndarray]:
+        if self._cached[0] == index:
+            return self._cached[1]
+        offset, n_rows = self._chunks[index].tolist()
+        if self.compressed:
+            chunk = _decode_chunk(memoryview(self._mmap)[offset:], n_rows)
+        else:
+            columns = [np.frombuffer(self._mmap, dtype='<i8', count=n_rows, offset=offset + i * n_rows * 8) for i in range(len(_COLUMNS))]
+            scores = np.frombuffer(self._mmap, dtype='<f8', count=n_rows, offset=offset + len(_COLUMNS) * n_rows * 8)
+            chunk = (columns, scores)
+        self._cached = (index, chunk)
+        return chunk
+
+    def __getitem__(self, index: int) -> BoxRecord:
+        """
+        Get the bounding boxes of the image at the index.
+
+        Args:
+            index (int): The index of the image in the file.
+
+        Returns:
+            BoxRecord: The bounding boxes, class ids and scores of the image.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError(f'expected index less than {len(self)}, got {index}')
+        columns, scores = self._chunk(int(self._image_chunks[index]))
+        start = int(self._image_starts[index])
+        stop = start + int(self._image_counts[index])
+        x, y, w, h, _, labels = (column[start:stop] for column in columns)
+        return BoxRecord(int(self.image_ids[index]), BoundingBoxArray.construct_unchecked(x, y, w, h), labels, scores[start:stop])
+
+    def __iter__(self) -> Iterator[BoxRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _columns(self, index: int) -> Tuple[np.ndarray, BoundingBoxArray, np.ndarray, np.ndarray]:
+        (x, y, w, h, image_ids, labels), scores = self._chunk(index)
+        return image_ids, BoundingBoxArray.construct_unchecked(x, y, w, h), labels, scores
+
+    def iter_chunks(self) -> Iterator[Tuple[np.ndarray, BoundingBoxArray, np.ndarray, np.ndarray]]:
+        """
+        Iterate the bounding boxes chunk by chunk, which is faster than iterating the images.
+
+        Yields:
+            Tuple[np.ndarray, BoundingBoxArray, np.ndarray, np.ndarray]: The image ids, the bounding boxes,
+                the class ids and the scores of the bounding boxes in each chunk.
+        """
+        for index in range(len(self._chunks)):
+            yield self._columns(index)
+
+    def read_all(self) -> Tuple[np.ndarray, BoundingBoxArray, np.ndarray, np.ndarray]:
+        """
+        Read all the bounding boxes at once.
+
+        Returns:
+            Tuple[np.ndarray, BoundingBoxArray, np.ndarray, np.ndarray]: The image ids, the bounding boxes,
+                the class ids and the scores of all the bounding boxes.
+        """
+        if len(self._chunks) == 1:
+            return self._columns(0)
+        chunks = [self._chunk(index) for index in range(len(self._chunks))]
+        x, y, w, h, image_ids, labels = (
+            np.concatenate([columns[i] for columns, _ in chunks]) if chunks else np.empty(0, dtype=np.int64)
+            for i in range(len(_COLUMNS))
+        )
+        scores = np.concatenate([scores for _, scores in chunks]) if chunks else np.empty(0, dtype=np.float64)
+        return image_ids, BoundingBoxArray.construct_unchecked(x, y, w, h), labels, scores
+
+    def close(self):
+        """
+        Close the mapped file, it stays open until the returned bounding boxes are released.
+        """
+        self._cached = (-1, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> 'BoxFile':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,289 @@
+import json
+import shutil
+import tempfile
+from json.decoder import WHITESPACE
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..ingest import PathLike, from_array
+from .record import ImageAnnotations
+
+
+class _JSONStream:
+    """
+    An incremental reader of a JSON document, which decodes one value at a time from a text file.
+
+    Only the current value and a chunk of the file are kept in memory, so the items of a huge array
+    can be decoded one by one.
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._scan = json.JSONDecoder().scan_once
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip the whitespaces and get the next character without consuming it, empty if the document ends.
+        """
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill(self._chunk_size):
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f'expected {char!r} in JSON document, got {found!r}')
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next value, reading more of the file until the value is complete.
+        """
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._scan(self._buffer, self._pos)
+            except (json.JSONDecodeError, StopIteration):
+                if not self._fill(size):
+                    raise ValueError('invalid value in JSON document') from None
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or not self._fill(size):
+                    self._pos = end
+                    return value
+            size *= 2
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterate the keys of an object, the caller must consume the value of each key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect('}')
+                return
+
+    def items(self) -> Iterator[Any]:
+        """
+        Iterate the decoded items of an array.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect(']')
+                return
+
+
+# The annotation rows spilled to a temporary file, 48 bytes each
+_ROW = np.dtype([('image_id', '<i8'), ('label', '<i8'), ('bbox', '<f8', (4,))])
+
+
+class _Spool:
+    """
+    The annotation rows spilled to a temporary file in blocks, so only a block of them is kept in memory.
+    """
+
+    def __init__(self, f: IO[bytes], block_size: int):
+        self._f = f
+        self._block_size = block_size
+        self._image_ids, self._labels, self._boxes = [], [], []
+        self.n_rows = 0
+
+    def append(self, image_id: int, label: int, bbox: List[float]):
+        self._image_ids.append(image_id)
+        self._labels.append(label)
+        self._boxes.append(bbox)
+        if len(self._image_ids) >= self._block_size:
+            self._flush()
+
+    def _flush(self):
+        if self._image_ids:
+            block = np.empty(len(self._image_ids), dtype=_ROW)
+            block['image_id'], block['label'], block['bbox'] = self._image_ids, self._labels, self._boxes
+            self._f.write(block.tobytes())
+            self.n_rows += len(block)
+            self._image_ids, self._labels, self._boxes = [], [], []
+
+    def rows(self) -> np.ndarray:
+        """
+        Map all the spilled rows from the temporary file.
+        """
+        self._flush()
+        self._f.flush()
+        if self.n_rows == 0:
+            return np.empty(0, dtype=_ROW)
+        return np.memmap(self._f, dtype=_ROW, mode='r', shape=(self.n_rows,))
+
+
+def _group(rows: np.ndarray, image_ids: np.ndarray, f: IO[bytes], block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group the rows by the images into another temporary file by counting sort, one block of rows at a time.
+
+    The rows of each image keep their order in the annotation file, and the rows of unknown images are dropped.
+
+    Args:
+        rows (np.ndarray): The spilled annotation rows.
+        image_ids (np.ndarray): The ids of the images in order.
+        f (IO[bytes]): The temporary file of the grouped rows.
+        block_size (int): The number of rows in memory at a time.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The offsets of the rows of each image in shape `(len(image_ids) + 1,)`,
+            and the grouped rows mapped from the temporary file.
+    """
+    index = np.argsort(image_ids, kind='stable')
+    sorted_ids = image_ids[index]
+
+    def positions(block: np.ndarray) -> np.ndarray:
+        # The positions of the images of the rows in order, -1 for the unknown images
+        if len(sorted_ids) == 0:
+            return np.full(len(block), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(sorted_ids, block['image_id']), len(sorted_ids) - 1)
+        return np.where(sorted_ids[found] == block['image_id'], index[found], -1)
+
+    counts = np.zeros(len(image_ids), dtype=np.int64)
+    for start in range(0, len(rows), block_size):
+        position = positions(rows[start:start + block_size])
+        counts += np.bincount(position[position >= 0], minlength=len(counts))
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    if offsets[-1] == 0:
+        return offsets, np.empty(0, dtype=_ROW)
+
+    # Scatter each block of rows to the next free slots of their images
+    grouped = np.memmap(f, dtype=_ROW, mode='w+', shape=(int(offsets[-1]),))
+    cursor = offsets[:-1].copy()
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        position = positions(block)
+        order = np.flatnonzero(position >= 0)
+        order = order[np.argsort(position[order], kind='stable')]
+        position = position[order]
+        rank = np.arange(len(order)) - np.searchsorted(position, position, side='left')
+        grouped[cursor[position] + rank] = block[order]
+        cursor += np.bincount(position, minlength=len(cursor))
+    return offsets, grouped
+
+
+def read_coco(path: PathLike, chunk_size: int = 1 << 16, block_size: int = 1 << 16) -> Iterator[ImageAnnotations]:
+    """
+    Read the bounding boxes of each image from an annotation file in COCO format.
+
+    The file is decoded incrementally rather than loaded as a whole. The numeric columns of the annotations are
+    spilled to a temporary file, 48 bytes per bounding box, and grouped by the images on disk before the first
+    image is yielded. Only the image table and a block of the annotations are kept in memory, so the memory grows
+    with the number of images rather than the number of bounding boxes. The bounding boxes `[x, y, width, height]`
+    are rounded to the nearest pixels, see `bbox.ingest.from_array` in layout `ltwh`.
+
+    Args:
+        path (str | os.PathLike): The path of the annotation file.
+        chunk_size (int, optional): The number of characters read from the file at a time. Defaults to 65536.
+        block_size (int, optional): The number of annotations kept in memory at a time. Defaults to 65536.
+
+    Yields:
+        ImageAnnotations: The bounding boxes and the category ids of each image, in the order of `images`.
+    """
+    assert block_size > 0, 'block_size must be positive'
+    images = []
+    with tempfile.TemporaryFile() as spilled, tempfile.TemporaryFile() as grouped:
+        spool = _Spool(spilled, block_size)
+        with open(path, encoding='utf-8') as f:
+            stream = _JSONStream(f, chunk_size)
+            for key in stream.members():
+                if key == 'images':
+                    for image in stream.items():
+                        size = (image['width'], image['height']) if 'width' in image and 'height' in image else None
+                        images.append((image['id'], image.get('file_name', str(image['id'])), size))
+                elif key == 'annotations':
+                    for annotation in stream.items():
+                        if 'bbox' in annotation:
+                            spool.append(annotation['image_id'], annotation['category_id'], annotation['bbox'])
+                else:
+                    stream.value()
+
+        image_ids = np.array([image_id for image_id, _, _ in images], dtype=np.int64)
+        offsets, rows = _group(spool.rows(), image_ids, grouped, block_size)
+
+        # Convert the rows of consecutive images a block at a time, the records never refer to the temporary files
+        first = 0
+        while first < len(images):
+            last = max(int(np.searchsorted(offsets, offsets[first] + block_size, side='right')) - 1, first + 1)
+            block = np.array(rows[offsets[first]:offsets[last]])
+            labels, boxes = np.ascontiguousarray(block['label']), from_array(block['bbox'], 'ltwh')
+            for k in range(first, last):
+                _, image, size = images[k]
+                start, stop = offsets[k] - offsets[first], offsets[k + 1] - offsets[first]
+                yield ImageAnnotations(image, boxes[start:stop], labels[start:stop], size)
+            first = last
+
+
+def write_coco(path: PathLike, records: Iterable[ImageAnnotations], categories: Optional[Dict[int, str]] = None):
+    """
+    Write the bounding boxes of the images into an annotation file in COCO format.
+
+    The records are consumed one by one, the annotations are spooled into a temporary file until all the
+    images are written, so the memory does not grow with the records.
+
+    Args:
+        path (str | os.PathLike): The path of the annotation file.
+        records (Iterable[ImageAnnotations]): The bounding boxes of each image, the labels are the category ids.
+        categories (Dict[int, str], optional): The names of the category ids. Defaults to the category ids
+            seen in the records, named by themselves.
+    """
+    seen = set()
+    annotation_id = 0
+    with open(path, 'w', encoding='utf-8') as f, tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+        f.write('{"images": [')
+        for image_id, record in enumerate(records, start=1):
+            image = {'id': image_id, 'file_name': record.image}
+            if record.size is not None:
+                image['width'], image['height'] = record.size
+            f.write((',' if image_id > 1 else '') + json.dumps(image))
+
+            labels = np.asarray(record.labels).tolist()
+            seen.update(labels)
+            for (x1, y1, w, h), label in zip(record.boxes.to_tlwh().tolist(), labels):
+                annotation_id += 1
+                annotation = {
+                    'id': annotation_id, 'image_id': image_id, 'category_id': label,
+                    'bbox': [x1, y1, w, h], 'area': w * h, 'iscrowd': 0
+                }
+                spool.write((',' if annotation_id > 1 else '') + json.dumps(annotation))
+
+        f.write('], "annotations": [')
+        spool.seek(0)
+        shutil.copyfileobj(spool, f)
+        if categories is None:
+            categories = {label: str(label) for label in sorted(seen)}
+        f.write('], "categories": ' + json.dumps([{'id': k, 'name': v} for k, v in categories.items()]) + '}')
@@ -0,0 +1,21 @@
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..array import BoundingBoxArray
+
+
+class ImageAnnotations(NamedTuple):
+    """
+    The annotated bounding boxes of an image.
+
+    Attributes:
+        image (str): The file name of the image.
+        boxes (BoundingBoxArray): The bounding boxes, `N` in total.
+        labels (np.ndarray): The labels of the bounding boxes in shape `(N,)`.
+        size (Tuple[int, int], optional): The width and height of the image if known.
+    """
+    image: str
+    boxes: BoundingBoxArray
+    labels: np.ndarray
+    size: Optional[Tuple[int, int]] = None
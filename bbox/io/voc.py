@@ -0,0 +1,85 @@
+import os
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from ..ingest import PathLike, from_array
+from ..transform import _edges
+from .record import ImageAnnotations
+
+
+def read_voc(directory: PathLike, classes: Optional[Sequence[str]] = None) -> Iterator[ImageAnnotations]:
+    """
+    Read the bounding boxes of each image from a directory of annotation files in Pascal VOC format.
+
+    The corners `xmin`, `ymin`, `xmax` and `ymax` are read as they are and created as `BoundingBox.from_xyxy`.
+
+    Args:
+        directory (str | os.PathLike): The directory of the `.xml` annotation files, one file per image.
+        classes (Sequence[str], optional): The class names, the labels are the indices of the names if given,
+            otherwise the names themselves.
+
+    Raises:
+        ValueError: If an object is not one of the given classes.
+
+    Yields:
+        ImageAnnotations: The bounding boxes and the labels of each image, sorted by the file names.
+    """
+    indices = {name: i for i, name in enumerate(classes)} if classes is not None else None
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.xml'):
+            continue
+        root = ET.parse(os.path.join(directory, name)).getroot()
+        size = root.find('size')
+        if size is not None:
+            size = (int(size.findtext('width')), int(size.findtext('height')))
+
+        labels, xyxy = [], []
+        for obj in root.iter('object'):
+            label = obj.findtext('name')
+            if indices is not None:
+                if label not in indices:
+                    raise ValueError(f'expected object in the given classes, got {label} in {name}')
+                label = indices[label]
+            box = obj.find('bndbox')
+            labels.append(label)
+            xyxy.append([float(box.findtext(key)) for key in ('xmin', 'ymin', 'xmax', 'ymax')])
+
+        image = root.findtext('filename') or os.path.splitext(name)[0]
+        labels = np.array(labels, dtype=np.int64 if indices is not None else str)
+        yield ImageAnnotations(image, from_array(np.array(xyxy).reshape(-1, 4), 'xyxy'), labels, size)
+
+
+def write_voc(directory: PathLike, records: Iterable[ImageAnnotations], classes: Optional[Sequence[str]] = None):
+    """
+    Write the bounding boxes of each image into a directory of annotation files in Pascal VOC format.
+
+    The exact edges are written rather than the corners of `to_xyxy`, so the odd widths and heights are kept.
+
+    Args:
+        directory (str | os.PathLike): The directory of the `.xml` annotation files, created if it does not exist.
+        records (Iterable[ImageAnnotations]): The bounding boxes of each image, the annotation file is named by
+            the image without extension.
+        classes (Sequence[str], optional): The class names indexed by the labels. Defaults to writing the labels
+            as the names.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for record in records:
+        root = ET.Element('annotation')
+        ET.SubElement(root, 'filename').text = record.image
+        if record.size is not None:
+            size = ET.SubElement(root, 'size')
+            ET.SubElement(size, 'width').text = str(record.size[0])
+            ET.SubElement(size, 'height').text = str(record.size[1])
+            ET.SubElement(size, 'depth').text = '3'
+
+        for label, xyxy in zip(np.asarray(record.labels).tolist(), _edges(record.boxes).tolist()):
+            obj = ET.SubElement(root, 'object')
+            ET.SubElement(obj, 'name').text = classes[label] if classes is not None else str(label)
+            box = ET.SubElement(obj, 'bndbox')
+            for key, value in zip(('xmin', 'ymin', 'xmax', 'ymax'), xyxy):
+                ET.SubElement(box, key).text = str(value)
+
+        stem = os.path.splitext(os.path.basename(record.image))[0]
+        ET.ElementTree(root).write(os.path.join(directory, f'{stem}.xml'), encoding='utf-8')
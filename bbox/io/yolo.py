@@ -0,0 +1,63 @@
+import os
+from typing import Callable, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+from ..ingest import PathLike, from_array
+from ..transform import _edges
+from .record import ImageAnnotations
+
+ImageSize = Union[Tuple[int, int], Callable[[str], Tuple[int, int]]]
+
+
+def read_yolo(directory: PathLike, image_size: ImageSize) -> Iterator[ImageAnnotations]:
+    """
+    Read the bounding boxes of each image from a directory of label files in YOLO format.
+
+    Each line of a label file is `class cx cy w h` normalized by the image size. The corners are restored in pixels
+    and rounded to the nearest ones, then the bounding boxes are created as `BoundingBox.from_xyxy`.
+
+    Args:
+        directory (str | os.PathLike): The directory of the `.txt` label files, one file per image.
+        image_size (Tuple[int, int] | Callable[[str], Tuple[int, int]]): The width and height of the images,
+            or a function returning them of the image named by the label file without extension.
+
+    Yields:
+        ImageAnnotations: The bounding boxes and the class indices of each image, sorted by the file names.
+    """
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension != '.txt':
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            values = np.array(f.read().split(), dtype=np.float64).reshape(-1, 5)
+
+        size = image_size(stem) if callable(image_size) else tuple(image_size)
+        cx, cy, w, h = values[:, 1], values[:, 2], values[:, 3], values[:, 4]
+        xyxy = np.stack((cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2), axis=1)
+        yield ImageAnnotations(stem, from_array(xyxy, 'xyxy', image_size=size), values[:, 0].astype(np.int64), size)
+
+
+def write_yolo(directory: PathLike, records: Iterable[ImageAnnotations], precision: int = 6):
+    """
+    Write the bounding boxes of each image into a directory of label files in YOLO format.
+
+    The center points and sizes are normalized from the exact edges, so the odd widths and heights are kept.
+
+    Args:
+        directory (str | os.PathLike): The directory of the `.txt` label files, created if it does not exist.
+        records (Iterable[ImageAnnotations]): The bounding boxes of each image, the labels are the class indices.
+            The size of each image is required to normalize the coordinates, the label file is named by
+            the image without extension.
+        precision (int, optional): The number of decimal places of the coordinates. Defaults to 6.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for record in records:
+        assert record.size is not None, f'expected the size of image {record.image}'
+        width, height = record.size
+        x1, y1, x2, y2 = _edges(record.boxes).T
+        values = np.stack(((x1 + x2) / 2 / width, (y1 + y2) / 2 / height, (x2 - x1) / width, (y2 - y1) / height), axis=1)
+        stem = os.path.splitext(os.path.basename(record.image))[0]
+        with open(os.path.join(directory, f'{stem}.txt'), 'w', encoding='utf-8') as f:
+            for label, row in zip(np.asarray(record.labels).tolist(), values.tolist()):
+                f.write(f'{label} ' + ' '.join(f'{value:.{precision}f}' for value in row) + '\n')
@@ -1,7 +1,17 @@
 from .area import intersect, union
-from .iou import giou, iou, diou, ciou
+from .batch import (ciou_matrix, ciou_paired, diou_matrix, diou_paired,
+                    giou_matrix, giou_paired, iou_matrix, iou_paired)
+from .distance import (anchor_distance_matrix, anchor_distance_topk, contains_matrix, contains_topk,
+                       overlap_ratio_matrix, overlap_ratio_topk, within_matrix, within_topk)
+from .iou import all_ious, giou, iou, diou, ciou
+from .join import overlap_join
 
 __all__ = [
     'intersect', 'union',
-    'iou', 'giou', 'diou', 'ciou'
+    'iou', 'giou', 'diou', 'ciou', 'all_ious',
+    'iou_matrix', 'giou_matrix', 'diou_matrix', 'ciou_matrix',
+    'iou_paired', 'giou_paired', 'diou_paired', 'ciou_paired',
+    'overlap_join',
+    'anchor_distance_matrix', 'overlap_ratio_matrix', 'contains_matrix', 'within_matrix',
+    'anchor_distance_topk', 'overlap_ratio_topk', 'contains_topk', 'within_topk'
 ]
@@ -1,6 +1,8 @@
 from ..bbox import BoundingBox
+from ..instrument import instrumented
 
 
+@instrumented('measure.intersect')
 def intersect(bbox1: BoundingBox, bbox2: BoundingBox) -> int:
     """
     Compute the intersection area of bounding boxes.
@@ -27,6 +29,7 @@ def intersect(bbox1: BoundingBox, bbox2: BoundingBox) -> int:
         return (overlap_x2 - overlap_x1) * (overlap_y2 - overlap_y1)
 
 
+@instrumented('measure.union')
 def union(bbox1: BoundingBox, bbox2: BoundingBox) -> int:
     """
     Compute the union area of bounding boxes.
@@ -0,0 +1,235 @@
+from typing import Callable, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from ..array import BoundingBoxArray, as_array
+from ..bbox import BoundingBox
+
+Boxes = Union[BoundingBoxArray, Iterable[BoundingBox]]
+
+
+class _Geometry(NamedTuple):
+    """
+    The derived geometry of the bounding boxes shared by the kernels.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    w: np.ndarray
+    h: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    area: np.ndarray
+
+
+def _geometry(boxes: BoundingBoxArray) -> _Geometry:
+    dw = boxes._half(boxes.w)
+    dh = boxes._half(boxes.h)
+    return _Geometry(
+        boxes.x, boxes.y, boxes.w, boxes.h,
+        boxes.x - dw, boxes.y - dh, boxes.x + dw, boxes.y + dh,
+        boxes.area
+    )
+
+
+def _expand(geometry: _Geometry, axis: int) -> _Geometry:
+    return _Geometry(*(np.expand_dims(column, axis) for column in geometry))
+
+
+def _take(geometry: _Geometry, index) -> _Geometry:
+    return _Geometry(*(column[index] for column in geometry))
+
+
+def _intersect(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    overlap_w = np.minimum(g1.x2, g2.x2) - np.maximum(g1.x1, g2.x1)
+    overlap_h = np.minimum(g1.y2, g2.y2) - np.maximum(g1.y1, g2.y1)
+    return np.maximum(overlap_w, 0) * np.maximum(overlap_h, 0)
+
+
+def _iou(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    inter_area = _intersect(g1, g2)
+    return inter_area / (g1.area + g2.area - inter_area + 1e-7)
+
+
+def _giou(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    inter_area = _intersect(g1, g2)
+    iou_score = inter_area / (g1.area + g2.area - inter_area + 1e-7)
+    union_area = g1.area + g2.area - inter_area
+    se_area = (np.maximum(g1.x2, g2.x2) - np.minimum(g1.x1, g2.x1)) * (np.maximum(g1.y2, g2.y2) - np.minimum(g1.y1, g2.y1))
+    return iou_score - (se_area - union_area) / se_area
+
+
+def _diou(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    iou_score = _iou(g1, g2)
+    center_dist = (g1.x - g2.x) ** 2 + (g1.y - g2.y) ** 2
+
+    # The diagonal is measured on the smallest enclosing bounding box formatted by `to_xyxy`,
+    # which snaps the odd width and height to the even ones unless any of them is in sub-pixel precision
+    se_w = np.maximum(g1.x2, g2.x2) - np.minimum(g1.x1, g2.x1)
+    se_h = np.maximum(g1.y2, g2.y2) - np.minimum(g1.y1, g2.y1)
+    if se_w.dtype.kind != 'f':
+        se_w, se_h = se_w // 2 * 2, se_h // 2 * 2
+    se_dist = se_w ** 2 + se_h ** 2
+    return iou_score - center_dist / se_dist
+
+
+def _ciou(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    iou_score = _iou(g1, g2)
+    diou_score = _diou(g1, g2)
+
+    # 4 / (math.pi ** 2) = 0.4052847345693511
+    v = 0.4052847345693511 * (np.arctan(g1.w / g1.h) - np.arctan(g2.w / g2.h)) ** 2
+    alpha = v / (1 - iou_score + v)
+    return diou_score - alpha * v
+
+
+Kernel = Callable[[_Geometry, _Geometry], np.ndarray]
+
+
+def _matrix(kernel: Kernel, boxes1: Boxes, boxes2: Boxes, block_size: Optional[int], out: Optional[np.ndarray]) -> np.ndarray:
+    boxes1 = as_array(boxes1)
+    boxes2 = as_array(boxes2)
+    shape = (len(boxes1), len(boxes2))
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    assert out.shape == shape, f'expected output in shape {shape}, got {out.shape}'
+    assert block_size is None or block_size > 0, 'block size must be positive'
+
+    g2 = _expand(_geometry(boxes2), 0)
+    step = block_size or max(len(boxes1), 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(boxes1), step):
+            g1 = _expand(_geometry(boxes1[start:start + step]), 1)
+            out[start:start + step] = kernel(g1, g2)
+    return out
+
+
+def _paired(kernel: Kernel, boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+    boxes1 = as_array(boxes1)
+    boxes2 = as_array(boxes2)
+    assert len(boxes1) == len(boxes2), f'expected bounding boxes in the same length, got {len(boxes1)} and {len(boxes2)}'
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(kernel(_geometry(boxes1), _geometry(boxes2)), dtype=np.float64)
+
+
+def iou_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute IoU scores of every pair of bounding boxes.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once, bounds the size of the
+            intermediate arrays to `block_size * M`. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the scores, such as a `np.memmap`.
+            Defaults to a new array.
+
+    Returns:
+        np.ndarray: The IoU scores in shape `(N, M)`, same as `iou(boxes1[i], boxes2[j])` at `(i, j)`.
+    """
+    return _matrix(_iou, boxes1, boxes2, block_size, out)
+
+
+def giou_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute GIoU scores of every pair of bounding boxes.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the scores. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The GIoU scores in shape `(N, M)`.
+    """
+    return _matrix(_giou, boxes1, boxes2, block_size, out)
+
+
+def diou_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute DIoU scores of every pair of bounding boxes.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the scores. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The DIoU scores in shape `(N, M)`.
+    """
+    return _matrix(_diou, boxes1, boxes2, block_size, out)
+
+
+def ciou_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute CIoU scores of every pair of bounding boxes.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the scores. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The CIoU scores in shape `(N, M)`.
+    """
+    return _matrix(_ciou, boxes1, boxes2, block_size, out)
+
+
+def iou_paired(boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+    """
+    Compute IoU scores of the bounding boxes pairwise.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `N` in total.
+
+    Returns:
+        np.ndarray: The IoU scores in shape `(N,)`, same as `iou(boxes1[i], boxes2[i])` at `i`.
+    """
+    return _paired(_iou, boxes1, boxes2)
+
+
+def giou_paired(boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+    """
+    Compute GIoU scores of the bounding boxes pairwise.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `N` in total.
+
+    Returns:
+        np.ndarray: The GIoU scores in shape `(N,)`.
+    """
+    return _paired(_giou, boxes1, boxes2)
+
+
+def diou_paired(boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+    """
+    Compute DIoU scores of the bounding boxes pairwise.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `N` in total.
+
+    Returns:
+        np.ndarray: The DIoU scores in shape `(N,)`.
+    """
+    return _paired(_diou, boxes1, boxes2)
+
+
+def ciou_paired(boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+    """
+    Compute CIoU scores of the bounding boxes pairwise.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The groundtruth bounding boxes, `N` in total.
+
+    Returns:
+        np.ndarray: The CIoU scores in shape `(N,)`.
+    """
+    return _paired(_ciou, boxes1, boxes2)
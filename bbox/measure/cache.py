@@ -0,0 +1,163 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from ..bbox import BoundingBox, FloatBoundingBox
+from .area import intersect, union
+from .iou import all_ious, ciou, diou, giou, iou
+
+# The measurements whose result does not depend on the order of the bounding boxes
+_SYMMETRIC = {inspect.unwrap(metric) for metric in (intersect, union, iou, giou, diou, ciou, all_ious)}
+
+
+class CacheStats(NamedTuple):
+    """
+    The statistics of a `MetricCache`.
+
+    Attributes:
+        hits (int): The number of the calls answered by the cache.
+        misses (int): The number of the calls computed by the measurement.
+        evictions (int): The number of the entries discarded as the least recently used ones.
+        expirations (int): The number of the entries discarded as expired.
+        size (int): The current number of the entries.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The ratio of the calls answered by the cache.
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def _key(bbox: BoundingBox) -> Tuple[bool, Any, Any, Any, Any]:
+    # The bounding boxes in pixels and in sub-pixel precision are measured differently even with the same values,
+    # the fields are read from `__dict__` directly as the lookup dominates the cost of a hit
+    fields = bbox.__dict__
+    return isinstance(bbox, FloatBoundingBox), fields['x'], fields['y'], fields['w'], fields['h']
+
+
+class MetricCache:
+    """
+    A bounded LRU cache in front of a measurement of two bounding boxes, such as `bbox.measure.iou`.
+
+    The results are keyed on the values of the bounding boxes rather than the objects, so any bounding box with
+    the same values shares the entries, and a bounding box assigned with new values is never answered with the old
+    result. The entries of the symmetric measurements are shared by both orders of the bounding boxes.
+
+    Args:
+        metric (Callable[[BoundingBox, BoundingBox], Any]): The measurement.
+        maxsize (int, optional): The maximum number of the entries, the least recently used one is discarded
+            beyond it. Defaults to 4096.
+        ttl (float, optional): The seconds before an entry expires. Defaults to never expiring.
+        symmetric (bool, optional): Whether the result does not depend on the order of the bounding boxes.
+            Defaults to True for the measurements in `bbox.measure` and False for the others.
+
+    Examples:
+        >>> bbox1, bbox2 = BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)
+        >>> cached_iou = MetricCache(iou, maxsize=1024, ttl=60)
+        >>> cached_iou(bbox1, bbox2) == cached_iou(bbox2, bbox1) == iou(bbox1, bbox2)
+        True
+        >>> cached_iou.stats
+        CacheStats(hits=1, misses=1, evictions=0, expirations=0, size=1)
+    """
+
+    def __init__(
+        self,
+        metric: Callable[[BoundingBox, BoundingBox], Any],
+        maxsize: int = 4096,
+        ttl: Optional[float] = None,
+        symmetric: Optional[bool] = None
+    ):
+        assert maxsize > 0, 'max size must be positive'
+        assert ttl is None or ttl > 0, 'ttl must be positive'
+        if symmetric is None:
+            # The measurement may be wrapped, such as by the profiling
+            symmetric = inspect.unwrap(metric) in _SYMMETRIC
+        self.metric = metric
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.symmetric = symmetric
+        self._entries: 'OrderedDict[tuple, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __call__(self, bbox1: BoundingBox, bbox2: BoundingBox) -> Any:
+        """
+        Measure the bounding boxes, or get the result of the previous call with the same values.
+
+        Args:
+            bbox1 (BoundingBox): The first bounding box.
+            bbox2 (BoundingBox): The second bounding box.
+
+        Returns:
+            Any: The result of the measurement.
+        """
+        key1, key2 = _key(bbox1), _key(bbox2)
+        key = (key2, key1) if self.symmetric and key2 < key1 else (key1, key2)
+        now = time.monotonic() if self.ttl is not None else 0.0
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+
+        result = self.metric(bbox1, bbox2)
+        with self._lock:
+            self._entries[key] = (result, now + self.ttl if self.ttl is not None else 0.0)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        The current statistics of the cache.
+        """
+        return CacheStats(self._hits, self._misses, self._evictions, self._expirations, len(self._entries))
+
+    def expire(self) -> int:
+        """
+        Discard all the expired entries, they are otherwise discarded once looked up or evicted.
+
+        Returns:
+            int: The number of the discarded entries.
+        """
+        if self.ttl is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, deadline) in self._entries.items() if deadline <= now]
+            for key in expired:
+                del self._entries[key]
+            self._expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        """
+        Discard all the entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
@@ -0,0 +1,327 @@
+from functools import partial
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from ..array import BoundingBoxArray, as_array
+from .batch import Boxes, Kernel, _expand, _geometry, _Geometry, _intersect, _iou, _matrix
+
+_METRICS = ('l1', 'l2')
+
+
+def _anchor(g: _Geometry, index: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the edge points of the bounding boxes, same as `BoundingBoxArray.anchor`.
+    """
+    column, row = (index - 1) % 3, (index - 1) // 3
+    return (g.x1, g.x, g.x2)[column], (g.y2, g.y, g.y1)[row]
+
+
+def _anchor_distance(g1: _Geometry, g2: _Geometry, index: int, metric: str) -> np.ndarray:
+    x1, y1 = _anchor(g1, index)
+    x2, y2 = _anchor(g2, index)
+    dx = np.abs(x1 - x2, dtype=np.float64)
+    dy = np.abs(y1 - y2, dtype=np.float64)
+    if metric == 'l1':
+        dx += dy
+        return dx
+    return np.hypot(dx, dy, out=dx)
+
+
+def _overlap_ratio(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    return _intersect(g1, g2) / (np.minimum(g1.area, g2.area) + 1e-7)
+
+
+def _contains(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    return (g1.x1 <= g2.x1) & (g1.y1 <= g2.y1) & (g2.x2 <= g1.x2) & (g2.y2 <= g1.y2)
+
+
+def _within(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+    return _contains(g2, g1)
+
+
+def _containment_key(predicate: Kernel) -> Kernel:
+    """
+    Rank the containing pairs by their IoU scores descendingly, so the tightest pairs come first.
+    """
+    def kernel(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+        return np.where(predicate(g1, g2), -_iou(g1, g2), np.inf)
+    return kernel
+
+
+def _check_anchor(index: int, metric: str):
+    if not 1 <= index <= 9:
+        raise IndexError(f'expected index between 1 to 9, got {index}')
+    assert metric in _METRICS, f'expected metric l1 or l2, got {metric}'
+
+
+def _blocks(boxes1: BoundingBoxArray, boxes2: BoundingBoxArray, budget: int) -> Iterator[Tuple[int, _Geometry, _Geometry]]:
+    """
+    Split the first bounding boxes into blocks, so each block computes about `budget` pairs at a time.
+    """
+    assert budget > 0, 'budget must be positive'
+    g2 = _expand(_geometry(boxes2), 0)
+    step = max(budget // max(len(boxes2), 1), 1)
+    for start in range(0, len(boxes1), step):
+        yield start, _expand(_geometry(boxes1[start:start + step]), 1), g2
+
+
+def _smallest(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    Select the `k` smallest keys of each row in linear time, the ties are broken by the positions.
+
+    Returns:
+        np.ndarray: The positions of the selected keys in shape `(N, k)`, sorted by the keys then the positions.
+    """
+    if k < keys.shape[1]:
+        # The k-th smallest key of each row, the keys equal to it are taken from the left until `k` in total
+        kth = np.partition(keys, k - 1, axis=1)[:, k - 1, None]
+        smaller = keys < kth
+        needed = k - smaller.sum(axis=1, keepdims=True)
+        equal = keys == kth
+        selected = smaller | (equal & (np.cumsum(equal, axis=1) <= needed))
+        positions = np.nonzero(selected)[1].reshape(len(keys), k)
+    else:
+        positions = np.broadcast_to(np.arange(keys.shape[1]), keys.shape)
+    order = np.lexsort((positions, np.take_along_axis(keys, positions, axis=1)), axis=1)
+    return np.take_along_axis(positions, order, axis=1)
+
+
+def _topk(kernel: Kernel, boxes1: Boxes, boxes2: Boxes, k: int, budget: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the pairs with the `k` smallest keys of each bounding box in `boxes1`, the pairs with infinite keys are
+    never found.
+    """
+    assert k > 0, 'k must be positive'
+    boxes1, boxes2 = as_array(boxes1), as_array(boxes2)
+    k = min(k, len(boxes2))
+    rows, cols, keys = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.float64)]
+    if k == 0:
+        return rows[0], cols[0], keys[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start, g1, g2 in _blocks(boxes1, boxes2, budget):
+            block = np.asarray(kernel(g1, g2), dtype=np.float64)
+            positions = _smallest(block, k)
+            values = np.take_along_axis(block, positions, axis=1)
+            found = np.isfinite(values)
+            rows.append(np.nonzero(found)[0] + start)
+            cols.append(positions[found])
+            keys.append(values[found])
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(keys)
+
+
+def anchor_distance_matrix(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    index: int = 5,
+    metric: str = 'l2',
+    block_size: Optional[int] = None,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Compute the distances between the edge points of every pair of bounding boxes.
+
+    The value of `index` can refer to the number position on numpad, see `BoundingBox.anchor`, such as `2` for the
+    bottom-center points standing on the ground plane.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The first bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The second bounding boxes, `M` in total.
+        index (int, optional): The corresponding number for the pointed position. Defaults to 5, the center points.
+        metric (str, optional): The distance, either `l1` or `l2`. Defaults to `l2`.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the distances. Defaults to a new array.
+
+    Raises:
+        IndexError: If the index is not between 1 to 9.
+
+    Returns:
+        np.ndarray: The distances in shape `(N, M)`.
+    """
+    _check_anchor(index, metric)
+    return _matrix(partial(_anchor_distance, index=index, metric=metric), boxes1, boxes2, block_size, out)
+
+
+def anchor_distance_topk(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    k: int,
+    index: int = 5,
+    metric: str = 'l2',
+    max_distance: Optional[float] = None,
+    budget: int = 1 << 22
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the `k` nearest bounding boxes in `boxes2` to each bounding box in `boxes1` by the distances between the edge
+    points, see `anchor_distance_matrix`.
+
+    The distances are computed block by block and only the nearest ones are kept, so the matrix in shape `(N, M)` is
+    never materialized.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The query bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `M` in total.
+        k (int): The number of the nearest bounding boxes of each query, fewer if not enough candidates.
+        index (int, optional): The corresponding number for the pointed position. Defaults to 5, the center points.
+        metric (str, optional): The distance, either `l1` or `l2`. Defaults to `l2`.
+        max_distance (float, optional): The maximum distance inclusively, the farther pairs are dropped.
+            Defaults to no limit.
+        budget (int, optional): The maximum number of pairs computed at a time, which bounds the memory usage.
+            Defaults to 4194304.
+
+    Raises:
+        IndexError: If the index is not between 1 to 9.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices in `boxes1`, the indices in `boxes2` and the distances
+            of the pairs, sorted by the first indices, then the distances and the second indices.
+
+    Examples:
+        >>> detections = BoundingBoxArray.from_xyxy([(0, 0, 10, 20), (50, 0, 60, 20)])
+        >>> tracks = BoundingBoxArray.from_xyxy([(2, 0, 12, 20), (40, 10, 60, 30)])
+        >>> anchor_distance_topk(detections, tracks, k=1, index=2)
+        (array([0, 1]), array([0, 1]), array([ 2.        , 11.18033989]))
+    """
+    _check_anchor(index, metric)
+
+    def kernel(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+        distance = _anchor_distance(g1, g2, index, metric)
+        if max_distance is not None:
+            distance[distance > max_distance] = np.inf
+        return distance
+    return _topk(kernel, boxes1, boxes2, k, budget)
+
+
+def overlap_ratio_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the intersection over the area of the smaller bounding box of every pair of bounding boxes.
+
+    Unlike IoU score, it is 1 whenever one bounding box is inside the other, such as a person inside a region.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The first bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The second bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The array in shape `(N, M)` to store the ratios. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The overlap ratios in shape `(N, M)`.
+    """
+    return _matrix(_overlap_ratio, boxes1, boxes2, block_size, out)
+
+
+def overlap_ratio_topk(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    k: int,
+    min_ratio: float = 0,
+    budget: int = 1 << 22
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the `k` bounding boxes in `boxes2` with the highest overlap ratios to each bounding box in `boxes1`,
+    see `overlap_ratio_matrix`.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The query bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `M` in total.
+        k (int): The number of the bounding boxes of each query, fewer if not enough candidates.
+        min_ratio (float, optional): The minimum overlap ratio exclusively. Defaults to 0, the overlapping pairs.
+        budget (int, optional): The maximum number of pairs computed at a time, which bounds the memory usage.
+            Defaults to 4194304.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices in `boxes1`, the indices in `boxes2` and the overlap
+            ratios of the pairs, sorted by the first indices, then the ratios descendingly and the second indices.
+    """
+    def kernel(g1: _Geometry, g2: _Geometry) -> np.ndarray:
+        ratio = _overlap_ratio(g1, g2)
+        return np.where(ratio > min_ratio, -ratio, np.inf)
+    rows, cols, keys = _topk(kernel, boxes1, boxes2, k, budget)
+    return rows, cols, -keys
+
+
+def contains_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Check whether each bounding box in `boxes1` contains each bounding box in `boxes2`, the edges inclusively.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The containing bounding boxes, such as the regions,
+            `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The contained bounding boxes, `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The boolean array in shape `(N, M)` to store the results. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The boolean array in shape `(N, M)`, whether `boxes1[i]` contains `boxes2[j]` at `(i, j)`.
+    """
+    boxes1, boxes2 = as_array(boxes1), as_array(boxes2)
+    if out is None:
+        out = np.empty((len(boxes1), len(boxes2)), dtype=bool)
+    return _matrix(_contains, boxes1, boxes2, block_size, out)
+
+
+def within_matrix(boxes1: Boxes, boxes2: Boxes, block_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Check whether each bounding box in `boxes1` is within each bounding box in `boxes2`, the edges inclusively.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The contained bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The containing bounding boxes, such as the regions,
+            `M` in total.
+        block_size (int, optional): The number of rows computed at once. Defaults to computing all rows at once.
+        out (np.ndarray, optional): The boolean array in shape `(N, M)` to store the results. Defaults to a new array.
+
+    Returns:
+        np.ndarray: The boolean array in shape `(N, M)`, whether `boxes1[i]` is within `boxes2[j]` at `(i, j)`.
+    """
+    boxes1, boxes2 = as_array(boxes1), as_array(boxes2)
+    if out is None:
+        out = np.empty((len(boxes1), len(boxes2)), dtype=bool)
+    return _matrix(_within, boxes1, boxes2, block_size, out)
+
+
+def contains_topk(boxes1: Boxes, boxes2: Boxes, k: int, budget: int = 1 << 22) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find up to `k` bounding boxes in `boxes2` contained by each bounding box in `boxes1`, the largest ones first,
+    see `contains_matrix`.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The containing bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The contained bounding boxes, `M` in total.
+        k (int): The maximum number of the contained bounding boxes of each one.
+        budget (int, optional): The maximum number of pairs computed at a time, which bounds the memory usage.
+            Defaults to 4194304.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices in `boxes1` and the indices in `boxes2` of the pairs, sorted by
+            the first indices, then IoU scores descendingly and the second indices.
+    """
+    rows, cols, _ = _topk(_containment_key(_contains), boxes1, boxes2, k, budget)
+    return rows, cols
+
+
+def within_topk(boxes1: Boxes, boxes2: Boxes, k: int, budget: int = 1 << 22) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find up to `k` bounding boxes in `boxes2` containing each bounding box in `boxes1`, the tightest ones first,
+    see `within_matrix`.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The contained bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The containing bounding boxes, `M` in total.
+        k (int): The maximum number of the containing bounding boxes of each one.
+        budget (int, optional): The maximum number of pairs computed at a time, which bounds the memory usage.
+            Defaults to 4194304.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices in `boxes1` and the indices in `boxes2` of the pairs, sorted by
+            the first indices, then IoU scores descendingly and the second indices.
+
+    Examples:
+        >>> people = BoundingBoxArray.from_xyxy([(10, 10, 20, 30)])
+        >>> regions = BoundingBoxArray.from_xyxy([(0, 0, 100, 100), (5, 5, 25, 35), (15, 0, 40, 40)])
+        >>> within_topk(people, regions, k=2)
+        (array([0, 0]), array([1, 0]))
+    """
+    rows, cols, _ = _topk(_containment_key(_within), boxes1, boxes2, k, budget)
+    return rows, cols
@@ -1,10 +1,65 @@
 import math
+from typing import NamedTuple, Tuple
 
+from .. import backend
 from ..bbox import BoundingBox
-from ..transform import smallest_enclosing
+from ..instrument import instrumented
 from .area import intersect, union
 
+# The areas are no longer used here, but they have always been importable from this module
+__all__ = ['intersect', 'union', 'IoUScores', 'iou', 'giou', 'diou', 'ciou', 'all_ious']
 
+
+class IoUScores(NamedTuple):
+    """
+    The IoU score and its variations of a pair of bounding boxes.
+    """
+    iou: float
+    giou: float
+    diou: float
+    ciou: float
+
+
+def _overlap(bbox1: BoundingBox, bbox2: BoundingBox) -> Tuple[int, int, int, int]:
+    """
+    Compute the areas shared by the IoU variations in one pass over the corners.
+
+    Returns:
+        Tuple[int, int, int, int]: The intersection area, the union area, the width and the height of
+            the smallest enclosing bounding box.
+    """
+    x1, y1, x2, y2 = bbox1.to_xyxy()
+    a1, b1, a2, b2 = bbox2.to_xyxy()
+    overlap_w = min(x2, a2) - max(x1, a1)
+    overlap_h = min(y2, b2) - max(y1, b1)
+    inter_area = overlap_w * overlap_h if overlap_w > 0 and overlap_h > 0 else 0
+    union_area = bbox1.area + bbox2.area - inter_area
+    return inter_area, union_area, max(x2, a2) - min(x1, a1), max(y2, b2) - min(y1, b1)
+
+
+def _diou_penalty(bbox1: BoundingBox, bbox2: BoundingBox, se_w: int, se_h: int) -> float:
+    # Compute the L2-distance of the center points
+    center_dist = (bbox1.x - bbox2.x) ** 2 + (bbox1.y - bbox2.y) ** 2
+
+    # Compute the L2-distance of the diagonal points in the smallest enclosing bounding box,
+    # which snaps the odd width and height to the even ones as `to_xyxy` unless any of them is in sub-pixel precision
+    if isinstance(se_w, int) and isinstance(se_h, int):
+        se_w, se_h = se_w // 2 * 2, se_h // 2 * 2
+    se_dist = se_w ** 2 + se_h ** 2
+    return center_dist / se_dist
+
+
+def _ciou_penalty(bbox1: BoundingBox, bbox2: BoundingBox, iou_score: float) -> float:
+    # Compute v
+    # 4 / (math.pi ** 2) = 0.4052847345693511
+    v = 0.4052847345693511 * (math.atan(bbox1.w / bbox1.h) - math.atan(bbox2.w / bbox2.h)) ** 2
+
+    # Compute alpha
+    alpha = v / (1 - iou_score + v)
+    return alpha * v
+
+
+@instrumented('measure.iou')
 def iou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     """
     Compute IoU score of bounding boxes.
@@ -16,15 +71,13 @@ def iou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     Returns:
         float: The IoU score
     """
-    # Compute the intersection area
-    inter_area = intersect(bbox1, bbox2)
-
-    # Compute IoU score
-    score = inter_area / (bbox1.area + bbox2.area - inter_area + 1e-7)
-
-    return score
+    if backend._native is not None:
+        return backend._native.iou(bbox1, bbox2)
+    inter_area, union_area, _, _ = _overlap(bbox1, bbox2)
+    return inter_area / (union_area + 1e-7)
 
 
+@instrumented('measure.giou')
 def giou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     """
     Compute GIoU score of bounding boxes.
@@ -36,16 +89,14 @@ def giou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     Returns:
         float: the GIoU score
     """
-    iou_score = iou(bbox1, bbox2)
-    union_area = union(bbox1, bbox2)
-    se_area = smallest_enclosing(bbox1, bbox2).area
-
-    # Compute GIOU
-    score = iou_score - (se_area - union_area) / se_area
-
-    return score
+    if backend._native is not None:
+        return backend._native.giou(bbox1, bbox2)
+    inter_area, union_area, se_w, se_h = _overlap(bbox1, bbox2)
+    se_area = se_w * se_h
+    return inter_area / (union_area + 1e-7) - (se_area - union_area) / se_area
 
 
+@instrumented('measure.diou')
 def diou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     """
     Compute DIoU score of bounding boxes.
@@ -57,18 +108,13 @@ def diou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     Returns:
         float: the DIoU score
     """
-    iou_score = iou(bbox1, bbox2)
-
-    # Compute the L2-distance of the center points
-    center_dist = (bbox1.x - bbox2.x) ** 2 + (bbox1.y - bbox2.y) ** 2
-
-    # Compute the L2-distance of the diagonal points in the smallest enclosing bounding box
-    sx1, sy1, sx2, sy2 = smallest_enclosing(bbox1, bbox2).to_xyxy()
-    se_dist = (sx1 - sx2) ** 2 + (sy1 - sy2) ** 2
-
-    return iou_score - center_dist / se_dist
+    if backend._native is not None:
+        return backend._native.diou(bbox1, bbox2)
+    inter_area, union_area, se_w, se_h = _overlap(bbox1, bbox2)
+    return inter_area / (union_area + 1e-7) - _diou_penalty(bbox1, bbox2, se_w, se_h)
 
 
+@instrumented('measure.ciou')
 def ciou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     """
     Compute CIoU score of bounding boxes.
@@ -80,14 +126,35 @@ def ciou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
     Returns:
         float: the CIoU score
     """
-    iou_score = iou(bbox1, bbox2)
-    diou_score = diou(bbox1, bbox2)
+    if backend._native is not None:
+        return backend._native.ciou(bbox1, bbox2)
+    inter_area, union_area, se_w, se_h = _overlap(bbox1, bbox2)
+    iou_score = inter_area / (union_area + 1e-7)
+    diou_score = iou_score - _diou_penalty(bbox1, bbox2, se_w, se_h)
+    return diou_score - _ciou_penalty(bbox1, bbox2, iou_score)
 
-    # Compute v
-    # 4 / (math.pi ** 2) = 0.4052847345693511
-    v = 0.4052847345693511 * (math.atan(bbox1.w / bbox1.h) - math.atan(bbox2.w / bbox2.h)) ** 2
 
-    # Compute alpha
-    alpha = v / (1 - iou_score + v)
+@instrumented('measure.all_ious')
+def all_ious(bbox1: BoundingBox, bbox2: BoundingBox) -> IoUScores:
+    """
+    Compute IoU score and all its variations of bounding boxes at once.
+
+    The intersection and the smallest enclosing bounding box are computed only once, so it is faster than
+    calling `iou`, `giou`, `diou` and `ciou` separately. The scores are identical to theirs.
 
-    return diou_score - alpha * v
+    Args:
+        bbox1 (BoundingBox): The predict bounding box.
+        bbox2 (BoundingBox): The groundtruth bounding box.
+
+    Returns:
+        IoUScores: The scores in named tuple `(iou, giou, diou, ciou)`.
+    """
+    if backend._native is not None:
+        return IoUScores(*backend._native.all_ious(bbox1, bbox2))
+    inter_area, union_area, se_w, se_h = _overlap(bbox1, bbox2)
+    se_area = se_w * se_h
+    iou_score = inter_area / (union_area + 1e-7)
+    giou_score = iou_score - (se_area - union_area) / se_area
+    diou_score = iou_score - _diou_penalty(bbox1, bbox2, se_w, se_h)
+    ciou_score = diou_score - _ciou_penalty(bbox1, bbox2, iou_score)
+    return IoUScores(iou_score, giou_score, diou_score, ciou_score)
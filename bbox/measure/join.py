@@ -0,0 +1,146 @@
+import math
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from ..array import as_array
+from .batch import Boxes, _Geometry, _geometry, _iou, _take
+
+# The relative margin of the bounds, so the float rounding never prunes a pair above the threshold
+_SLACK = 1e-9
+
+
+def _windows(start: np.ndarray, stop: np.ndarray, budget: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Expand the windows `[start, stop)` of the rows into pairs `(row, position)`, in batches of about `budget` pairs.
+    """
+    counts = np.maximum(stop - start, 0)
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(counts):
+        last = max(int(np.searchsorted(ends, ends[first] - counts[first] + budget, side='right')), first + 1)
+        rows = np.repeat(np.arange(first, last), counts[first:last])
+        offsets = np.cumsum(counts[first:last]) - counts[first:last]
+        positions = np.arange(len(rows)) - np.repeat(offsets - start[first:last], counts[first:last])
+        yield rows, positions
+        first = last
+
+
+def _sweep(g1: _Geometry, g2: _Geometry, threshold: float, budget: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find the candidate pairs whose left edge of `g2` lies in the shrunk interval of `g1` along x-axis.
+
+    The overlap width of a pair above the threshold is greater than `threshold * width` of both bounding boxes,
+    so the left edge of `g2` is in `[x1, x2 - threshold * width)` of `g1`. Sweeping `g1` over `g2` and then `g2`
+    over `g1` with the left edges strictly after finds every pair once.
+
+    The bounding boxes of `g2` are split into horizontal bands as tall as the tallest one, and only the bands
+    overlapping along y-axis are swept, so the candidates far apart vertically are never generated.
+    """
+    if len(g1.x) == 0 or len(g2.x) == 0:
+        return
+    # The bounds are rounded outwards for the bounding boxes in sub-pixel precision
+    height = max(math.ceil((g2.y2 - g2.y1).max()), 1)
+    low = math.floor(min(g1.x1.min(), g2.x1.min()))
+    span = math.ceil(max(g1.x2.max(), g2.x1.max())) - low + 1
+
+    # Sort by the bands then the left edges, the keys of a band never reach the next one
+    keys = (g2.y1 // height) * span + (g2.x1 - low)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+
+    limit = g1.x2 - threshold * (g1.x2 - g1.x1) * (1 - _SLACK) - low
+    first = (g1.y1 - height) // height
+    last = g1.y2 // height
+    for band in range(int((last - first).max()) + 1):
+        rows = np.flatnonzero(first + band <= last)
+        base = (first[rows] + band) * span
+        start = np.searchsorted(keys, base + (g1.x1[rows] - low), side='left')
+        stop = np.searchsorted(keys, base + limit[rows], side='left')
+        for index, positions in _windows(start, stop, budget):
+            yield rows[index], order[positions]
+
+
+def _prune(g1: _Geometry, g2: _Geometry, threshold: float) -> np.ndarray:
+    """
+    Check the bounds of IoU score of the pairs, the pairs failing any of them are never above the threshold.
+    """
+    w1, h1 = g1.x2 - g1.x1, g1.y2 - g1.y1
+    w2, h2 = g2.x2 - g2.x1, g2.y2 - g2.y1
+    overlap_w = np.minimum(g1.x2, g2.x2) - np.maximum(g1.x1, g2.x1)
+    overlap_h = np.minimum(g1.y2, g2.y2) - np.maximum(g1.y1, g2.y1)
+    scale = threshold * (1 - _SLACK)
+    return (
+        (overlap_w > scale * np.maximum(w1, w2)) & (overlap_h > scale * np.maximum(h1, h2))
+        # IoU score is at most the ratio of the smaller area to the larger one
+        & (np.minimum(w1 * h1, w2 * h2) > scale * np.maximum(g1.area, g2.area))
+    )
+
+
+def overlap_join(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    min_iou: float,
+    budget: int = 1 << 22
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all the pairs of bounding boxes whose IoU score is greater than the threshold.
+
+    Rather than computing every pair, the bounding boxes are swept along x-axis in the order of the left edges,
+    where the interval is shrunk by the threshold. The candidates are pruned by the overlap along both axes
+    and the ratio of the areas before computing the scores, so the cost grows with the number of overlapping
+    pairs instead of `N x M`. The scores are identical to `bbox.measure.iou`.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The first bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The second bounding boxes, `M` in total.
+        min_iou (float): The minimum IoU score exclusively.
+        budget (int, optional): The maximum number of candidate pairs computed at a time, which bounds
+            the memory usage. Defaults to 4194304.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices in `boxes1`, the indices in `boxes2` and the IoU
+            scores of the pairs, sorted by the first indices then the second indices.
+
+    Examples:
+        >>> from bbox import BoundingBoxArray
+        >>> boxes1 = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (0, 0, 20, 20)])
+        >>> boxes2 = BoundingBoxArray.from_xyxy([(5, 5, 15, 15), (0, 0, 10, 12)])
+        >>> overlap_join(boxes1, boxes2, 0.5)
+        (array([0]), array([1]), array([0.83333333]))
+    """
+    assert budget > 0, 'budget must be positive'
+    g1, g2 = _geometry(as_array(boxes1)), _geometry(as_array(boxes2))
+    if min_iou < 0:
+        # Every pair is above the negative threshold
+        i, j = np.divmod(np.arange(len(g1.x) * len(g2.x)), len(g2.x))
+        return i, j, _iou(_take(g1, i), _take(g2, j))
+
+    rows, cols, scores = [], [], []
+    sweeps = (
+        (g1, g2, False),
+        (g2, g1, True)
+    )
+    for sweeping, swept, swapped in sweeps:
+        for i, j in _sweep(sweeping, swept, min_iou, budget):
+            if swapped:
+                # The pairs with the same left edges are found in the first sweep
+                i, j = j, i
+                keep = g1.x1[i] > g2.x1[j]
+            else:
+                keep = np.ones(len(i), dtype=bool)
+            a, b = _take(g1, i), _take(g2, j)
+            keep &= _prune(a, b, min_iou)
+            i, j = i[keep], j[keep]
+            score = _iou(_take(a, keep), _take(b, keep))
+            mask = score > min_iou
+            rows.append(i[mask])
+            cols.append(j[mask])
+            scores.append(score[mask])
+
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], scores[order]
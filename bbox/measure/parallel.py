@@ -0,0 +1,217 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+from ..array import BoundingBoxArray, as_array
+from .batch import Boxes, _ciou, _diou, _expand, _geometry, _giou, _Geometry, _iou, _take
+
+_KERNELS = {
+    'iou': _iou,
+    'giou': _giou,
+    'diou': _diou,
+    'ciou': _ciou
+}
+
+# The state of the current worker process, set by `_attach`
+_worker: Dict[str, object] = {}
+
+
+def _share(boxes1: BoundingBoxArray, boxes2: BoundingBoxArray) -> shared_memory.SharedMemory:
+    """
+    Copy the columns of both bounding boxes into a block of shared memory, in rows `x`, `y`, `w` and `h`.
+
+    The columns of each bounding boxes keep their own dtype, so the sub-pixel ones are not truncated.
+    """
+    n, m = len(boxes1), len(boxes2)
+    memory = shared_memory.SharedMemory(create=True, size=max(4 * (n + m) * 8, 1))
+    for boxes, offset in ((boxes1, 0), (boxes2, 4 * n * 8)):
+        columns = np.ndarray((4, len(boxes)), dtype=boxes._dtype, buffer=memory.buf, offset=offset)
+        for i, name in enumerate('xywh'):
+            columns[i] = getattr(boxes, name)
+        del columns
+    return memory
+
+
+def _view(memory: shared_memory.SharedMemory, cls: Type[BoundingBoxArray], n: int, offset: int) -> BoundingBoxArray:
+    columns = np.ndarray((4, n), dtype=cls._dtype, buffer=memory.buf, offset=offset)
+    return cls.construct_unchecked(*columns)
+
+
+def _load(memory: shared_memory.SharedMemory, n: int, m: int, metric: str, types: Tuple[type, type]):
+    boxes1 = _view(memory, types[0], n, 0)
+    boxes2 = _view(memory, types[1], m, 4 * n * 8)
+    _worker.update(memory=memory, g1=_geometry(boxes1), g2=_geometry(boxes2), kernel=_KERNELS[metric])
+
+
+def _attach(name: str, n: int, m: int, metric: str, types: Tuple[type, type]):
+    """
+    Attach the worker to the shared bounding boxes, the memory is owned and released by the parent process.
+    """
+    _load(shared_memory.SharedMemory(name=name), n, m, metric, types)
+
+
+def _extent(g: _Geometry) -> Tuple[int, int, int, int]:
+    return g.x1.min(), g.y1.min(), g.x2.max(), g.y2.max()
+
+
+def _scores(row_start: int, row_stop: int, col_start: int, col_stop: int) -> np.ndarray:
+    g1 = _take(_worker['g1'], slice(row_start, row_stop))
+    g2 = _take(_worker['g2'], slice(col_start, col_stop))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _worker['kernel'](_expand(g1, 1), _expand(g2, 0))
+
+
+def _above_tile(row_start: int, row_stop: int, col_start: int, col_stop: int, threshold: float, gated: bool):
+    if gated:
+        # IoU score is positive only if the bounding boxes intersect, skip the tiles far apart
+        a1, b1, a2, b2 = _extent(_take(_worker['g1'], slice(row_start, row_stop)))
+        c1, d1, c2, d2 = _extent(_take(_worker['g2'], slice(col_start, col_stop)))
+        if min(a2, c2) <= max(a1, c1) or min(b2, d2) <= max(b1, d1):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+    scores = _scores(row_start, row_stop, col_start, col_stop)
+    rows, cols = np.nonzero(scores > threshold)
+    return rows + row_start, cols + col_start, scores[rows, cols]
+
+
+def _topk_rows(row_start: int, row_stop: int, k: int, tile_size: int):
+    n_cols = len(_worker['g2'].x)
+    best_scores = np.full((row_stop - row_start, 0), -np.inf)
+    best_cols = np.empty((row_stop - row_start, 0), dtype=np.int64)
+    for col_start in range(0, n_cols, tile_size):
+        col_stop = min(col_start + tile_size, n_cols)
+        scores = np.concatenate((best_scores, _scores(row_start, row_stop, col_start, col_stop)), axis=1)
+        cols = np.concatenate((best_cols, np.broadcast_to(np.arange(col_start, col_stop), (len(scores), col_stop - col_start))), axis=1)
+
+        # Keep the highest scores, the ties are broken by the smaller column indices
+        order = np.lexsort((cols, -np.nan_to_num(scores, nan=-np.inf)), axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, order, axis=1)
+        best_cols = np.take_along_axis(cols, order, axis=1)
+    return best_cols, best_scores
+
+
+class _Pool:
+    """
+    Share the bounding boxes and run the tasks in worker processes, or in the current process if `workers` is 1.
+    """
+
+    def __init__(self, boxes1: Boxes, boxes2: Boxes, metric: str, workers: Optional[int]):
+        assert metric in _KERNELS, f'expected metric in {", ".join(_KERNELS)}, got {metric}'
+        assert workers is None or workers > 0, 'number of workers must be positive'
+        boxes1, boxes2 = as_array(boxes1), as_array(boxes2)
+        self.shape = (len(boxes1), len(boxes2))
+        self.workers = workers or os.cpu_count() or 1
+        self._memory = _share(boxes1, boxes2)
+        self._args = (len(boxes1), len(boxes2), metric, (type(boxes1), type(boxes2)))
+        self._executor = None
+
+    def map(self, function, tasks: List[tuple]) -> list:
+        if self.workers == 1 or len(tasks) <= 1:
+            _load(self._memory, *self._args)
+            return [function(*task) for task in tasks]
+        initargs = (self._memory.name, *self._args)
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_attach, initargs=initargs)
+        # The results are collected in the order of the tasks regardless of the completion order
+        return list(self._executor.map(function, *zip(*tasks)))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+        # The views of the memory must be released before closing it
+        _worker.clear()
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> '_Pool':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def pairs_above(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    threshold: float,
+    metric: str = 'iou',
+    workers: Optional[int] = None,
+    tile_size: int = 2048
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the pairs of bounding boxes whose score is greater than the threshold in parallel.
+
+    The `N x M` pairs are split into tiles computed by a pool of processes. The bounding boxes are passed to
+    the workers through shared memory and only the pairs above the threshold are sent back.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The first bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The second bounding boxes, `M` in total.
+        threshold (float): The minimum score exclusively.
+        metric (str, optional): The score, either `iou`, `giou`, `diou` or `ciou`. Defaults to `iou`.
+        workers (int, optional): The number of processes, computed in the current process if 1.
+            Defaults to the number of CPUs.
+        tile_size (int, optional): The number of rows and columns of each tile. Defaults to 2048.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices in `boxes1`, the indices in `boxes2` and the scores
+            of the pairs, sorted by the first indices then the second indices.
+    """
+    assert tile_size > 0, 'tile size must be positive'
+    with _Pool(boxes1, boxes2, metric, workers) as pool:
+        n, m = pool.shape
+        gated = metric == 'iou' and threshold >= 0
+        tasks = [
+            (row, min(row + tile_size, n), col, min(col + tile_size, m), threshold, gated)
+            for row in range(0, n, tile_size) for col in range(0, m, tile_size)
+        ]
+        results = pool.map(_above_tile, tasks)
+
+    if not results:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    rows, cols, scores = (np.concatenate(column) for column in zip(*results))
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], scores[order]
+
+
+def topk(
+    boxes1: Boxes,
+    boxes2: Boxes,
+    k: int,
+    metric: str = 'iou',
+    workers: Optional[int] = None,
+    tile_size: int = 2048
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the `k` bounding boxes in `boxes2` with the highest scores for each one in `boxes1` in parallel.
+
+    The rows are split into blocks computed by a pool of processes, each worker scans the columns tile by tile
+    and keeps only the `k` best ones of each row.
+
+    Args:
+        boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The query bounding boxes, `N` in total.
+        boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `M` in total.
+        k (int): The number of candidates of each query, at most `M`.
+        metric (str, optional): The score, either `iou`, `giou`, `diou` or `ciou`. Defaults to `iou`.
+        workers (int, optional): The number of processes, computed in the current process if 1.
+            Defaults to the number of CPUs.
+        tile_size (int, optional): The number of rows and columns of each tile. Defaults to 2048.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices of the candidates and their scores in shape `(N, min(k, M))`,
+            sorted by the scores in descending order then the indices, `nan` scores come last.
+    """
+    assert k > 0, 'k must be positive'
+    assert tile_size > 0, 'tile size must be positive'
+    with _Pool(boxes1, boxes2, metric, workers) as pool:
+        n, m = pool.shape
+        k = min(k, m)
+        tasks = [(row, min(row + tile_size, n), k, tile_size) for row in range(0, n, tile_size)]
+        results = pool.map(_topk_rows, tasks)
+
+    if not results:
+        return np.empty((0, k), dtype=np.int64), np.empty((0, k), dtype=np.float64)
+    return np.concatenate([cols for cols, _ in results]), np.concatenate([scores for _, scores in results])
@@ -0,0 +1,170 @@
+"""
+The native kernels of the scalar measurements and transforms compiled by Numba, see `bbox.backend.set_backend`.
+
+The arithmetic follows the pure Python implementation operation by operation, so the results are identical.
+The corners are still formatted by `to_xyxy` in Python, since they are cached by the bounding boxes. The intersection
+and union areas are not compiled, since calling a kernel costs more than their few comparisons, nor is `scaling`,
+which is dominated by creating the bounding box.
+"""
+import ctypes
+import ctypes.util
+import math
+from typing import Tuple
+
+from numba import njit, types
+from numba.extending import overload
+
+from .bbox import BoundingBox, FloatBoundingBox
+
+
+# CPython squares a float by `pow` of the C library, which may differ from `x * x` in the last bit
+_libm = ctypes.CDLL(ctypes.util.find_library('m') or ctypes.util.find_library('c') or 'msvcrt')
+_pow = _libm.pow
+_pow.restype = ctypes.c_double
+_pow.argtypes = (ctypes.c_double, ctypes.c_double)
+
+
+def _half(length):
+    raise NotImplementedError('only called by the native kernels')
+
+
+@overload(_half)
+def _half_kernel(length):
+    if isinstance(length, types.Integer):
+        return lambda length: length // 2
+    return lambda length: length / 2
+
+
+def _square(value):
+    raise NotImplementedError('only called by the native kernels')
+
+
+@overload(_square)
+def _square_kernel(value):
+    if isinstance(value, types.Integer):
+        return lambda value: value * value
+    return lambda value: _pow(value, 2.0)
+
+
+@njit
+def _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2):
+    overlap_w = min(x2, a2) - max(x1, a1)
+    overlap_h = min(y2, b2) - max(y1, b1)
+    inter_area = overlap_w * overlap_h if overlap_w > 0 and overlap_h > 0 else 0
+    union_area = area1 + area2 - inter_area
+    return inter_area, union_area, max(x2, a2) - min(x1, a1), max(y2, b2) - min(y1, b1)
+
+
+@njit
+def _snapped(x1, y1, x2, y2, a1, b1, a2, b2, pixel1, pixel2):
+    """
+    Check whether the smallest enclosing bounding box is snapped to the even width and height.
+
+    The pure Python implementation snaps it only if both its width and height are integers, i.e. `max` and `min`
+    both return the corners of the bounding boxes in pixels, where the first one is returned on ties.
+    """
+    if pixel1 == pixel2:
+        return pixel1
+    if pixel1:
+        return x2 >= a2 and x1 <= a1 and y2 >= b2 and y1 <= b1
+    return a2 > x2 and a1 < x1 and b2 > y2 and b1 < y1
+
+
+@njit
+def _diou_penalty(x1, y1, x2, y2, a1, b1, a2, b2, x, y, u, v, se_w, se_h, pixel1, pixel2):
+    center_dist = _square(x - u) + _square(y - v)
+    if _snapped(x1, y1, x2, y2, a1, b1, a2, b2, pixel1, pixel2):
+        se_w, se_h = se_w // 2 * 2, se_h // 2 * 2
+    se_dist = _square(se_w) + _square(se_h)
+    return center_dist / se_dist
+
+
+@njit
+def _ciou_penalty(w, h, s, t, iou_score):
+    # 4 / (math.pi ** 2) = 0.4052847345693511
+    v = 0.4052847345693511 * _square(math.atan(w / h) - math.atan(s / t))
+    alpha = v / (1 - iou_score + v)
+    return alpha * v
+
+
+@njit
+def _iou(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2):
+    inter_area, union_area, _, _ = _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2)
+    return inter_area / (union_area + 1e-7)
+
+
+@njit
+def _giou(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2):
+    inter_area, union_area, se_w, se_h = _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2)
+    se_area = se_w * se_h
+    return inter_area / (union_area + 1e-7) - (se_area - union_area) / se_area
+
+
+@njit
+def _diou(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2, x, y, u, v, pixel1, pixel2):
+    inter_area, union_area, se_w, se_h = _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2)
+    penalty = _diou_penalty(x1, y1, x2, y2, a1, b1, a2, b2, x, y, u, v, se_w, se_h, pixel1, pixel2)
+    return inter_area / (union_area + 1e-7) - penalty
+
+
+@njit
+def _all_ious(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2, x, y, w, h, u, v, s, t, pixel1, pixel2):
+    inter_area, union_area, se_w, se_h = _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2)
+    se_area = se_w * se_h
+    iou_score = inter_area / (union_area + 1e-7)
+    giou_score = iou_score - (se_area - union_area) / se_area
+    diou_score = iou_score - _diou_penalty(x1, y1, x2, y2, a1, b1, a2, b2, x, y, u, v, se_w, se_h, pixel1, pixel2)
+    ciou_score = diou_score - _ciou_penalty(w, h, s, t, iou_score)
+    return iou_score, giou_score, diou_score, ciou_score
+
+
+@njit
+def _ciou(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2, x, y, w, h, u, v, s, t, pixel1, pixel2):
+    inter_area, union_area, se_w, se_h = _overlap(x1, y1, x2, y2, a1, b1, a2, b2, area1, area2)
+    iou_score = inter_area / (union_area + 1e-7)
+    diou_score = iou_score - _diou_penalty(x1, y1, x2, y2, a1, b1, a2, b2, x, y, u, v, se_w, se_h, pixel1, pixel2)
+    return diou_score - _ciou_penalty(w, h, s, t, iou_score)
+
+
+@njit
+def _enclosing(x1, y1, x2, y2, a1, b1, a2, b2):
+    x1, y1, x2, y2 = min(x1, a1), min(y1, b1), max(x2, a2), max(y2, b2)
+    w = x2 - x1
+    h = y2 - y1
+    return x1 + _half(w), y1 + _half(h), w, h
+
+
+def iou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
+    return _iou(*bbox1.to_xyxy(), *bbox2.to_xyxy(), bbox1.area, bbox2.area)
+
+
+def giou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
+    return _giou(*bbox1.to_xyxy(), *bbox2.to_xyxy(), bbox1.area, bbox2.area)
+
+
+def diou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
+    return _diou(
+        *bbox1.to_xyxy(), *bbox2.to_xyxy(), bbox1.area, bbox2.area, bbox1.x, bbox1.y, bbox2.x, bbox2.y,
+        not isinstance(bbox1, FloatBoundingBox), not isinstance(bbox2, FloatBoundingBox)
+    )
+
+
+def ciou(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
+    return _ciou(
+        *bbox1.to_xyxy(), *bbox2.to_xyxy(), bbox1.area, bbox2.area,
+        bbox1.x, bbox1.y, bbox1.w, bbox1.h, bbox2.x, bbox2.y, bbox2.w, bbox2.h,
+        not isinstance(bbox1, FloatBoundingBox), not isinstance(bbox2, FloatBoundingBox)
+    )
+
+
+def all_ious(bbox1: BoundingBox, bbox2: BoundingBox) -> Tuple[float, float, float, float]:
+    return _all_ious(
+        *bbox1.to_xyxy(), *bbox2.to_xyxy(), bbox1.area, bbox2.area,
+        bbox1.x, bbox1.y, bbox1.w, bbox1.h, bbox2.x, bbox2.y, bbox2.w, bbox2.h,
+        not isinstance(bbox1, FloatBoundingBox), not isinstance(bbox2, FloatBoundingBox)
+    )
+
+
+def smallest_enclosing(bbox1: BoundingBox, bbox2: BoundingBox) -> BoundingBox:
+    cls = FloatBoundingBox if isinstance(bbox1, FloatBoundingBox) or isinstance(bbox2, FloatBoundingBox) else BoundingBox
+    return cls.construct_unchecked(*_enclosing(*bbox1.to_xyxy(), *bbox2.to_xyxy()))
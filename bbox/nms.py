@@ -0,0 +1,252 @@
+"""
+Non-maximum suppression over the arrays of bounding boxes.
+
+Only the candidate pairs found by sweeping along x-axis are scored, the pairs overlapping by at most the threshold
+of the larger width or height are skipped. The cost grows with the number of candidates rather than `N x N`, about
+1 ms for 1k candidates spread over a 1280 x 1280 image and about 3 ms for 1k dense candidates on a single core. The
+sub-millisecond latency is reached only when the candidates are sparse or the threshold is high.
+"""
+import heapq
+from typing import Tuple
+
+import numpy as np
+
+from .array import as_array
+from .measure.batch import Boxes, Kernel, _diou, _Geometry, _geometry, _iou, _take
+from .measure.join import _SLACK
+
+
+def _check(boxes: Boxes, scores) -> Tuple:
+    boxes = as_array(boxes)
+    scores = np.asarray(scores, dtype=np.float64)
+    assert scores.shape == (len(boxes),), f'expected scores in shape ({len(boxes)},), got {scores.shape}'
+    return boxes, scores
+
+
+def _intersecting_pairs(geometry: _Geometry, threshold: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all the pairs of bounding boxes whose IoU may be greater than the threshold by sweeping along x-axis.
+
+    The IoU is not greater than the ratio of the overlap to the larger width or height, so the pairs overlapping
+    by at most `threshold` of the larger width or height along either axis are skipped.
+
+    Args:
+        geometry (_Geometry): The geometry of the bounding boxes.
+        threshold (float, optional): The non-negative IoU threshold. Defaults to 0, finding the pairs with
+            positive intersection area.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices `(i, j)` of the pairs where `i < j`.
+    """
+    n = len(geometry.x)
+    order = np.argsort(geometry.x1, kind='stable')
+    x1, y1, x2, y2 = geometry.x1[order], geometry.y1[order], geometry.x2[order], geometry.y2[order]
+    w, h = x2 - x1, y2 - y1
+    threshold *= 1 - _SLACK
+
+    # The candidates of the k-th box in sweep order are the following boxes starting before its right edge,
+    # less the part the overlap must exceed
+    start = np.arange(1, n + 1)
+    counts = np.maximum(np.searchsorted(x1, x2 - threshold * w, side='left') - start, 0)
+    left = np.repeat(np.arange(n), counts)
+    right = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - start, counts)
+
+    # The left boxes are in sweep order, so repeating their columns is cheaper than gathering them
+    overlap_w = np.minimum(np.repeat(x2, counts), x2[right]) - x1[right]
+    overlap_h = np.minimum(np.repeat(y2, counts), y2[right]) - np.maximum(np.repeat(y1, counts), y1[right])
+    if threshold > 0:
+        mask = overlap_w > threshold * np.maximum(np.repeat(w, counts), w[right])
+        mask &= overlap_h > threshold * np.maximum(np.repeat(h, counts), h[right])
+    else:
+        mask = (overlap_w > 0) & (overlap_h > 0)
+    i, j = order[left[mask]], order[right[mask]]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _overlapping_pairs(kernel: Kernel, geometry: _Geometry, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all the pairs of bounding boxes whose overlap measured by the kernel is greater than the threshold.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices `(i, j)` of the pairs where `i < j` and their overlaps.
+    """
+    if threshold >= 0:
+        # Both IoU and DIoU are not greater than the threshold unless the overlap along both axes is large enough
+        i, j = _intersecting_pairs(geometry, threshold)
+    else:
+        i, j = np.triu_indices(len(geometry.x), k=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overlap = kernel(_take(geometry, i), _take(geometry, j))
+    mask = overlap > threshold
+    return i[mask], j[mask], overlap[mask]
+
+
+def _suppress(order: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Visit the bounding boxes in order and discard the ones overlapping with any kept one.
+
+    Args:
+        order (np.ndarray): The indices of the bounding boxes in descending order of scores.
+        i (np.ndarray): The positions in `order` of the overlapping pairs.
+        j (np.ndarray): The positions in `order` of the overlapping pairs, where `i < j`.
+
+    Returns:
+        np.ndarray: The indices of the kept bounding boxes in descending order of scores.
+    """
+    # Group the suppressed candidates by the suppressing box, `i` always has higher score than `j`
+    grouping = np.argsort(i, kind='stable')
+    sources = i[grouping]
+    suppressed = j[grouping]
+    indptr = np.searchsorted(sources, np.arange(len(order) + 1)).tolist()
+
+    # Only the boxes suppressing others are visited, every other box is kept unless suppressed
+    removed = np.zeros(len(order), dtype=bool)
+    for index in np.unique(sources).tolist():
+        if not removed[index]:
+            removed[suppressed[indptr[index]:indptr[index + 1]]] = True
+    return order[~removed]
+
+
+def _greedy(kernel: Kernel, boxes: Boxes, scores, threshold: float) -> np.ndarray:
+    boxes, scores = _check(boxes, scores)
+    order = np.argsort(-scores, kind='stable')
+    i, j, _ = _overlapping_pairs(kernel, _geometry(boxes[order]), threshold)
+    return _suppress(order, i, j)
+
+
+def nms(boxes: Boxes, scores, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Perform greedy non-maximum suppression.
+
+    The bounding boxes are visited in descending order of scores, a bounding box is kept if its IoU score
+    with every kept bounding box is not greater than `iou_threshold`.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `N` in total.
+        scores (ArrayLike): The confidence scores of the bounding boxes in shape `(N,)`.
+        iou_threshold (float, optional): The IoU threshold for suppression. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The indices of the kept bounding boxes in descending order of scores.
+
+    Examples:
+        >>> from bbox import BoundingBoxArray
+        >>> boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (1, 1, 11, 11), (20, 20, 30, 30)])
+        >>> nms(boxes, [0.8, 0.9, 0.7])
+        array([1, 2])
+    """
+    return _greedy(_iou, boxes, scores, iou_threshold)
+
+
+def diou_nms(boxes: Boxes, scores, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Perform greedy non-maximum suppression with DIoU score.
+
+    Same as `nms` but the overlap is measured by `diou`, so the bounding boxes with distant center points
+    are less likely to be suppressed.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `N` in total.
+        scores (ArrayLike): The confidence scores of the bounding boxes in shape `(N,)`.
+        iou_threshold (float, optional): The DIoU threshold for suppression. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The indices of the kept bounding boxes in descending order of scores.
+    """
+    return _greedy(_diou, boxes, scores, iou_threshold)
+
+
+def batched_nms(boxes: Boxes, scores, labels, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Perform greedy non-maximum suppression for each class independently.
+
+    The bounding boxes of different classes are translated to disjoint regions, so that all the classes
+    are suppressed in a single call of `nms`.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `N` in total.
+        scores (ArrayLike): The confidence scores of the bounding boxes in shape `(N,)`.
+        labels (ArrayLike): The class labels of the bounding boxes in shape `(N,)`.
+        iou_threshold (float, optional): The IoU threshold for suppression. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The indices of the kept bounding boxes in descending order of scores.
+    """
+    boxes, scores = _check(boxes, scores)
+    labels = np.asarray(labels)
+    assert labels.shape == (len(boxes),), f'expected labels in shape ({len(boxes)},), got {labels.shape}'
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Translate each class by a span wider than all the bounding boxes
+    _, groups = np.unique(labels, return_inverse=True)
+    xyxy = boxes.to_xyxy()
+    span = xyxy[:, 2].max() - xyxy[:, 0].min() + 1
+    offset_boxes = boxes.construct_unchecked(boxes.x + groups.reshape(-1) * span, boxes.y, boxes.w, boxes.h)
+    return _greedy(_iou, offset_boxes, scores, iou_threshold)
+
+
+def soft_nms(
+    boxes: Boxes,
+    scores,
+    method: str = 'linear',
+    iou_threshold: float = 0.3,
+    sigma: float = 0.5,
+    score_threshold: float = 0.001
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Perform Soft-NMS which decays the scores of the overlapping bounding boxes instead of discarding them.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The candidate bounding boxes, `N` in total.
+        scores (ArrayLike): The confidence scores of the bounding boxes in shape `(N,)`.
+        method (str, optional): The decay function, either `linear` or `gaussian`. Defaults to `linear`.
+        iou_threshold (float, optional): The IoU threshold above which the scores are decayed by `1 - iou`
+            in `linear` method. Defaults to 0.3.
+        sigma (float, optional): The variance of the decay `exp(-iou ** 2 / sigma)` in `gaussian` method.
+            Defaults to 0.5.
+        score_threshold (float, optional): The bounding boxes with decayed scores below it are discarded.
+            Defaults to 0.001.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices of the kept bounding boxes in descending order of
+            the decayed scores, and the decayed scores.
+    """
+    assert method in ('linear', 'gaussian'), f'expected method linear or gaussian, got {method}'
+    assert sigma > 0, 'sigma must be positive'
+    boxes, scores = _check(boxes, scores)
+
+    # Only the overlapping pairs decay each other, the decay is symmetric
+    i, j, overlap = _overlapping_pairs(_iou, _geometry(boxes), iou_threshold if method == 'linear' else 0)
+    if method == 'linear':
+        decay = 1 - overlap
+    else:
+        decay = np.exp(-overlap ** 2 / sigma)
+    source = np.concatenate((i, j))
+    grouping = np.argsort(source, kind='stable')
+    neighbors = np.concatenate((j, i))[grouping].tolist()
+    decays = np.concatenate((decay, decay))[grouping].tolist()
+    indptr = np.searchsorted(source[grouping], np.arange(len(boxes) + 1)).tolist()
+
+    # Visit the bounding boxes by a heap of decayed scores, the outdated entries are skipped lazily
+    current = scores.tolist()
+    heap = [(-score, index) for index, score in enumerate(current) if score >= score_threshold]
+    heapq.heapify(heap)
+    visited = [False] * len(boxes)
+    keep = []
+    while heap:
+        score, index = heapq.heappop(heap)
+        if visited[index] or -score != current[index]:
+            continue
+        visited[index] = True
+        keep.append(index)
+        for k in range(indptr[index], indptr[index + 1]):
+            neighbor = neighbors[k]
+            if visited[neighbor]:
+                continue
+            current[neighbor] *= decays[k]
+            if current[neighbor] >= score_threshold:
+                heapq.heappush(heap, (-current[neighbor], neighbor))
+
+    keep = np.array(keep, dtype=np.int64)
+    return keep, np.array(current, dtype=np.float64)[keep]
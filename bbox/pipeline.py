@@ -0,0 +1,326 @@
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .array import BoundingBoxArray, FloatBoundingBoxArray, as_array
+from .measure.batch import Boxes, _expand, _geometry, _Geometry, _iou
+
+Source = Union[Boxes, Iterable[BoundingBoxArray]]
+
+
+class Predicate:
+    """
+    A condition on the bounding boxes in a pipeline, combined with `&`, `|` and `~`.
+    """
+
+    def __init__(self, function: Callable[[np.ndarray], np.ndarray]):
+        self._function = function
+
+    def __call__(self, corners: np.ndarray) -> np.ndarray:
+        return self._function(corners)
+
+    def __and__(self, other: 'Predicate') -> 'Predicate':
+        return Predicate(lambda corners: self(corners) & other(corners))
+
+    def __or__(self, other: 'Predicate') -> 'Predicate':
+        return Predicate(lambda corners: self(corners) | other(corners))
+
+    def __invert__(self) -> 'Predicate':
+        return Predicate(lambda corners: ~self(corners))
+
+
+class Field:
+    """
+    A value of the bounding boxes in a pipeline, compared with a number or another field into a `Predicate`.
+
+    The values are computed from the corners in shape `(4, N)`, each column is `(x1, y1, x2, y2)`.
+    """
+
+    def __init__(self, function: Callable[[np.ndarray], np.ndarray]):
+        self._function = function
+
+    def __call__(self, corners: np.ndarray) -> np.ndarray:
+        return self._function(corners)
+
+    def _compare(self, other: Union['Field', float], operator: Callable) -> Predicate:
+        if isinstance(other, Field):
+            return Predicate(lambda corners: operator(self(corners), other(corners)))
+        return Predicate(lambda corners: operator(self(corners), other))
+
+    def __lt__(self, other: Union['Field', float]) -> Predicate:
+        return self._compare(other, np.less)
+
+    def __le__(self, other: Union['Field', float]) -> Predicate:
+        return self._compare(other, np.less_equal)
+
+    def __gt__(self, other: Union['Field', float]) -> Predicate:
+        return self._compare(other, np.greater)
+
+    def __ge__(self, other: Union['Field', float]) -> Predicate:
+        return self._compare(other, np.greater_equal)
+
+
+x1 = Field(lambda corners: corners[0])
+y1 = Field(lambda corners: corners[1])
+x2 = Field(lambda corners: corners[2])
+y2 = Field(lambda corners: corners[3])
+width = Field(lambda corners: corners[2] - corners[0])
+height = Field(lambda corners: corners[3] - corners[1])
+area = Field(lambda corners: (corners[2] - corners[0]) * (corners[3] - corners[1]))
+
+
+def _corners_geometry(corners: np.ndarray) -> _Geometry:
+    w, h = corners[2] - corners[0], corners[3] - corners[1]
+    return _Geometry((corners[0] + corners[2]) / 2, (corners[1] + corners[3]) / 2, w, h, *corners, w * h)
+
+
+def max_iou(boxes: Boxes) -> Field:
+    """
+    The highest IoU score of each bounding box in a pipeline with the reference bounding boxes, zero if none.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The reference bounding boxes, such as the zones of interest.
+
+    Returns:
+        Field: The highest IoU scores.
+
+    Examples:
+        >>> boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (50, 50, 60, 60)])
+        >>> zones = BoundingBoxArray.from_xyxy([(0, 0, 20, 10)])
+        >>> boxes.pipe().filter(max_iou(zones) > 0.3).collect().to_xyxy()
+        array([[ 0,  0, 10, 10]])
+    """
+    reference = _expand(_geometry(as_array(boxes)), 0)
+
+    def function(corners: np.ndarray) -> np.ndarray:
+        return _iou(_expand(_corners_geometry(corners), 1), reference).max(axis=1, initial=0)
+    return Field(function)
+
+
+class Pipeline:
+    """
+    A lazy pipeline of transforms over the bounding boxes.
+
+    The transforms are only recorded, then fused into a single pass over the corners once the result is collected.
+    The corners are computed in a working buffer in place, and the filters only mark the bounding boxes, so nothing
+    is allocated for each step. Each transform returns a new pipeline, so a pipeline can be shared and extended.
+
+    The corners start from the exact edges of the bounding boxes, so the odd widths and heights are not snapped, and
+    are exact in between. The bounding boxes in pixels are rounded to the nearest pixels once at the end, while the ones
+    in sub-pixel precision stay in sub-pixel precision.
+
+    Args:
+        source (BoundingBoxArray | Iterable[BoundingBox] | Iterable[BoundingBoxArray]): The bounding boxes, or a stream
+            of the batches of the bounding boxes, such as the detections of each frame.
+
+    Examples:
+        >>> boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (100, 100, 102, 102), (630, 470, 650, 490)])
+        >>> pipeline = boxes.pipe().scale(1.5).translate(10, 5).clip(640, 480).filter(area > 16)
+        >>> pipeline.collect()
+        BoundingBoxArray(size=2)
+    """
+
+    def __init__(self, source: Source, steps: Tuple[tuple, ...] = ()):
+        self._source = source
+        self._steps = steps
+
+    def _then(self, *step) -> 'Pipeline':
+        return Pipeline(self._source, self._steps + (step,))
+
+    def scale(self, sx: float, sy: Optional[float] = None) -> 'Pipeline':
+        """
+        Scale the bounding boxes around their center points, same as `bbox.transform.scaling_all` if `sy` is not given
+        except that the odd widths and heights are not snapped before scaling.
+
+        Args:
+            sx (float): The scaling ratio along x-axis.
+            sy (float, optional): The scaling ratio along y-axis. Defaults to `sx`.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        sy = sx if sy is None else sy
+        assert sx >= 0 and sy >= 0, 'scale cannot be negative'
+        return self._then('scale', sx, sy)
+
+    def translate(self, dx: float = 0, dy: float = 0) -> 'Pipeline':
+        """
+        Move the bounding boxes, see `bbox.transform.translate`.
+
+        Args:
+            dx (float, optional): The offset along x-axis. Defaults to 0.
+            dy (float, optional): The offset along y-axis. Defaults to 0.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        assert np.ndim(dx) == 0 and np.ndim(dy) == 0, 'expected the same offsets for all the bounding boxes'
+        return self._then('translate', dx, dy)
+
+    def clip(self, width: float, height: float) -> 'Pipeline':
+        """
+        Clip the bounding boxes to the image, see `bbox.transform.clip`.
+
+        Args:
+            width (float): The width of the image.
+            height (float): The height of the image.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        assert width >= 0, 'width cannot be negative'
+        assert height >= 0, 'height cannot be negative'
+        return self._then('clip', width, height)
+
+    def filter(self, predicate: Union[Predicate, Callable[[np.ndarray], np.ndarray]]) -> 'Pipeline':
+        """
+        Keep only the bounding boxes satisfying the condition on their current corners.
+
+        Args:
+            predicate (Predicate | Callable[[np.ndarray], np.ndarray]): The condition built from the fields, such as
+                `area > 16`, or a function mapping the corners in shape `(4, N)` to a boolean mask.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        return self._then('filter', predicate)
+
+    def _batches(self) -> Iterator[BoundingBoxArray]:
+        if isinstance(self._source, BoundingBoxArray):
+            yield self._source
+            return
+        items = iter(self._source)
+        for item in items:
+            if isinstance(item, BoundingBoxArray):
+                # A stream of batches
+                yield item
+                for batch in items:
+                    yield as_array(batch)
+            else:
+                yield as_array([item, *items])
+            return
+
+    def _run(self, boxes: BoundingBoxArray, buffer: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Apply the steps on the bounding boxes in the buffer, the last row of the buffer is the scratch space.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The corners in shape `(4, N)` and the mask of the kept bounding boxes,
+                or `None` if all of them are kept.
+        """
+        n = len(boxes)
+        corners, scratch = buffer[:4, :n], buffer[4, :n]
+        corners[0], corners[2] = boxes.x, boxes.x
+        corners[1], corners[3] = boxes.y, boxes.y
+        for axis, length in enumerate((boxes.w, boxes.h)):
+            # The exact edges rather than `to_xyxy`, which snaps the odd lengths, so `x1 + w` is `x2`
+            scratch[:] = boxes._half(length)
+            corners[axis] -= scratch
+            np.subtract(length, scratch, out=scratch)
+            corners[axis + 2] += scratch
+
+        mask = None
+        for name, *args in self._steps:
+            if name == 'scale':
+                for axis, ratio in enumerate(args):
+                    # The corners are moved away from the center point, `c + (x - c) * ratio`
+                    np.add(corners[axis], corners[axis + 2], out=scratch)
+                    scratch *= (1 - ratio) / 2
+                    for row in (axis, axis + 2):
+                        corners[row] *= ratio
+                        corners[row] += scratch
+            elif name == 'translate':
+                corners[0::2] += args[0]
+                corners[1::2] += args[1]
+            elif name == 'clip':
+                np.clip(corners[0::2], 0, args[0], out=corners[0::2])
+                np.clip(corners[1::2], 0, args[1], out=corners[1::2])
+            else:
+                kept = np.asarray(args[0](corners), dtype=bool)
+                if mask is None:
+                    mask = kept.copy()
+                else:
+                    mask &= kept
+        return corners, mask
+
+    def _chunks(self, chunk_size: int) -> Iterator[Tuple[BoundingBoxArray, np.ndarray, Optional[np.ndarray]]]:
+        assert chunk_size > 0, 'chunk size must be positive'
+        buffer = np.empty((5, chunk_size), dtype=np.float64)
+        for boxes in self._batches():
+            for start in range(0, max(len(boxes), 1), chunk_size):
+                chunk = boxes[start:start + chunk_size]
+                yield (chunk, *self._run(chunk, buffer))
+
+    @staticmethod
+    def _output(boxes: BoundingBoxArray, corners: np.ndarray, mask: Optional[np.ndarray]) -> BoundingBoxArray:
+        xyxy = corners.T if mask is None else corners[:, mask].T
+        if isinstance(boxes, FloatBoundingBoxArray):
+            return FloatBoundingBoxArray.from_xyxy(xyxy)
+        return BoundingBoxArray.from_xyxy(np.rint(xyxy))
+
+    def iter_chunks(self, chunk_size: int = 1 << 16) -> Iterator[BoundingBoxArray]:
+        """
+        Run the pipeline chunk by chunk, such as over an unbounded stream of detections.
+
+        A single working buffer for `chunk_size` bounding boxes is reused by all the chunks, the batches of the source
+        larger than `chunk_size` are split, and each smaller one is yielded as a chunk even if it is empty.
+
+        Args:
+            chunk_size (int, optional): The maximum number of the bounding boxes in each chunk. Defaults to 65536.
+
+        Yields:
+            BoundingBoxArray: The transformed and filtered bounding boxes of each chunk.
+        """
+        for boxes, corners, mask in self._chunks(chunk_size):
+            yield self._output(boxes, corners, mask)
+
+    def to_xyxy(self, chunk_size: int = 1 << 16) -> np.ndarray:
+        """
+        Run the pipeline and format the bounding boxes in array of `(x1, y1, x2, y2)` without creating them.
+
+        Args:
+            chunk_size (int, optional): The number of the bounding boxes processed at a time, the working buffer
+                stays in the CPU cache if it is small. Defaults to 65536.
+
+        Returns:
+            np.ndarray: The exact corners in shape `(N, 4)` in `float64`, before rounded to the pixels.
+        """
+        # The buffer is reused by the next chunk, so the corners are copied
+        results = [(corners if mask is None else corners[:, mask]).T.copy() for _, corners, mask in self._chunks(chunk_size)]
+        return np.concatenate(results) if results else np.empty((0, 4), dtype=np.float64)
+
+    def collect(self, chunk_size: int = 1 << 16) -> BoundingBoxArray:
+        """
+        Run the pipeline over all the bounding boxes.
+
+        Args:
+            chunk_size (int, optional): The number of the bounding boxes processed at a time, the working buffer
+                stays in the CPU cache if it is small. Defaults to 65536.
+
+        Returns:
+            BoundingBoxArray: The transformed and filtered bounding boxes, a `FloatBoundingBoxArray` if the source
+                is in sub-pixel precision.
+        """
+        chunks = list(self.iter_chunks(chunk_size))
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            return BoundingBoxArray.from_xyxy(np.empty((0, 4), dtype=np.int64))
+        cls = FloatBoundingBoxArray if any(isinstance(chunk, FloatBoundingBoxArray) for chunk in chunks) else BoundingBoxArray
+        return cls.construct_unchecked(*(
+            np.concatenate([getattr(chunk, name) for chunk in chunks]).astype(cls._dtype, copy=False) for name in 'xywh'
+        ))
+
+
+def pipe(source: Source) -> Pipeline:
+    """
+    Start a lazy pipeline of transforms over the bounding boxes, see `Pipeline`.
+
+    Args:
+        source (BoundingBoxArray | Iterable[BoundingBox] | Iterable[BoundingBoxArray]): The bounding boxes, or a stream
+            of the batches of the bounding boxes.
+
+    Returns:
+        Pipeline: The empty pipeline.
+    """
+    return Pipeline(source)
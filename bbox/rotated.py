@@ -0,0 +1,380 @@
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel, NonNegativeFloat
+
+from .array import BoundingBoxArray, FloatBoundingBoxArray, _as_float_column, as_array
+from .bbox import BoundingBox, FloatBoundingBox
+from .measure.batch import _geometry
+from .measure.join import overlap_join
+from .nms import _intersecting_pairs, _suppress
+
+# The corners of the unit bounding box, in the same rotational direction as the angles
+_UNIT_CORNERS = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)])
+
+
+class RotatedBoundingBox(BaseModel):
+    """
+    An oriented bounding box, rotated around its center point.
+
+    The angle is in degrees and rotates the x-axis towards the y-axis, the width is along the rotated x-axis.
+    A bounding box with zero angle covers exactly the same area as the `FloatBoundingBox` with the same
+    center point and size.
+
+    Attributes:
+        x (float): The x-coordinate of the center point of the bounding box.
+        y (float): The y-coordinate of the center point of the bounding box.
+        w (float): The width of the bounding box. Raises error if it is negative.
+        h (float): The height of the bounding box. Raises error if it is negative.
+        angle (float): The rotation angle in degrees. Defaults to 0.
+
+    Examples:
+        >>> bbox = RotatedBoundingBox(x=0, y=0, w=2, h=2, angle=45)
+        >>> bbox.to_aligned()
+        FloatBoundingBox(x=0.0, y=0.0, w=2.82842712474619, h=2.82842712474619)
+    """
+    x: float
+    y: float
+    w: NonNegativeFloat
+    h: NonNegativeFloat
+    angle: float = 0.0
+
+    @classmethod
+    def from_aligned(cls, bbox: BoundingBox, angle: float = 0.0) -> 'RotatedBoundingBox':
+        """
+        Initialize a rotated bounding box with an axis-aligned one.
+
+        Args:
+            bbox (BoundingBox): The axis-aligned bounding box.
+            angle (float, optional): The rotation angle in degrees. Defaults to 0.
+
+        Returns:
+            RotatedBoundingBox: The bounding box rotated around the center point of `bbox`.
+        """
+        return cls(x=bbox.x, y=bbox.y, w=bbox.w, h=bbox.h, angle=angle)
+
+    @property
+    def area(self) -> float:
+        """
+        The area of the bounding box.
+        """
+        return self.w * self.h
+
+    def corners(self) -> List[Tuple[float, float]]:
+        """
+        Get the corners of the bounding box.
+
+        Returns:
+            List[Tuple[float, float]]: The xy-coordinates of the 4 corners, starting from the top-left one before rotated.
+        """
+        return [tuple(corner) for corner in RotatedBoundingBoxArray.from_boxes([self]).corners()[0].tolist()]
+
+    def to_aligned(self) -> FloatBoundingBox:
+        """
+        Create the smallest axis-aligned bounding box enclosing the rotated one.
+
+        Returns:
+            FloatBoundingBox: The enclosing bounding box.
+        """
+        return RotatedBoundingBoxArray.from_boxes([self]).to_aligned()[0]
+
+
+class RotatedBoundingBoxArray:
+    """
+    A columnar container of rotated bounding boxes, see `RotatedBoundingBox`.
+
+    Attributes:
+        x (np.ndarray): The x-coordinates of the center points of the bounding boxes.
+        y (np.ndarray): The y-coordinates of the center points of the bounding boxes.
+        w (np.ndarray): The widths of the bounding boxes. Raises error if any of them is negative.
+        h (np.ndarray): The heights of the bounding boxes. Raises error if any of them is negative.
+        angle (np.ndarray): The rotation angles in degrees.
+    """
+    __slots__ = ('x', 'y', 'w', 'h', 'angle')
+
+    def __init__(self, x, y, w, h, angle=None):
+        x = _as_float_column(x, 'x')
+        y = _as_float_column(y, 'y')
+        w = _as_float_column(w, 'w')
+        h = _as_float_column(h, 'h')
+        angle = np.zeros(len(x)) if angle is None else _as_float_column(angle, 'angle')
+        if not len(x) == len(y) == len(w) == len(h) == len(angle):
+            raise ValueError(
+                f'expected columns in the same length, got {len(x)}, {len(y)}, {len(w)}, {len(h)} and {len(angle)}'
+            )
+        if (w < 0).any():
+            raise ValueError('w cannot be negative')
+        if (h < 0).any():
+            raise ValueError('h cannot be negative')
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.angle = angle
+
+    @classmethod
+    def construct_unchecked(
+        cls,
+        x: np.ndarray,
+        y: np.ndarray,
+        w: np.ndarray,
+        h: np.ndarray,
+        angle: np.ndarray
+    ) -> 'RotatedBoundingBoxArray':
+        """
+        Initialize the bounding boxes without validation, see `BoundingBoxArray.construct_unchecked`.
+
+        The caller must guarantee that all of the columns are one-dimensional `float64` arrays in the same length
+        and the widths and heights are not negative.
+        """
+        boxes = cls.__new__(cls)
+        boxes.x = x
+        boxes.y = y
+        boxes.w = w
+        boxes.h = h
+        boxes.angle = angle
+        return boxes
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable[RotatedBoundingBox]) -> 'RotatedBoundingBoxArray':
+        """
+        Initialize the bounding boxes with a collection of `RotatedBoundingBox`.
+
+        Args:
+            boxes (Iterable[RotatedBoundingBox]): The bounding boxes.
+
+        Returns:
+            RotatedBoundingBoxArray: The corresponding bounding boxes.
+        """
+        columns = np.array([(bbox.x, bbox.y, bbox.w, bbox.h, bbox.angle) for bbox in boxes], dtype=np.float64).reshape(-1, 5)
+        return cls.construct_unchecked(*(columns[:, k].copy() for k in range(5)))
+
+    @classmethod
+    def from_aligned(cls, boxes: Union[BoundingBoxArray, Iterable[BoundingBox]], angle=0.0) -> 'RotatedBoundingBoxArray':
+        """
+        Initialize the rotated bounding boxes with axis-aligned ones.
+
+        Args:
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The axis-aligned bounding boxes.
+            angle (float | ArrayLike, optional): The rotation angle in degrees, either shared by all the bounding boxes
+                or one for each of them. Defaults to 0.
+
+        Returns:
+            RotatedBoundingBoxArray: The bounding boxes rotated around the center points.
+        """
+        boxes = as_array(boxes)
+        angle = np.broadcast_to(np.asarray(angle, dtype=np.float64), (len(boxes),)).copy()
+        return cls(boxes.x, boxes.y, boxes.w, boxes.h, angle)
+
+    @property
+    def area(self) -> np.ndarray:
+        """
+        The areas of the bounding boxes.
+        """
+        return self.w * self.h
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[RotatedBoundingBox]:
+        return iter(self.to_boxes())
+
+    def __getitem__(self, index) -> Union[RotatedBoundingBox, 'RotatedBoundingBoxArray']:
+        """
+        Select the bounding boxes, see `BoundingBoxArray.__getitem__`.
+        """
+        if isinstance(index, (int, np.integer)):
+            return RotatedBoundingBox.model_construct(
+                x=self.x[index].item(), y=self.y[index].item(), w=self.w[index].item(), h=self.h[index].item(),
+                angle=self.angle[index].item()
+            )
+        if not isinstance(index, slice):
+            index = np.asarray(index)
+            if index.dtype.kind == 'b' and index.shape != self.x.shape:
+                raise IndexError(f'expected boolean mask in shape {self.x.shape}, got {index.shape}')
+        return self.construct_unchecked(self.x[index], self.y[index], self.w[index], self.h[index], self.angle[index])
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(size={len(self)})'
+
+    def corners(self) -> np.ndarray:
+        """
+        Get the corners of the bounding boxes.
+
+        Returns:
+            np.ndarray: The xy-coordinates in shape `(N, 4, 2)`, in the same order as `RotatedBoundingBox.corners`.
+        """
+        radians = np.deg2rad(self.angle)
+        cos, sin = np.cos(radians)[:, None], np.sin(radians)[:, None]
+        dx = _UNIT_CORNERS[:, 0] * self.w[:, None]
+        dy = _UNIT_CORNERS[:, 1] * self.h[:, None]
+        return np.stack((self.x[:, None] + dx * cos - dy * sin, self.y[:, None] + dx * sin + dy * cos), axis=2)
+
+    def to_aligned(self) -> FloatBoundingBoxArray:
+        """
+        Create the smallest axis-aligned bounding boxes enclosing the rotated ones.
+
+        Returns:
+            FloatBoundingBoxArray: The enclosing bounding boxes.
+        """
+        radians = np.deg2rad(self.angle)
+        cos, sin = np.abs(np.cos(radians)), np.abs(np.sin(radians))
+        return FloatBoundingBoxArray.construct_unchecked(
+            self.x.copy(), self.y.copy(), self.w * cos + self.h * sin, self.w * sin + self.h * cos
+        )
+
+    def to_boxes(self) -> List[RotatedBoundingBox]:
+        """
+        Convert the bounding boxes into a list of `RotatedBoundingBox`.
+
+        Returns:
+            List[RotatedBoundingBox]: The bounding boxes.
+        """
+        return [self[k] for k in range(len(self))]
+
+
+RotatedBoxes = Union[RotatedBoundingBoxArray, Iterable[RotatedBoundingBox]]
+
+
+def _as_rotated(boxes: RotatedBoxes) -> RotatedBoundingBoxArray:
+    if isinstance(boxes, RotatedBoundingBoxArray):
+        return boxes
+    return RotatedBoundingBoxArray.from_boxes(boxes)
+
+
+def _cross(a: np.ndarray, b: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """
+    The cross products of `b - a` and `p - a`, positive if `p` is on the inner side of the edge `a -> b`.
+    """
+    return (b[..., 0] - a[..., 0]) * (p[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (p[..., 0] - a[..., 0])
+
+
+def _clip(subject: np.ndarray, clipping: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Clip the convex polygons pair by pair with Sutherland-Hodgman algorithm.
+
+    The polygons are padded into the same number of vertices, the padded ones are ignored by the counts.
+
+    Args:
+        subject (np.ndarray): The polygons to be clipped in shape `(P, K, 2)`.
+        clipping (np.ndarray): The convex clipping polygons in shape `(P, L, 2)`, in the same rotational direction
+            as `_UNIT_CORNERS`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The clipped polygons in shape `(P, K', 2)` and their numbers of vertices.
+    """
+    polygon = subject
+    counts = np.full(len(subject), subject.shape[1])
+    for edge in range(clipping.shape[1]):
+        a = clipping[:, edge, None]
+        b = clipping[:, (edge + 1) % clipping.shape[1], None]
+        k = np.arange(polygon.shape[1])
+        valid = k < counts[:, None]
+        previous = (k - 1) % np.maximum(counts, 1)[:, None]
+
+        side = _cross(a, b, polygon)
+        previous_side = np.take_along_axis(side, previous, axis=1)
+        inside, previous_inside = side >= 0, previous_side >= 0
+
+        # Each vertex emits the crossing point of the edge from the previous vertex, then itself if inside
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = previous_side / (previous_side - side)
+        start = np.take_along_axis(polygon, previous[..., None], axis=1)
+        crossing = start + t[..., None] * (polygon - start)
+        shape = (len(polygon), 2 * polygon.shape[1])
+        points = np.stack((crossing, polygon), axis=2).reshape(*shape, 2)
+        emitted = np.stack((valid & (inside != previous_inside), valid & inside), axis=2).reshape(shape)
+
+        counts = emitted.sum(axis=1)
+        order = np.argsort(~emitted, axis=1, kind='stable')[:, :counts.max(initial=0)]
+        polygon = np.take_along_axis(points, order[..., None], axis=1)
+    return polygon, counts
+
+
+def _polygon_area(polygon: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Compute the areas of the padded polygons with the shoelace formula.
+    """
+    k = np.arange(polygon.shape[1])
+    following = np.take_along_axis(polygon, ((k + 1) % np.maximum(counts, 1)[:, None])[..., None], axis=1)
+    terms = polygon[..., 0] * following[..., 1] - following[..., 0] * polygon[..., 1]
+    return np.abs(np.where(k < counts[:, None], terms, 0).sum(axis=1)) / 2
+
+
+def _paired_iou(boxes1: RotatedBoundingBoxArray, boxes2: RotatedBoundingBoxArray) -> np.ndarray:
+    """
+    Compute IoU scores of the bounding boxes pair by pair by clipping the corners of each other.
+    """
+    # Move the first ones to the origin, so the precision is not lost in the large coordinates
+    origin = np.stack((boxes1.x, boxes1.y), axis=1)[:, None]
+    with np.errstate(invalid='ignore'):
+        polygon, counts = _clip(boxes1.corners() - origin, boxes2.corners() - origin)
+        inter_area = _polygon_area(polygon, counts)
+    return inter_area / (boxes1.area + boxes2.area - inter_area + 1e-7)
+
+
+def rotated_iou(bbox1: RotatedBoundingBox, bbox2: RotatedBoundingBox) -> float:
+    """
+    Compute IoU score of the rotated bounding boxes.
+
+    Args:
+        bbox1 (RotatedBoundingBox): The predict bounding box.
+        bbox2 (RotatedBoundingBox): The groundtruth bounding box.
+
+    Returns:
+        float: the IoU score, same as `bbox.measure.iou` of the axis-aligned bounding boxes if both angles are zero.
+
+    Examples:
+        >>> bbox = RotatedBoundingBox(x=0, y=0, w=2, h=2)
+        >>> round(rotated_iou(bbox, bbox.model_copy(update={'angle': 45})), 4)
+        0.7071
+    """
+    return _paired_iou(_as_rotated([bbox1]), _as_rotated([bbox2])).item()
+
+
+def rotated_iou_matrix(boxes1: RotatedBoxes, boxes2: RotatedBoxes) -> np.ndarray:
+    """
+    Compute IoU scores of every pair of the rotated bounding boxes.
+
+    Only the pairs whose enclosing axis-aligned bounding boxes overlap are clipped, the others are zero.
+
+    Args:
+        boxes1 (RotatedBoundingBoxArray | Iterable[RotatedBoundingBox]): The predict bounding boxes, `N` in total.
+        boxes2 (RotatedBoundingBoxArray | Iterable[RotatedBoundingBox]): The groundtruth bounding boxes, `M` in total.
+
+    Returns:
+        np.ndarray: The IoU scores in shape `(N, M)`, same as `rotated_iou(boxes1[i], boxes2[j])` at `(i, j)`.
+    """
+    boxes1, boxes2 = _as_rotated(boxes1), _as_rotated(boxes2)
+    matrix = np.zeros((len(boxes1), len(boxes2)), dtype=np.float64)
+    i, j, _ = overlap_join(boxes1.to_aligned(), boxes2.to_aligned(), 0)
+    matrix[i, j] = _paired_iou(boxes1[i], boxes2[j])
+    return matrix
+
+
+def rotated_nms(boxes: RotatedBoxes, scores, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Perform greedy non-maximum suppression on the rotated bounding boxes, see `bbox.nms.nms`.
+
+    Only the pairs whose enclosing axis-aligned bounding boxes overlap are clipped, so the cost grows with the
+    number of the neighbouring pairs instead of `N x N`.
+
+    Args:
+        boxes (RotatedBoundingBoxArray | Iterable[RotatedBoundingBox]): The candidate bounding boxes, `N` in total.
+        scores (ArrayLike): The confidence scores of the bounding boxes in shape `(N,)`.
+        iou_threshold (float, optional): The IoU threshold for suppression. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The indices of the kept bounding boxes in descending order of scores.
+    """
+    boxes = _as_rotated(boxes)
+    scores = np.asarray(scores, dtype=np.float64)
+    assert scores.shape == (len(boxes),), f'expected scores in shape ({len(boxes)},), got {scores.shape}'
+    order = np.argsort(-scores, kind='stable')
+    boxes = boxes[order]
+    if iou_threshold >= 0:
+        i, j = _intersecting_pairs(_geometry(boxes.to_aligned()))
+    else:
+        i, j = np.triu_indices(len(boxes), k=1)
+    mask = _paired_iou(boxes[i], boxes[j]) > iou_threshold
+    return _suppress(order, i[mask], j[mask])
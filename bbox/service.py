@@ -0,0 +1,210 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .array import BoundingBoxArray, as_array
+from .measure.batch import Boxes, _ciou, _diou, _geometry, _giou, _iou, _take
+
+_KERNELS = {
+    'iou': _iou,
+    'giou': _giou,
+    'diou': _diou,
+    'ciou': _ciou
+}
+
+
+class ScorerMetrics(NamedTuple):
+    """
+    The metrics of a `BatchScorer`, the latencies are in seconds from submitting to resolving the requests.
+    """
+    queue_depth: int
+    requests: int
+    batches: int
+    mean_batch_size: float
+    max_batch_size: int
+    mean_latency: float
+    p99_latency: float
+
+
+def _concatenate(arrays: List[BoundingBoxArray]) -> BoundingBoxArray:
+    return type(arrays[0]).construct_unchecked(*(np.concatenate([getattr(boxes, name) for boxes in arrays]) for name in 'xywh'))
+
+
+def _score_group(metric: str, requests: List[Tuple[BoundingBoxArray, BoundingBoxArray]]) -> List[np.ndarray]:
+    sizes1 = np.array([len(boxes1) for boxes1, _ in requests], dtype=np.int64)
+    sizes2 = np.array([len(boxes2) for _, boxes2 in requests], dtype=np.int64)
+    offsets1 = np.cumsum(sizes1) - sizes1
+    offsets2 = np.cumsum(sizes2) - sizes2
+    rows, cols = [], []
+    for n, m, offset1, offset2 in zip(sizes1.tolist(), sizes2.tolist(), offsets1.tolist(), offsets2.tolist()):
+        rows.append(np.repeat(np.arange(offset1, offset1 + n), m))
+        cols.append(np.tile(np.arange(offset2, offset2 + m), n))
+
+    g1 = _geometry(_concatenate([boxes1 for boxes1, _ in requests]))
+    g2 = _geometry(_concatenate([boxes2 for _, boxes2 in requests]))
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.asarray(_KERNELS[metric](_take(g1, rows), _take(g2, cols)), dtype=np.float64)
+    splits = np.cumsum(sizes1 * sizes2)[:-1]
+    return [matrix.reshape(n, m) for matrix, n, m in zip(np.split(scores, splits), sizes1.tolist(), sizes2.tolist())]
+
+
+def _score_batch(metric: str, requests: List[Tuple[BoundingBoxArray, BoundingBoxArray]]) -> List[np.ndarray]:
+    """
+    Compute the score matrices of the requests with a single call of the kernel.
+
+    The pairs of all the requests are flattened into one long list rather than computing the matrix of all
+    the bounding boxes, so no score is computed across the requests. The requests in pixels and in sub-pixel
+    precision are computed separately, since their corners are derived differently.
+    """
+    groups: Dict[tuple, List[int]] = {}
+    for k, (boxes1, boxes2) in enumerate(requests):
+        groups.setdefault((type(boxes1), type(boxes2)), []).append(k)
+
+    results = [None] * len(requests)
+    for indices in groups.values():
+        for k, scores in zip(indices, _score_group(metric, [requests[k] for k in indices])):
+            results[k] = scores
+    return results
+
+
+class BatchScorer:
+    """
+    An asyncio front of the score matrices, which merges the concurrent requests into micro-batches.
+
+    The requests submitted within a short window are computed together by a single vectorized call in an
+    executor, so the event loop is never blocked and the overhead of each call is shared by the batch.
+    Only one batch is computed at a time, the requests arriving meanwhile are queued for the next batch.
+
+    Args:
+        metric (str, optional): The score, either `iou`, `giou`, `diou` or `ciou`. Defaults to `iou`.
+        max_batch_size (int, optional): The maximum number of requests in a batch. Defaults to 64.
+        max_delay (float, optional): The seconds to wait for more requests once a request arrives. Defaults to 0.002.
+        executor (Executor, optional): The thread or process pool computing the batches. Defaults to the default
+            executor of the event loop.
+        window (int, optional): The number of the recent requests measuring the latencies. Defaults to 1024.
+
+    Examples:
+        >>> async def main():
+        ...     async with BatchScorer(max_delay=0.001) as scorer:
+        ...         return await asyncio.gather(scorer.score(boxes1, boxes2), scorer.score(boxes3, boxes4))
+    """
+
+    def __init__(
+        self,
+        metric: str = 'iou',
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+        executor: Optional[Executor] = None,
+        window: int = 1024
+    ):
+        assert metric in _KERNELS, f'expected metric in {", ".join(_KERNELS)}, got {metric}'
+        assert max_batch_size > 0, 'max batch size must be positive'
+        assert max_delay >= 0, 'max delay cannot be negative'
+        self.metric = metric
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self._requests = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._latencies = deque(maxlen=window)
+
+    @property
+    def metrics(self) -> ScorerMetrics:
+        """
+        The current metrics of the scorer.
+        """
+        latencies = np.array(self._latencies, dtype=np.float64)
+        return ScorerMetrics(
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            requests=self._requests,
+            batches=self._batches,
+            mean_batch_size=self._requests / self._batches if self._batches else 0.0,
+            max_batch_size=self._largest_batch,
+            mean_latency=float(latencies.mean()) if len(latencies) else 0.0,
+            p99_latency=float(np.quantile(latencies, 0.99)) if len(latencies) else 0.0
+        )
+
+    async def score(self, boxes1: Boxes, boxes2: Boxes) -> np.ndarray:
+        """
+        Compute the score of every pair of the bounding boxes, same as `bbox.measure.iou_matrix` and its variations.
+
+        Args:
+            boxes1 (BoundingBoxArray | Iterable[BoundingBox]): The first bounding boxes, `N` in total.
+            boxes2 (BoundingBoxArray | Iterable[BoundingBox]): The second bounding boxes, `M` in total.
+
+        Raises:
+            RuntimeError: If the scorer is closed.
+
+        Returns:
+            np.ndarray: The scores in shape `(N, M)`.
+        """
+        if self._closed:
+            raise RuntimeError('scorer is closed')
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((as_array(boxes1), as_array(boxes2), future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            batch = [await self._queue.get()]
+            if batch[0] is None:
+                break
+            if self._queue.qsize() < self.max_batch_size - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+
+            requests = [(boxes1, boxes2) for boxes1, boxes2, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, _score_batch, self.metric, requests)
+            except Exception as error:
+                results = [error] * len(batch)
+
+            self._requests += len(batch)
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, len(batch))
+            now = time.perf_counter()
+            for (_, _, future, submitted), result in zip(batch, results):
+                self._latencies.append(now - submitted)
+                # The caller may have been cancelled while waiting
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def close(self):
+        """
+        Stop accepting the requests and wait for the queued ones to be resolved.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+
+    async def __aenter__(self) -> 'BatchScorer':
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,344 @@
+import math
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from .array import BoundingBoxArray, FloatBoundingBoxArray, as_array
+from .bbox import BoundingBox, FloatBoundingBox
+from .measure.batch import Boxes, _geometry
+
+_SMOOTHINGS = (None, 'ema', 'velocity')
+
+
+class FrameDelta(NamedTuple):
+    """
+    The changes of a frame in a `BoxStream`.
+
+    Attributes:
+        added (np.ndarray): The ids of the bounding boxes appearing in the frame.
+        moved (np.ndarray): The ids of the bounding boxes changed beyond the tolerance since they were last recorded.
+        removed (np.ndarray): The ids of the bounding boxes disappeared, unseen for more than `max_age` frames.
+    """
+    added: np.ndarray
+    moved: np.ndarray
+    removed: np.ndarray
+
+
+class BoxStream:
+    """
+    A stateful stream of the bounding boxes with ids across the frames of a video.
+
+    Each frame is joined with the previous ones by the ids, and only the added, moved and removed bounding boxes
+    update the derived structures, i.e. the areas, the smallest enclosing bounding box and the grid index, so their
+    cost grows with the number of the changed bounding boxes rather than all of them. A bounding box is moved once
+    its center point or size differs from the recorded one by more than `tolerance`, the smaller jitters are
+    ignored and never accumulate.
+
+    The observations can also be smoothed over the frames in vectorized form, either by exponential moving average
+    or by constant velocity (the alpha-beta filter), where the unseen bounding boxes keep moving at their velocities
+    until removed.
+
+    Args:
+        smoothing (str, optional): The smoothing, either `ema`, `velocity` or `None`. Defaults to `ema`.
+        alpha (float, optional): The weight of a new observation, in `(0, 1]`. Defaults to 0.5.
+        beta (float, optional): The weight of a new observation on the velocity, in `[0, 1]`. Defaults to 0.1.
+        max_age (int, optional): The number of the frames a bounding box can be unseen before removed. Defaults to 0,
+            removed once missing from a frame.
+        tolerance (float, optional): The maximum difference of the center point and the size to be unchanged.
+            Defaults to 0.
+        cell_size (float, optional): The width and height of the cells of the grid index. Defaults to 64.
+
+    Examples:
+        >>> stream = BoxStream(smoothing='velocity')
+        >>> stream.update([1, 2], BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (20, 20, 30, 30)]))
+        FrameDelta(added=array([1, 2]), moved=array([], dtype=int64), removed=array([], dtype=int64))
+        >>> stream.update([2, 3], BoundingBoxArray.from_xyxy([(22, 20, 32, 30), (50, 50, 60, 60)]))
+        FrameDelta(added=array([3]), moved=array([2]), removed=array([1]))
+    """
+
+    def __init__(
+        self,
+        smoothing: Optional[str] = 'ema',
+        alpha: float = 0.5,
+        beta: float = 0.1,
+        max_age: int = 0,
+        tolerance: float = 0,
+        cell_size: float = 64
+    ):
+        assert smoothing in _SMOOTHINGS, f'expected smoothing ema, velocity or None, got {smoothing}'
+        assert 0 < alpha <= 1, 'alpha must be in (0, 1]'
+        assert 0 <= beta <= 1, 'beta must be in [0, 1]'
+        assert max_age >= 0, 'max age cannot be negative'
+        assert tolerance >= 0, 'tolerance cannot be negative'
+        assert cell_size > 0, 'cell size must be positive'
+        self.smoothing = smoothing
+        self.alpha = alpha
+        self.beta = beta
+        self.max_age = max_age
+        self.tolerance = tolerance
+        self.cell_size = cell_size
+        self.frame = -1
+
+        # The ids are sorted and aligned with their slots, the columns are indexed by the slots
+        self._ids = np.empty(0, dtype=np.int64)
+        self._slots = np.empty(0, dtype=np.int64)
+        self._free: List[int] = []
+        self._float = False
+        self._columns = np.empty((0, 0))
+        self._state = np.empty((0, 0))
+        self._velocity = np.empty((0, 0))
+        self._seen = np.empty(0, dtype=np.int64)
+        self._owners = np.empty(0, dtype=np.int64)
+        self._grow(16)
+
+        # The derived structures, the enclosing bounds `(x1, y1, x2, y2)` are recomputed once invalidated
+        self._bounds: Optional[np.ndarray] = None
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._ranges: Dict[int, Tuple[int, int, int, int]] = {}
+
+    def _grow(self, capacity: int):
+        """
+        Enlarge the columns to the capacity, the new slots are free.
+        """
+        size = self._columns.shape[1]
+        # Rows of the columns: x, y, w, h, x1, y1, x2, y2, area
+        self._columns = np.concatenate((self._columns.reshape(9, size), np.zeros((9, capacity - size))), axis=1)
+        self._state = np.concatenate((self._state.reshape(4, size), np.zeros((4, capacity - size))), axis=1)
+        self._velocity = np.concatenate((self._velocity.reshape(4, size), np.zeros((4, capacity - size))), axis=1)
+        self._seen = np.concatenate((self._seen, np.zeros(capacity - size, dtype=np.int64)))
+        self._owners = np.concatenate((self._owners, np.zeros(capacity - size, dtype=np.int64)))
+        self._free.extend(range(capacity - 1, size - 1, -1))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """
+        The ids of the current bounding boxes in ascending order.
+        """
+        return self._ids.copy()
+
+    def _allocate(self, n: int) -> np.ndarray:
+        if n > len(self._free):
+            self._grow(max(2 * self._columns.shape[1], self._columns.shape[1] + n))
+        slots = self._free[-n:] if n else []
+        del self._free[len(self._free) - n:]
+        return np.array(slots[::-1], dtype=np.int64)
+
+    def update(self, ids, boxes: Boxes) -> FrameDelta:
+        """
+        Ingest the bounding boxes of the next frame.
+
+        Args:
+            ids (ArrayLike): The unique integer ids of the bounding boxes in shape `(N,)`.
+            boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes, `N` in total.
+
+        Returns:
+            FrameDelta: The ids of the added, moved and removed bounding boxes, each in ascending order.
+        """
+        boxes = as_array(boxes)
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        assert len(ids) == len(boxes), f'expected ids and bounding boxes in the same length, got {len(ids)} and {len(boxes)}'
+        if not (ids[1:] > ids[:-1]).all():
+            order = np.argsort(ids, kind='stable')
+            ids, boxes = ids[order], boxes[order]
+            assert (ids[1:] != ids[:-1]).all(), 'ids must be unique'
+        self.frame += 1
+        self._float = self._float or isinstance(boxes, FloatBoundingBoxArray)
+
+        # Join the frame with the current ids, which are usually the same ones as the previous frame
+        if np.array_equal(ids, self._ids):
+            known = np.ones(len(ids), dtype=bool)
+            slots = self._slots
+        else:
+            positions = np.searchsorted(self._ids, ids)
+            known = positions < len(self._ids)
+            known[known] = self._ids[positions[known]] == ids[known]
+            slots = np.empty(len(ids), dtype=np.int64)
+            slots[known] = self._slots[positions[known]]
+            slots[~known] = self._allocate(int((~known).sum()))
+
+        observed = np.stack((boxes.x, boxes.y, boxes.w, boxes.h)).astype(np.float64, copy=False)
+        moved = (np.abs(self._columns[:4, slots] - observed) > self.tolerance).any(axis=0) & known
+        changed = np.flatnonzero(moved | ~known)
+
+        # The derived structures are only updated for the changed bounding boxes
+        self._release(slots[moved])
+        g = _geometry(boxes[changed])
+        self._columns[:, slots[changed]] = np.stack((g.x, g.y, g.w, g.h, g.x1, g.y1, g.x2, g.y2, g.area))
+        self._index(slots[changed])
+        self._smooth(slots, observed, known)
+        self._seen[slots] = self.frame
+
+        added = ids[~known]
+        self._owners[slots[~known]] = added
+        if len(added):
+            inserted = np.searchsorted(self._ids, added)
+            self._ids = np.insert(self._ids, inserted, added)
+            self._slots = np.insert(self._slots, inserted, slots[~known])
+
+        # The bounding boxes unseen for too long are removed, nothing expires if all of them are seen
+        if len(ids) == len(self._ids):
+            return FrameDelta(added, ids[moved], self._ids[:0])
+        expired = self._seen[self._slots] < self.frame - self.max_age
+        removed = self._ids[expired]
+        if len(removed):
+            released = self._slots[expired]
+            self._release(released)
+            for slot in released.tolist():
+                self._leave(slot, self._ranges.pop(slot))
+            self._free.extend(released.tolist())
+            self._ids, self._slots = self._ids[~expired], self._slots[~expired]
+        return FrameDelta(added, ids[moved], removed)
+
+    def _smooth(self, slots: np.ndarray, observed: np.ndarray, known: np.ndarray):
+        """
+        Update the smoothed states of the seen bounding boxes, the new ones start at their observations.
+        """
+        if self.smoothing is None:
+            return
+        if not known.all():
+            new = slots[~known]
+            self._state[:, new] = observed[:, ~known]
+            self._velocity[:, new] = 0
+            slots, observed = slots[known], observed[:, known]
+        state = self._state[:, slots]
+        if self.smoothing == 'ema':
+            state += self.alpha * (observed - state)
+        else:
+            # Predict the states at the current frame, then correct the states and the velocities by the residuals
+            elapsed = self.frame - self._seen[slots]
+            velocity = self._velocity[:, slots]
+            state += velocity * elapsed
+            residual = observed - state
+            state += self.alpha * residual
+            residual *= self.beta / elapsed
+            velocity += residual
+            self._velocity[:, slots] = velocity
+        self._state[:, slots] = state
+
+    def _cell_range(self, x1: float, y1: float, x2: float, y2: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return math.floor(x1 / size), math.floor(y1 / size), math.floor(x2 / size), math.floor(y2 / size)
+
+    def _index(self, slots: np.ndarray):
+        """
+        Move the bounding boxes into their cells of the grid index and extend the enclosing bounds.
+        """
+        if not len(slots):
+            return
+        x1, y1, x2, y2 = self._columns[4:8, slots]
+        for slot, corners in zip(slots.tolist(), zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())):
+            cells = self._cell_range(*corners)
+            previous = self._ranges.get(slot)
+            if previous == cells:
+                # A small movement usually stays in the same cells
+                continue
+            if previous is not None:
+                self._leave(slot, previous)
+            self._ranges[slot] = cells
+            for i in range(cells[0], cells[2] + 1):
+                for j in range(cells[1], cells[3] + 1):
+                    self._cells.setdefault((i, j), set()).add(slot)
+
+        if self._bounds is not None:
+            self._bounds = np.concatenate((
+                np.minimum(self._bounds[:2], (x1.min(), y1.min())),
+                np.maximum(self._bounds[2:], (x2.max(), y2.max()))
+            ))
+
+    def _leave(self, slot: int, cells: Tuple[int, int, int, int]):
+        for i in range(cells[0], cells[2] + 1):
+            for j in range(cells[1], cells[3] + 1):
+                members = self._cells[i, j]
+                members.discard(slot)
+                if not members:
+                    del self._cells[i, j]
+
+    def _release(self, slots: np.ndarray):
+        """
+        Invalidate the enclosing bounds if any of the bounding boxes touches them, they are recomputed once accessed.
+        """
+        if self._bounds is not None and len(slots):
+            corners = self._columns[4:8, slots]
+            if (corners[:2] <= self._bounds[:2, None]).any() or (corners[2:] >= self._bounds[2:, None]).any():
+                self._bounds = None
+
+    def _output(self, columns: np.ndarray) -> BoundingBoxArray:
+        if self._float:
+            return FloatBoundingBoxArray.construct_unchecked(*columns)
+        return BoundingBoxArray.construct_unchecked(*np.rint(columns).astype(np.int64))
+
+    @property
+    def boxes(self) -> BoundingBoxArray:
+        """
+        The recorded bounding boxes in the order of `ids`, a `FloatBoundingBoxArray` if any frame is in sub-pixel
+        precision.
+        """
+        return self._output(self._columns[:4, self._slots])
+
+    @property
+    def areas(self) -> np.ndarray:
+        """
+        The areas of the recorded bounding boxes in the order of `ids`.
+        """
+        return self._columns[8, self._slots]
+
+    @property
+    def smoothed(self) -> FloatBoundingBoxArray:
+        """
+        The smoothed bounding boxes at the current frame in the order of `ids`, the unseen ones are extrapolated
+        by their velocities if the smoothing is `velocity`, or the recorded ones if there is no smoothing.
+        """
+        if self.smoothing is None:
+            return FloatBoundingBoxArray.construct_unchecked(*self._columns[:4, self._slots])
+        state = self._state[:, self._slots]
+        if self.smoothing == 'velocity':
+            state = state + self._velocity[:, self._slots] * (self.frame - self._seen[self._slots])
+        state[2:] = np.maximum(state[2:], 0)
+        return FloatBoundingBoxArray.construct_unchecked(*state)
+
+    @property
+    def enclosing(self) -> Optional[BoundingBox]:
+        """
+        The smallest enclosing bounding box of the recorded bounding boxes, same as
+        `bbox.transform.smallest_enclosing_many`, or `None` if there is no bounding box.
+        """
+        if not len(self):
+            return None
+        if self._bounds is None:
+            corners = self._columns[4:8, self._slots]
+            self._bounds = np.concatenate((corners[:2].min(axis=1), corners[2:].max(axis=1)))
+        if self._float:
+            return FloatBoundingBox.from_xyxy(*self._bounds.tolist())
+        return BoundingBox.from_xyxy(*np.rint(self._bounds).astype(np.int64).tolist())
+
+    def query_intersecting(self, bbox: BoundingBox) -> np.ndarray:
+        """
+        Find the recorded bounding boxes intersecting with the query, same as `BoxIndex.query_intersecting`.
+
+        Args:
+            bbox (BoundingBox): The query bounding box.
+
+        Returns:
+            np.ndarray: The ids of the intersecting bounding boxes in ascending order.
+        """
+        a1, b1, a2, b2 = bbox.to_xyxy()
+        cells = self._cell_range(a1, b1, a2, b2)
+        candidates: Set[int] = set()
+        if (cells[2] - cells[0] + 1) * (cells[3] - cells[1] + 1) > len(self._cells):
+            # The query covers more cells than the occupied ones
+            for (i, j), members in self._cells.items():
+                if cells[0] <= i <= cells[2] and cells[1] <= j <= cells[3]:
+                    candidates.update(members)
+        else:
+            for i in range(cells[0], cells[2] + 1):
+                for j in range(cells[1], cells[3] + 1):
+                    candidates.update(self._cells.get((i, j), ()))
+
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        x1, y1, x2, y2 = self._columns[4:8, slots]
+        overlap_w = np.minimum(x2, a2) - np.maximum(x1, a1)
+        overlap_h = np.minimum(y2, b2) - np.maximum(y1, b1)
+        return np.sort(self._owners[slots[(overlap_w > 0) & (overlap_h > 0)]])
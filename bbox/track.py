@@ -0,0 +1,228 @@
+from typing import Tuple
+
+import numpy as np
+
+from .array import as_array
+from .index import BoxIndex
+from .measure.batch import Boxes, _diou, _geometry, _giou, _iou, _matrix, _take
+
+_KERNELS = {
+    'iou': _iou,
+    'giou': _giou,
+    'diou': _diou
+}
+
+
+def _candidate_pairs(tracks: Boxes, detections: Boxes, metric: str, gated: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the costs of the candidate pairs of tracks and detections.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The indices of the tracks, the indices of the detections and the costs.
+    """
+    assert metric in _KERNELS, f'expected metric in {", ".join(_KERNELS)}, got {metric}'
+    tracks = as_array(tracks)
+    detections = as_array(detections)
+    if gated:
+        rows, cols = BoxIndex(detections).query_intersecting_many(tracks)
+    else:
+        rows, cols = np.divmod(np.arange(len(tracks) * len(detections)), max(len(detections), 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = _KERNELS[metric](_take(_geometry(tracks), rows), _take(_geometry(detections), cols))
+    return rows, cols, 1 - scores
+
+
+def cost_matrix(tracks: Boxes, detections: Boxes, metric: str = 'iou', gated: bool = False) -> np.ndarray:
+    """
+    Compute the association costs between the tracks and the detections, the cost is `1 - score`.
+
+    Args:
+        tracks (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes of the tracks, `N` in total.
+        detections (BoundingBoxArray | Iterable[BoundingBox]): The detected bounding boxes, `M` in total.
+        metric (str, optional): The score, either `iou`, `giou` or `diou`. Defaults to `iou`.
+        gated (bool, optional): Whether to skip the pairs which do not intersect, their costs are `inf`.
+            Defaults to False.
+
+    Returns:
+        np.ndarray: The costs in shape `(N, M)`.
+    """
+    assert metric in _KERNELS, f'expected metric in {", ".join(_KERNELS)}, got {metric}'
+    if not gated:
+        return 1 - _matrix(_KERNELS[metric], tracks, detections, None, None)
+    rows, cols, costs = _candidate_pairs(tracks, detections, metric, gated)
+    matrix = np.full((len(as_array(tracks)), len(as_array(detections))), np.inf)
+    matrix[rows, cols] = costs
+    return matrix
+
+
+def linear_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the linear assignment problem with the shortest augmenting path algorithm.
+
+    Every row is assigned to a distinct column if there are fewer rows than columns, and vice versa,
+    such that the total cost is minimized. The forbidden pairs can be marked by `inf`.
+
+    Args:
+        cost (ArrayLike): The cost matrix in shape `(N, M)`.
+
+    Raises:
+        ValueError: If there is no assignment without forbidden pairs.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The assigned rows in ascending order and their assigned columns.
+
+    Examples:
+        >>> linear_assignment([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+        (array([0, 1, 2]), array([1, 0, 2]))
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    assert cost.ndim == 2, f'expected 2-dimensional cost matrix, got {cost.ndim} dimensions'
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    u = np.zeros(n)
+    v = np.zeros(m)
+    col4row = np.full(n, -1)
+    row4col = np.full(m, -1)
+    for current in range(n):
+        # Find the shortest augmenting path from the current row by Dijkstra's algorithm
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1)
+        visited_cols = np.zeros(m, dtype=bool)
+        visited_rows = []
+        row, sink, min_value = current, -1, 0.0
+        while sink == -1:
+            visited_rows.append(row)
+            reduced = min_value + cost[row] - u[row] - v
+            mask = ~visited_cols & (reduced < shortest)
+            path[mask] = row
+            shortest[mask] = reduced[mask]
+
+            candidates = np.where(visited_cols, np.inf, shortest)
+            col = int(np.argmin(candidates))
+            min_value = candidates[col]
+            if min_value == np.inf:
+                raise ValueError('cost matrix is infeasible')
+            visited_cols[col] = True
+            if row4col[col] == -1:
+                sink = col
+            else:
+                row = row4col[col]
+
+        # Update the dual variables
+        u[current] += min_value
+        for row in visited_rows[1:]:
+            u[row] += min_value - shortest[col4row[row]]
+        v[visited_cols] -= min_value - shortest[visited_cols]
+
+        # Augment the assignment along the path
+        col = sink
+        while True:
+            row = path[col]
+            row4col[col] = row
+            col4row[row], col = col, col4row[row]
+            if row == current:
+                break
+
+    rows = np.arange(n)
+    if transposed:
+        order = np.argsort(col4row)
+        return col4row[order], rows[order]
+    return rows, col4row
+
+
+def _components(rows: np.ndarray, cols: np.ndarray, n_rows: int, n_cols: int) -> np.ndarray:
+    """
+    Label the connected components of the bipartite graph by propagating the minimum label along the edges.
+
+    Returns:
+        np.ndarray: The component labels of the edges.
+    """
+    labels = np.arange(n_rows + n_cols)
+    cols = cols + n_rows
+    while True:
+        edge_labels = np.minimum(labels[rows], labels[cols])
+        updated = labels.copy()
+        np.minimum.at(updated, rows, edge_labels)
+        np.minimum.at(updated, cols, edge_labels)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels[rows]
+        labels = updated
+
+
+def associate(
+    tracks: Boxes,
+    detections: Boxes,
+    threshold: float = 0.3,
+    metric: str = 'iou',
+    method: str = 'hungarian',
+    gated: bool = True
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Associate the detections to the tracks.
+
+    The pairs with score lower than `threshold` are never matched. The rest are matched by either
+    the optimal assignment minimizing the total cost `1 - score`, or greedily from the lowest cost.
+    The assignment is solved on each group of connected tracks and detections independently.
+
+    Args:
+        tracks (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes of the tracks, `N` in total.
+        detections (BoundingBoxArray | Iterable[BoundingBox]): The detected bounding boxes, `M` in total.
+        threshold (float, optional): The minimum score of the matched pairs. Defaults to 0.3.
+        metric (str, optional): The score, either `iou`, `giou` or `diou`. Defaults to `iou`.
+        method (str, optional): The assignment, either `hungarian` or `greedy`. Defaults to `hungarian`.
+        gated (bool, optional): Whether to skip the pairs which do not intersect. Always skipped for `iou`
+            with positive threshold. Defaults to True.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The matched pairs of track and detection indices in shape `(K, 2)`
+            sorted by the tracks, the unmatched tracks and the unmatched detections.
+    """
+    assert method in ('hungarian', 'greedy'), f'expected method hungarian or greedy, got {method}'
+    tracks = as_array(tracks)
+    detections = as_array(detections)
+    gated = gated or (metric == 'iou' and threshold > 0)
+    rows, cols, costs = _candidate_pairs(tracks, detections, metric, gated)
+    limit = 1 - threshold
+    mask = costs <= limit
+    rows, cols, costs = rows[mask], cols[mask], costs[mask]
+
+    matched_rows, matched_cols = [], []
+    if method == 'greedy':
+        order = np.argsort(costs, kind='stable')
+        used_rows = np.zeros(len(tracks), dtype=bool)
+        used_cols = np.zeros(len(detections), dtype=bool)
+        for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+            if not used_rows[row] and not used_cols[col]:
+                used_rows[row] = used_cols[col] = True
+                matched_rows.append(row)
+                matched_cols.append(col)
+    elif len(costs):
+        components = _components(rows, cols, len(tracks), len(detections))
+        order = np.argsort(components, kind='stable')
+        components, rows, cols, costs = components[order], rows[order], cols[order], costs[order]
+        bounds = np.flatnonzero(np.diff(components)) + 1
+        for sub_rows, sub_cols, sub_costs in zip(np.split(rows, bounds), np.split(cols, bounds), np.split(costs, bounds)):
+            if len(sub_costs) == 1:
+                matched_rows.append(int(sub_rows[0]))
+                matched_cols.append(int(sub_cols[0]))
+                continue
+
+            # The pairs out of candidates cost slightly more than the limit so they are dropped after assignment
+            unique_rows, local_rows = np.unique(sub_rows, return_inverse=True)
+            unique_cols, local_cols = np.unique(sub_cols, return_inverse=True)
+            matrix = np.full((len(unique_rows), len(unique_cols)), limit + 1e-5)
+            matrix[local_rows.reshape(-1), local_cols.reshape(-1)] = sub_costs
+            assigned_rows, assigned_cols = linear_assignment(matrix)
+            valid = matrix[assigned_rows, assigned_cols] <= limit
+            matched_rows.extend(unique_rows[assigned_rows[valid]].tolist())
+            matched_cols.extend(unique_cols[assigned_cols[valid]].tolist())
+
+    matches = np.array([matched_rows, matched_cols], dtype=np.int64).T.reshape(-1, 2)
+    matches = matches[np.argsort(matches[:, 0], kind='stable')]
+    unmatched_tracks = np.setdiff1d(np.arange(len(tracks)), matches[:, 0])
+    unmatched_detections = np.setdiff1d(np.arange(len(detections)), matches[:, 1])
+    return matches, unmatched_tracks, unmatched_detections
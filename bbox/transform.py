@@ -1,6 +1,37 @@
-from .bbox import BoundingBox
+from typing import Iterable, Tuple, Union
 
+import numpy as np
 
+from . import backend
+from .array import BoundingBoxArray, FloatBoundingBoxArray, as_array
+from .bbox import BoundingBox, FloatBoundingBox
+from .instrument import instrumented
+
+Boxes = Union[BoundingBoxArray, Iterable[BoundingBox]]
+
+
+def _edges(boxes: BoundingBoxArray) -> np.ndarray:
+    """
+    Format the bounding boxes in array of their exact edges `(x1, y1, x2, y2)`.
+
+    Unlike `to_xyxy`, the odd widths and heights are not snapped, so `x2 - x1` is exactly the width and the bounding
+    boxes are unchanged by `from_xyxy`.
+    """
+    dw, dh = boxes._half(boxes.w), boxes._half(boxes.h)
+    return np.stack((boxes.x - dw, boxes.y - dh, boxes.x + (boxes.w - dw), boxes.y + (boxes.h - dh)), axis=1)
+
+
+def _round(boxes: BoundingBoxArray, xyxy: np.ndarray) -> BoundingBoxArray:
+    """
+    Create the bounding boxes of the same type from the corners, which are rounded to the nearest pixels
+    unless the bounding boxes are in sub-pixel precision.
+    """
+    if isinstance(boxes, FloatBoundingBoxArray):
+        return FloatBoundingBoxArray.from_xyxy(xyxy)
+    return BoundingBoxArray.from_xyxy(np.rint(xyxy))
+
+
+@instrumented('transform.smallest_enclosing')
 def smallest_enclosing(bbox1: BoundingBox, bbox2: BoundingBox) -> BoundingBox:
     """
     Create a bounding box of their smallest enclosing area.
@@ -12,53 +43,211 @@ def smallest_enclosing(bbox1: BoundingBox, bbox2: BoundingBox) -> BoundingBox:
     Returns:
         BoundingBox: The smallest enclosing bounding box.
     """
+    if backend._native is not None:
+        return backend._native.smallest_enclosing(bbox1, bbox2)
     x1, y1, x2, y2 = bbox1.to_xyxy()
     a1, b1, a2, b2 = bbox2.to_xyxy()
 
-    return BoundingBox.from_xyxy(min(x1, a1), min(y1, b1), max(x2, a2), max(y2, b2))
+    # The corners of the validated bounding boxes are trusted, skip the validation
+    x1, y1, x2, y2 = min(x1, a1), min(y1, b1), max(x2, a2), max(y2, b2)
+    w = x2 - x1
+    h = y2 - y1
+    cls = FloatBoundingBox if isinstance(bbox1, FloatBoundingBox) or isinstance(bbox2, FloatBoundingBox) else BoundingBox
+    if cls is FloatBoundingBox:
+        # The corners of the bounding box in pixels may be picked, so the attributes are converted as the validation does
+        w, h = float(w), float(h)
+    return cls.construct_unchecked(x1 + cls._half(w), y1 + cls._half(h), w, h)
 
 
 bound = smallest_enclosing
 
 
-def scaling(bbox: BoundingBox, top: float = 1.0, bottom: float = 1.0, left: float = 1.0, right: float = 1.0) -> BoundingBox:
+@instrumented('transform.smallest_enclosing_many')
+def smallest_enclosing_many(boxes: Boxes, labels=None) -> Union[BoundingBox, Tuple[np.ndarray, BoundingBoxArray]]:
+    """
+    Create a bounding box of the smallest enclosing area of all the bounding boxes, or of each group of them.
+
+    For two bounding boxes, it is identical to `smallest_enclosing`.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes, `N` in total.
+        labels (ArrayLike, optional): The group labels of the bounding boxes in shape `(N,)`.
+            Defaults to enclosing all the bounding boxes as a single group.
+
+    Returns:
+        BoundingBox | Tuple[np.ndarray, BoundingBoxArray]: The smallest enclosing bounding box if `labels` is not given,
+            otherwise the sorted unique labels and the smallest enclosing bounding box of each label. They are in
+            sub-pixel precision if the bounding boxes are.
+    """
+    boxes = as_array(boxes)
+    xyxy = boxes.to_xyxy()
+    if labels is None:
+        assert len(boxes), 'expected at least one bounding box'
+        return boxes._box.from_xyxy(*xyxy[:, :2].min(axis=0).tolist(), *xyxy[:, 2:].max(axis=0).tolist())
+
+    labels = np.asarray(labels)
+    assert labels.shape == (len(boxes),), f'expected labels in shape ({len(boxes)},), got {labels.shape}'
+    order = np.argsort(labels, kind='stable')
+    unique_labels, starts = np.unique(labels[order], return_index=True)
+    if not len(order):
+        return unique_labels, type(boxes).from_xyxy(xyxy)
+    xyxy = xyxy[order]
+    return unique_labels, type(boxes).from_xyxy(np.concatenate((
+        np.minimum.reduceat(xyxy[:, :2], starts, axis=0),
+        np.maximum.reduceat(xyxy[:, 2:], starts, axis=0)
+    ), axis=1))
+
+
+@instrumented('transform.scaling')
+def scaling(
+    bbox: Union[BoundingBox, BoundingBoxArray],
+    top: float = 1.0,
+    bottom: float = 1.0,
+    left: float = 1.0,
+    right: float = 1.0
+) -> Union[BoundingBox, BoundingBoxArray]:
     """
     Scaling the bounding box along the single direction.
 
+    The bounding box in sub-pixel precision, `FloatBoundingBox` or `FloatBoundingBoxArray`, is scaled exactly
+    and stays in sub-pixel precision.
+
     Args:
-        bbox (BoundingBox): The bounding box to be resized.
+        bbox (BoundingBox | BoundingBoxArray): The bounding box to be resized, or the bounding boxes to be resized
+            at once.
         top (float, optional): The scaling ratio along the top edge. Defaults to 1.0.
         bottom (float, optional): The scaling ratio along the bottom edge. Defaults to 1.0.
         left (float, optional): The scaling ratio along the left edge. Defaults to 1.0.
         right (float, optional): The scaling ratio along the right edge. Defaults to 1.0.
 
     Returns:
-        BoundingBox: The resized bounding box.
+        BoundingBox | BoundingBoxArray: The resized bounding box(es).
     """
     assert top >= 0, 'scale top cannot be negative'
     assert bottom >= 0, 'scale bottom cannot be negative'
     assert left >= 0, 'scale left cannot be negative'
     assert right >= 0, 'scale right cannot be negative'
 
-    dw, dh = bbox.w // 2, bbox.h // 2
-    return BoundingBox.from_xyxy(
+    dw, dh = bbox._half(bbox.w), bbox._half(bbox.h)
+    xyxy = (
         bbox.x - dw * left,
         bbox.y - dh * top,
         bbox.x + dw * right,
         bbox.y + dh * bottom
     )
+    if isinstance(bbox, BoundingBoxArray):
+        return type(bbox).from_xyxy(np.stack(xyxy, axis=1))
+    return type(bbox).from_xyxy(*xyxy)
 
 
-def scaling_all(bbox: BoundingBox, scale: float = 1.0) -> BoundingBox:
+@instrumented('transform.scaling_all')
+def scaling_all(bbox: Union[BoundingBox, BoundingBoxArray], scale: float = 1.0) -> Union[BoundingBox, BoundingBoxArray]:
     """
     Scaling the bounding box according to the ratio.
 
     Args:
-        bbox (BoundingBox): The bounding box to be resized.
+        bbox (BoundingBox | BoundingBoxArray): The bounding box to be resized, or the bounding boxes to be resized
+            at once.
         scale (float, optional): The scaling ratio. Defaults to 1.0.
 
     Returns:
-        BoundingBox: The resized bounding box.
+        BoundingBox | BoundingBoxArray: The resized bounding box(es).
     """
     assert scale >= 0, 'scale cannot be negative'
     return scaling(bbox, top=scale, bottom=scale, left=scale, right=scale)
+
+
+@instrumented('transform.translate')
+def translate(boxes: Boxes, dx=0, dy=0) -> BoundingBoxArray:
+    """
+    Move the bounding boxes.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes to be moved.
+        dx (int | ArrayLike, optional): The offset along x-axis, either for all or for each of the bounding boxes.
+            Defaults to 0.
+        dy (int | ArrayLike, optional): The offset along y-axis, either for all or for each of the bounding boxes.
+            Defaults to 0.
+
+    Returns:
+        BoundingBoxArray: The moved bounding boxes, a `FloatBoundingBoxArray` if they are in sub-pixel precision.
+    """
+    boxes = as_array(boxes)
+    dx = np.broadcast_to(dx, boxes.x.shape)
+    dy = np.broadcast_to(dy, boxes.y.shape)
+    return type(boxes)(boxes.x + dx, boxes.y + dy, boxes.w, boxes.h)
+
+
+@instrumented('transform.clip')
+def clip(boxes: Boxes, width: int, height: int) -> BoundingBoxArray:
+    """
+    Clip the bounding boxes to the image, the parts outside of the image are cut off.
+
+    The clipping applies on the exact edges, so the bounding boxes inside the image are unchanged even if their widths
+    or heights are odd.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes to be clipped.
+        width (int): The width of the image.
+        height (int): The height of the image.
+
+    Returns:
+        BoundingBoxArray: The clipped bounding boxes, in zero width or height if they are outside of the image.
+            A `FloatBoundingBoxArray` if they are in sub-pixel precision.
+    """
+    assert width >= 0, 'width cannot be negative'
+    assert height >= 0, 'height cannot be negative'
+    boxes = as_array(boxes)
+    xyxy = _edges(boxes)
+    np.clip(xyxy[:, 0::2], 0, width, out=xyxy[:, 0::2])
+    np.clip(xyxy[:, 1::2], 0, height, out=xyxy[:, 1::2])
+    return type(boxes).from_xyxy(xyxy)
+
+
+@instrumented('transform.rescale')
+def rescale(boxes: Boxes, src_size: Tuple[int, int], dst_size: Tuple[int, int]) -> BoundingBoxArray:
+    """
+    Rescale the bounding boxes from an image to the resized one, such as from model input to camera resolution.
+
+    The corners are rounded to the nearest integers, unless the bounding boxes are in sub-pixel precision.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes on the source image.
+        src_size (Tuple[int, int]): The width and height of the source image.
+        dst_size (Tuple[int, int]): The width and height of the destination image.
+
+    Returns:
+        BoundingBoxArray: The bounding boxes on the destination image.
+    """
+    assert src_size[0] > 0 and src_size[1] > 0, 'source size must be positive'
+    ratio = np.array([dst_size[0] / src_size[0], dst_size[1] / src_size[1]] * 2)
+    boxes = as_array(boxes)
+    return _round(boxes, _edges(boxes) * ratio)
+
+
+@instrumented('transform.unletterbox')
+def unletterbox(boxes: Boxes, image_size: Tuple[int, int], input_size: Tuple[int, int], clipped: bool = True) -> BoundingBoxArray:
+    """
+    Map the bounding boxes on a letterboxed input back to the original image.
+
+    The letterbox resizes the image with unchanged aspect ratio to fit the input, and pads the borders evenly.
+    The corners are rounded to the nearest integers, unless the bounding boxes are in sub-pixel precision.
+
+    Args:
+        boxes (BoundingBoxArray | Iterable[BoundingBox]): The bounding boxes on the letterboxed input.
+        image_size (Tuple[int, int]): The width and height of the original image.
+        input_size (Tuple[int, int]): The width and height of the letterboxed input.
+        clipped (bool, optional): Whether to clip the bounding boxes to the original image. Defaults to True.
+
+    Returns:
+        BoundingBoxArray: The bounding boxes on the original image.
+    """
+    assert image_size[0] > 0 and image_size[1] > 0, 'image size must be positive'
+    ratio = min(input_size[0] / image_size[0], input_size[1] / image_size[1])
+    pad_x = (input_size[0] - image_size[0] * ratio) / 2
+    pad_y = (input_size[1] - image_size[1] * ratio) / 2
+    boxes = as_array(boxes)
+    boxes = _round(boxes, (_edges(boxes) - np.array([pad_x, pad_y, pad_x, pad_y])) / ratio)
+    if clipped:
+        boxes = clip(boxes, *image_size)
+    return boxes
@@ -0,0 +1,350 @@
+"""
+Benchmark the construction, conversion, measurement and transform of bounding boxes.
+
+Every benchmark times an operation over `size` bounding boxes with different implementations,
+`scalar` loops over `BoundingBox` objects as the baseline, the others are the fast paths.
+The results are written in JSON, which can be compared with the results of another commit.
+
+Usage:
+    PYTHONPATH=. python benchmarks/run.py [--sizes 1 1000 1000000] [--filter iou] [--output results.json]
+    PYTHONPATH=. python benchmarks/run.py --compare baseline.json
+"""
+import argparse
+import importlib.metadata
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pydantic
+
+from bbox import BoundingBox, BoundingBoxArray
+from bbox.backend import available_backends, use_backend
+from bbox.ingest import from_buffer
+from bbox.io import BoxFile, BoxFileWriter, ImageAnnotations, read_coco, write_coco
+from bbox.measure import all_ious, ciou, ciou_paired, diou, diou_paired, giou, giou_paired, intersect, iou, iou_paired, union
+from bbox.transform import scaling, scaling_all, smallest_enclosing
+
+
+class Data(NamedTuple):
+    """
+    The random bounding boxes shared by the benchmarks in the same size.
+    """
+    xyxy1: np.ndarray
+    xyxy2: np.ndarray
+    array1: BoundingBoxArray
+    array2: BoundingBoxArray
+    boxes1: List[BoundingBox]
+    boxes2: List[BoundingBox]
+
+
+class Benchmark(NamedTuple):
+    group: str
+    implementation: str
+    factory: Callable[[Data], Callable[[], object]]
+    scalar: bool    # Whether it loops over `BoundingBox` objects
+    backend: str    # The backend of the scalar measurements and transforms, see `bbox.backend`
+
+
+BENCHMARKS: List[Benchmark] = []
+
+# The files written by the benchmarks, removed on exit
+TEMPORARY = tempfile.TemporaryDirectory()
+
+
+def benchmark(group: str, implementation: str, scalar: Optional[bool] = None, backend: str = 'python'):
+    """
+    Register a factory which prepares the operation to be timed from the data.
+
+    The implementations other than `array` are scalar unless specified, which are skipped for the large sizes.
+    The operation is timed with the given backend selected.
+    """
+    def decorator(factory: Callable[[Data], Callable[[], object]]):
+        BENCHMARKS.append(Benchmark(group, implementation, factory, implementation != 'array' if scalar is None else scalar, backend))
+        return factory
+    return decorator
+
+
+@benchmark('construction/init', 'scalar')
+def _(data: Data):
+    columns = np.stack((data.array1.x, data.array1.y, data.array1.w, data.array1.h), axis=1).tolist()
+    return lambda: [BoundingBox(x=x, y=y, w=w, h=h) for x, y, w, h in columns]
+
+
+@benchmark('construction/init', 'unchecked')
+def _(data: Data):
+    columns = np.stack((data.array1.x, data.array1.y, data.array1.w, data.array1.h), axis=1).tolist()
+    return lambda: [BoundingBox.construct_unchecked(x, y, w, h) for x, y, w, h in columns]
+
+
+@benchmark('construction/init', 'array')
+def _(data: Data):
+    array = data.array1
+    return lambda: BoundingBoxArray(array.x, array.y, array.w, array.h)
+
+
+@benchmark('construction/from_xyxy', 'scalar')
+def _(data: Data):
+    rows = data.xyxy1.tolist()
+    return lambda: [BoundingBox.from_xyxy(*row) for row in rows]
+
+
+@benchmark('construction/from_xyxy', 'array')
+def _(data: Data):
+    return lambda: BoundingBoxArray.from_xyxy(data.xyxy1)
+
+
+@benchmark('construction/from_tlwh', 'scalar')
+def _(data: Data):
+    rows = data.array1.to_tlwh().tolist()
+    return lambda: [BoundingBox.from_tlwh(*row) for row in rows]
+
+
+@benchmark('construction/from_tlwh', 'array')
+def _(data: Data):
+    tlwh = data.array1.to_tlwh()
+    return lambda: BoundingBoxArray.from_tlwh(tlwh)
+
+
+@benchmark('construction/from_buffer', 'scalar')
+def _(data: Data):
+    buffer = data.xyxy1.astype(np.float32).tobytes()
+    return lambda: [BoundingBox.from_xyxy(*(round(value) for value in row)) for row in np.frombuffer(buffer, np.float32).reshape(-1, 4).tolist()]
+
+
+@benchmark('construction/from_buffer', 'array')
+def _(data: Data):
+    buffer = data.xyxy1.astype(np.float32).tobytes()
+    return lambda: from_buffer(buffer)
+
+
+@benchmark('conversion/to_xyxy', 'scalar')
+def _(data: Data):
+    return lambda: [bbox.to_xyxy() for bbox in data.boxes1]
+
+
+@benchmark('conversion/to_xyxy', 'array')
+def _(data: Data):
+    return lambda: data.array1.to_xyxy()
+
+
+@benchmark('conversion/anchor', 'scalar')
+def _(data: Data):
+    return lambda: [bbox.anchor(7) for bbox in data.boxes1]
+
+
+@benchmark('conversion/anchor', 'array')
+def _(data: Data):
+    return lambda: data.array1.anchor(7)
+
+
+def _scalar_measure(measure: Callable[[BoundingBox, BoundingBox], float]):
+    return lambda data: lambda: [measure(a, b) for a, b in zip(data.boxes1, data.boxes2)]
+
+
+def _array_measure(measure: Callable[[BoundingBoxArray, BoundingBoxArray], np.ndarray]):
+    return lambda data: lambda: measure(data.array1, data.array2)
+
+
+benchmark('measure/intersect', 'scalar')(_scalar_measure(intersect))
+benchmark('measure/union', 'scalar')(_scalar_measure(union))
+for _name, _scalar, _paired in (('iou', iou, iou_paired), ('giou', giou, giou_paired), ('diou', diou, diou_paired), ('ciou', ciou, ciou_paired)):
+    benchmark(f'measure/{_name}', 'scalar')(_scalar_measure(_scalar))
+    benchmark(f'measure/{_name}', 'array')(_array_measure(_paired))
+benchmark('measure/all_ious', 'scalar')(_scalar_measure(lambda a, b: (iou(a, b), giou(a, b), diou(a, b), ciou(a, b))))
+benchmark('measure/all_ious', 'shared')(_scalar_measure(all_ious))
+benchmark('transform/smallest_enclosing', 'scalar')(_scalar_measure(smallest_enclosing))
+
+
+def _compiled(factory: Callable[[Data], Callable[[], object]]):
+    def prepare(data: Data):
+        call = factory(data)
+        # The kernels are compiled on the first call, which is not timed
+        with use_backend('numba'):
+            call()
+        return call
+    return prepare
+
+
+if 'numba' in available_backends():
+    for _group, _scalar in (
+        ('measure/iou', iou), ('measure/giou', giou), ('measure/diou', diou), ('measure/ciou', ciou),
+        ('measure/all_ious', all_ious), ('transform/smallest_enclosing', smallest_enclosing)
+    ):
+        benchmark(_group, 'numba', scalar=True, backend='numba')(_compiled(_scalar_measure(_scalar)))
+
+
+@benchmark('transform/scaling', 'scalar')
+def _(data: Data):
+    return lambda: [scaling(bbox, 2) for bbox in data.boxes1]
+
+
+@benchmark('transform/scaling', 'array')
+def _(data: Data):
+    return lambda: scaling(data.array1, 2)
+
+
+@benchmark('transform/scaling_all', 'scalar')
+def _(data: Data):
+    return lambda: [scaling_all(bbox, 2) for bbox in data.boxes1]
+
+
+@benchmark('transform/scaling_all', 'array')
+def _(data: Data):
+    return lambda: scaling_all(data.array1, 2)
+
+
+def _records(data: Data, images: int) -> List[ImageAnnotations]:
+    bounds = np.linspace(0, len(data.array1), images + 1).astype(int)
+    labels = np.arange(len(data.array1)) % 80
+    return [ImageAnnotations(str(i), data.array1[start:stop], labels[start:stop]) for i, (start, stop) in enumerate(zip(bounds, bounds[1:]))]
+
+
+def _temporary(suffix: str) -> str:
+    # The file is reopened by the writers, so the descriptor is closed right away
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=TEMPORARY.name)
+    os.close(fd)
+    return path
+
+
+@benchmark('io/read', 'coco', scalar=True)
+def _(data: Data):
+    path = _temporary('.json')
+    write_coco(path, _records(data, max(len(data.array1) // 10, 1)))
+    return lambda: [record.boxes for record in read_coco(path)]
+
+
+def _boxfile(data: Data, compress: bool) -> str:
+    path = _temporary('.bbox')
+    with BoxFileWriter(path, compress=compress) as writer:
+        for record in _records(data, max(len(data.array1) // 10, 1)):
+            writer.write(record.boxes, record.labels)
+    return path
+
+
+@benchmark('io/read', 'boxfile', scalar=False)
+def _(data: Data):
+    path = _boxfile(data, compress=False)
+    return lambda: BoxFile(path).read_all()
+
+
+@benchmark('io/read', 'boxfile-compressed', scalar=False)
+def _(data: Data):
+    path = _boxfile(data, compress=True)
+    return lambda: BoxFile(path).read_all()
+
+
+@benchmark('io/read-image', 'boxfile', scalar=False)
+def _(data: Data):
+    path = _boxfile(data, compress=False)
+    f = BoxFile(path)
+    return lambda: f[len(f) // 2]
+
+
+def make_data(size: int, with_boxes: bool, seed: int = 0) -> Data:
+    rng = np.random.default_rng(seed)
+
+    def random_xyxy():
+        xy = rng.integers(0, 1000, size=(size, 2))
+        return np.concatenate((xy, xy + rng.integers(1, 100, size=(size, 2))), axis=1)
+
+    xyxy1, xyxy2 = random_xyxy(), random_xyxy()
+    array1, array2 = BoundingBoxArray.from_xyxy(xyxy1), BoundingBoxArray.from_xyxy(xyxy2)
+    boxes1 = array1.to_boxes() if with_boxes else []
+    boxes2 = array2.to_boxes() if with_boxes else []
+    return Data(xyxy1, xyxy2, array1, array2, boxes1, boxes2)
+
+
+def measure(call: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(int(number * min_time / max(elapsed, 1e-9)), 1)
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'number': number, 'best': min(times), 'median': float(np.median(times))}
+
+
+def _version(module: str) -> Optional[str]:
+    try:
+        return importlib.metadata.version(module)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def metadata() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pydantic': pydantic.VERSION,
+        'numba': _version('numba'),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine()
+    }
+
+
+def compare(results: List[Dict[str, object]], baseline: List[Dict[str, object]]):
+    """
+    Print the ratio of the baseline time to the current time of the same benchmark.
+    """
+    previous = {(r['group'], r['implementation'], r['size']): r['best'] for r in baseline}
+    print(f'{"benchmark":<40}{"size":>10}{"baseline (s)":>14}{"current (s)":>14}{"speedup":>10}', file=sys.stderr)
+    for result in results:
+        key = (result['group'], result['implementation'], result['size'])
+        if key in previous:
+            name = f'{result["group"]} [{result["implementation"]}]'
+            print(f'{name:<40}{result["size"]:>10}{previous[key]:>14.3e}{result["best"]:>14.3e}{previous[key] / result["best"]:>9.2f}x', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 1000, 1000000], help='The numbers of bounding boxes.')
+    parser.add_argument('--max-scalar-size', type=int, default=1000, help='The largest size for the scalar implementations.')
+    parser.add_argument('--filter', default='', help='Run the benchmarks whose group contains the text only.')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of repetitions, the best one is reported.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='The minimum seconds of each repetition.')
+    parser.add_argument('--output', help='The JSON file to write the results. Defaults to the standard output.')
+    parser.add_argument('--compare', help='The JSON file of the baseline results to compare with.')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        with_scalar = size <= args.max_scalar_size
+        data = make_data(size, with_scalar)
+        for bench in BENCHMARKS:
+            if args.filter not in bench.group or (bench.scalar and not with_scalar):
+                continue
+            result = {'group': bench.group, 'implementation': bench.implementation, 'size': size}
+            call = bench.factory(data)
+            with use_backend(bench.backend):
+                result.update(measure(call, args.repeat, args.min_time))
+            result['per_box'] = result['best'] / size
+            results.append(result)
+            name = f'{bench.group} [{bench.implementation}]'
+            print(f'{name:<40}{size:>10}{result["best"]:>14.3e}s{result["per_box"] * 1e9:>12.1f}ns/box', file=sys.stderr)
+
+    report = json.dumps({'metadata': metadata(), 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,12 @@ setup(
     keywords=['bbox', 'geometry', 'spatial', 'detection', 'yolo'],
     packages=find_packages(),
     install_requires=[
+        "numpy",
         "pydantic"
     ],
+    extras_require={
+        "numba": ["numba"]
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
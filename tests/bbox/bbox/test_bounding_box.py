@@ -31,6 +31,16 @@ class TestBoundingBox:
         with pytest.raises(ValueError):
             BoundingBox(x=0, y=0, w=0, h=-1)
 
+    def test_construct_unchecked(self):
+        bbox = BoundingBox.construct_unchecked(1, 2, 3, 4)
+        assert bbox == BoundingBox(x=1, y=2, w=3, h=4)
+        assert repr(bbox) == repr(BoundingBox(x=1, y=2, w=3, h=4))
+        assert bbox.model_dump() == {'x': 1, 'y': 2, 'w': 3, 'h': 4}
+
+    def test_construct_unchecked_skips_validation(self):
+        bbox = BoundingBox.construct_unchecked(0, 0, -1, 0)
+        assert bbox.w == -1
+
     @pytest.mark.parametrize(
         'x1,y1,x2,y2,x,y,w,h', (
             # Normal
@@ -146,3 +156,29 @@ class TestBoundingBox:
     )
     def test_to_tlwh(self, t: int, l: int, w: int, h: int, x: int, y: int, w_: int, h_: int):
         assert BoundingBox(x=x, y=y, w=w, h=h).to_tlwh() == (t, l, w, h)
+
+    def test_cached_geometry_on_assignment(self):
+        bbox = BoundingBox(x=5, y=5, w=10, h=10)
+        assert bbox.to_xyxy() == (0, 0, 10, 10)
+        assert bbox.area == 100
+
+        bbox.x = 15
+        bbox.w = 20
+        assert bbox.to_xyxy() == (5, 0, 25, 10)
+        assert bbox.to_tlwh() == (5, 0, 20, 10)
+        assert bbox.area == 200
+
+    def test_cached_geometry_on_copy(self):
+        bbox = BoundingBox(x=5, y=5, w=10, h=10)
+        assert bbox.to_xyxy() == (0, 0, 10, 10)
+        copied = bbox.model_copy(update={'h': 20})
+        assert copied.to_xyxy() == (0, -5, 10, 15)
+        assert copied.area == 200
+        assert bbox.to_xyxy() == (0, 0, 10, 10)
+
+    def test_cached_geometry_not_dumped(self):
+        bbox = BoundingBox(x=5, y=5, w=10, h=10)
+        bbox.to_xyxy()
+        assert bbox.area == 100
+        assert bbox.model_dump() == {'x': 5, 'y': 5, 'w': 10, 'h': 10}
+        assert repr(bbox) == 'BoundingBox(x=5, y=5, w=10, h=10)'
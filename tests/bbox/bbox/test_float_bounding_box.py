@@ -0,0 +1,44 @@
+import pytest
+
+from bbox import BoundingBox, FloatBoundingBox
+
+
+class TestFloatBoundingBox:
+    def test_init(self):
+        bbox = FloatBoundingBox(x=1.5, y=-2.25, w=3.5, h=0.0)
+        assert (bbox.x, bbox.y, bbox.w, bbox.h) == (1.5, -2.25, 3.5, 0.0)
+        assert isinstance(bbox, BoundingBox)
+
+    def test_init_with_negative_width(self):
+        with pytest.raises(ValueError):
+            FloatBoundingBox(x=0, y=0, w=-0.5, h=0)
+
+    def test_from_xyxy(self):
+        bbox = FloatBoundingBox.from_xyxy(5, 3, 0, 0)
+        assert bbox == FloatBoundingBox(x=2.5, y=1.5, w=5, h=3)
+        assert bbox.to_xyxy() == (0, 0, 5, 3)
+
+    def test_from_tlwh(self):
+        bbox = FloatBoundingBox.from_tlwh(1, 2, 3, 5)
+        assert bbox.to_tlwh() == (2, 1, 3, 5)
+        assert bbox.to_xyxy() == (2, 1, 5, 6)
+
+    def test_area(self):
+        bbox = FloatBoundingBox.from_xyxy(0, 0, 2.5, 1.5)
+        assert bbox.area == 3.75
+        bbox.w = 1.0
+        assert bbox.area == 1.5
+
+    @pytest.mark.parametrize(
+        'index,point', (
+            (1, (0, 3)),
+            (5, (2.5, 1.5)),
+            (9, (5, 0))
+        )
+    )
+    def test_anchor(self, index: int, point):
+        assert FloatBoundingBox.from_xyxy(0, 0, 5, 3).anchor(index) == point
+
+    def test_to_pixels(self):
+        bbox = FloatBoundingBox.from_xyxy(0.4, 0.6, 10.4, 9.5)
+        assert bbox.to_pixels() == BoundingBox.from_xyxy(0, 1, 10, 10)
@@ -0,0 +1,48 @@
+import pydantic
+import pytest
+
+from bbox import BoundingBox, FloatBoundingBox, FrozenBoundingBox, FrozenFloatBoundingBox
+from bbox.measure import iou
+
+
+class TestFrozenBoundingBox:
+    def test_init(self):
+        bbox = FrozenBoundingBox.from_xyxy(0, 0, 10, 10)
+        assert bbox == FrozenBoundingBox(x=5, y=5, w=10, h=10) == BoundingBox(x=5, y=5, w=10, h=10)
+        assert isinstance(bbox, BoundingBox)
+        assert bbox.area == 100
+
+    def test_assign(self):
+        bbox = FrozenBoundingBox(x=5, y=5, w=10, h=10)
+        with pytest.raises(pydantic.ValidationError):
+            bbox.w = 20
+        assert bbox.area == 100
+        assert bbox.model_copy(update={'w': 20}).area == 200
+
+    def test_hash(self):
+        bbox = FrozenBoundingBox(x=5, y=5, w=10, h=10)
+        assert hash(bbox) == hash(FrozenBoundingBox.from_xyxy(0, 0, 10, 10))
+        assert len({bbox, FrozenBoundingBox(x=5, y=5, w=10, h=10), FrozenBoundingBox(x=5, y=5, w=10, h=12)}) == 2
+        with pytest.raises(TypeError):
+            hash(BoundingBox(x=5, y=5, w=10, h=10))
+
+    def test_hash_with_cached_geometry(self):
+        bbox = FrozenBoundingBox(x=5, y=5, w=11, h=10)
+        expected = hash(bbox)
+        assert bbox.area == 110 and bbox.to_xyxy() == (0, 0, 10, 10)
+        assert hash(bbox) == expected == hash(FrozenBoundingBox(x=5, y=5, w=11, h=10)) == hash((5, 5, 11, 10))
+        assert hash(FrozenFloatBoundingBox(x=5, y=5, w=11, h=10)) == expected
+        assert {bbox: 'zone'}[FrozenFloatBoundingBox(x=5.0, y=5.0, w=11.0, h=10.0)] == 'zone'
+
+    def test_float(self):
+        bbox = FrozenFloatBoundingBox.from_xyxy(0, 0, 5, 3)
+        assert bbox == FloatBoundingBox(x=2.5, y=1.5, w=5, h=3)
+        assert isinstance(bbox, FloatBoundingBox) and isinstance(bbox, FrozenBoundingBox)
+        assert bbox.to_pixels() == BoundingBox.from_xyxy(0, 0, 5, 3)
+        assert hash(FrozenFloatBoundingBox(x=5, y=5, w=10, h=10)) == hash(FrozenBoundingBox(x=5, y=5, w=10, h=10))
+        with pytest.raises(pydantic.ValidationError):
+            bbox.x = 0
+
+    def test_measure(self):
+        bbox1, bbox2 = FrozenBoundingBox.from_xyxy(0, 0, 10, 10), FrozenBoundingBox.from_xyxy(5, 5, 15, 15)
+        assert iou(bbox1, bbox2) == iou(BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15))
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBox, FloatBoundingBoxArray
+from bbox.io import BoxFile, BoxFileWriter
+from bbox.io.boxfile import _decode_varint, _encode_varint, _unzigzag, _zigzag
+
+
+def random_images(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(n):
+        size = int(rng.integers(0, 20))
+        xy = rng.integers(-10000, 10000, size=(size, 2))
+        boxes = BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + rng.integers(0, 500, size=(size, 2))), axis=1))
+        images.append((boxes, rng.integers(0, 80, size=size), rng.random(size)))
+    return images
+
+
+def test_varint():
+    values = np.array([0, 1, -1, 63, -64, 127, 128, 300, 1 << 40, -(1 << 62), 2 ** 63 - 1, -2 ** 63], dtype=np.int64)
+    encoded = _encode_varint(_zigzag(values))
+    assert len(_encode_varint(_zigzag(np.array([0, 1, -1, 63, -64], dtype=np.int64)))) == 5
+    assert _unzigzag(_decode_varint(encoded, len(values))).tolist() == values.tolist()
+
+
+@pytest.mark.parametrize('compress', (False, True))
+@pytest.mark.parametrize('chunk_size', (1, 37, 1 << 16))
+def test_round_trip(tmp_path, compress: bool, chunk_size: int):
+    images = random_images(30, seed=0)
+    path = tmp_path / 'boxes.bbox'
+    with BoxFileWriter(path, compress=compress, chunk_size=chunk_size) as writer:
+        for i, (boxes, labels, scores) in enumerate(images):
+            assert writer.write(boxes, labels, scores, image_id=100 + i) == i
+
+    with BoxFile(path) as f:
+        assert len(f) == 30
+        assert f.compressed == compress
+        assert f.image_ids.tolist() == list(range(100, 130))
+        assert f.n_boxes == sum(len(boxes) for boxes, _, _ in images)
+        for i in (29, 0, 15, -1):
+            record = f[i]
+            boxes, labels, scores = images[i]
+            assert record.image_id == 100 + i % 30
+            assert record.boxes == boxes
+            assert record.labels.tolist() == labels.tolist()
+            assert record.scores.tolist() == scores.tolist()
+        with pytest.raises(IndexError):
+            f[30]
+
+        image_ids, boxes, labels, scores = f.read_all()
+        assert boxes == BoundingBoxArray(*(np.concatenate([getattr(b, c) for b, _, _ in images]) for c in 'xywh'))
+        assert image_ids.tolist() == [100 + i for i, (b, _, _) in enumerate(images) for _ in range(len(b))]
+        assert labels.tolist() == np.concatenate([labels for _, labels, _ in images]).tolist()
+        assert scores.tolist() == np.concatenate([scores for _, _, scores in images]).tolist()
+        assert sum(len(chunk[1]) for chunk in f.iter_chunks()) == len(boxes)
+
+
+def test_uncompressed_memory_mapped(tmp_path):
+    path = tmp_path / 'boxes.bbox'
+    with BoxFileWriter(path) as writer:
+        writer.write([BoundingBox(x=5, y=5, w=10, h=10)])
+    f = BoxFile(path)
+    record = f[0]
+    assert not record.boxes.x.flags.owndata
+    assert not record.boxes.x.flags.writeable
+    assert record.labels.tolist() == [0]
+    assert record.scores.tolist() == [1.0]
+    f.close()
+    assert record.boxes.to_boxes() == [BoundingBox(x=5, y=5, w=10, h=10)]
+
+
+@pytest.mark.parametrize('compress', (False, True))
+def test_append(tmp_path, compress: bool):
+    images = random_images(10, seed=1)
+    path = tmp_path / 'boxes.bbox'
+    with BoxFileWriter(path, compress=compress) as writer:
+        for boxes, labels, scores in images[:4]:
+            writer.write(boxes, labels, scores)
+    with BoxFileWriter(path, compress=not compress, chunk_size=5, append=True) as writer:
+        assert len(writer) == 4
+        for boxes, labels, scores in images[4:]:
+            writer.write(boxes, labels, scores)
+
+    with BoxFile(path) as f:
+        assert f.compressed == compress
+        assert f.image_ids.tolist() == list(range(10))
+        assert all(f[i].boxes == boxes for i, (boxes, _, _) in enumerate(images))
+
+
+def test_empty(tmp_path):
+    path = tmp_path / 'boxes.bbox'
+    BoxFileWriter(path).close()
+    with BoxFile(path) as f:
+        assert len(f) == 0
+        image_ids, boxes, labels, scores = f.read_all()
+        assert len(image_ids) == len(boxes) == len(labels) == len(scores) == 0
+
+
+def test_invalid(tmp_path):
+    path = tmp_path / 'boxes.bbox'
+    path.write_bytes(b'not a box file' * 4)
+    with pytest.raises(ValueError):
+        BoxFile(path)
+
+    writer = BoxFileWriter(path)
+    writer.write([BoundingBox(x=5, y=5, w=10, h=10)])
+    writer.flush()
+    with pytest.raises(ValueError):
+        BoxFile(path)
+    writer.close()
+
+
+def test_subpixel_precision(tmp_path):
+    path = tmp_path / 'boxes.bbox'
+    with BoxFileWriter(path) as writer:
+        with pytest.raises(ValueError, match='FloatBoundingBoxArray'):
+            writer.write(FloatBoundingBoxArray.from_xyxy([(0.2, 0.2, 1.7, 1.7)]))
+        with pytest.raises(ValueError, match='FloatBoundingBoxArray'):
+            writer.write([BoundingBox(x=5, y=5, w=10, h=10), FloatBoundingBox(x=0.5, y=0.5, w=1, h=1)])
+        writer.write([BoundingBox(x=5, y=5, w=10, h=10)])
+    with BoxFile(path) as f:
+        assert len(f) == 1
+        assert f[0].boxes == BoundingBoxArray.from_boxes([BoundingBox(x=5, y=5, w=10, h=10)])
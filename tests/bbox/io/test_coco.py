@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+from bbox.io import ImageAnnotations, read_coco, write_coco
+
+DOCUMENT = {
+    'info': {'description': 'nested {"value": [1, 2]}', 'year': 2024},
+    'images': [
+        {'id': 7, 'file_name': 'a.jpg', 'width': 640, 'height': 480},
+        {'id': 3, 'file_name': 'b.jpg', 'width': 320, 'height': 240},
+        {'id': 9, 'file_name': 'c.jpg'}
+    ],
+    'annotations': [
+        {'id': 1, 'image_id': 3, 'category_id': 2, 'bbox': [10.0, 20.0, 30.0, 40.0], 'area': 1200.0, 'iscrowd': 0},
+        {'id': 2, 'image_id': 7, 'category_id': 1, 'bbox': [0.4, 0.6, 100.2, 49.7], 'area': 4980.0, 'iscrowd': 0},
+        {'id': 3, 'image_id': 3, 'category_id': 5, 'bbox': [1, 2, 3, 4], 'area': 12, 'iscrowd': 1},
+        {'id': 4, 'image_id': 7, 'category_id': 1, 'segmentation': [[0, 0, 1, 1, 2, 2]], 'area': 1, 'iscrowd': 0}
+    ],
+    'categories': [{'id': 1, 'name': 'cat'}, {'id': 2, 'name': 'dog'}, {'id': 5, 'name': 'bird'}]
+}
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 1 << 16))
+@pytest.mark.parametrize('block_size', (1, 2, 1 << 16))
+@pytest.mark.parametrize('indent', (None, 2))
+def test_read_coco(tmp_path, chunk_size: int, block_size: int, indent):
+    path = tmp_path / 'annotations.json'
+    path.write_text(json.dumps(DOCUMENT, indent=indent))
+
+    records = list(read_coco(path, chunk_size=chunk_size, block_size=block_size))
+    assert [(record.image, record.size) for record in records] == [('a.jpg', (640, 480)), ('b.jpg', (320, 240)), ('c.jpg', None)]
+    assert records[0].boxes == BoundingBoxArray.from_tlwh([(1, 0, 100, 50)])
+    assert records[0].labels.tolist() == [1]
+    assert records[1].boxes == BoundingBoxArray.from_tlwh([(20, 10, 30, 40), (2, 1, 3, 4)])
+    assert records[1].labels.tolist() == [2, 5]
+    assert len(records[2].boxes) == 0
+
+
+@pytest.mark.parametrize('block_size', (1, 3, 1 << 16))
+def test_read_coco_grouping(tmp_path, block_size: int):
+    # The annotations come before the images, interleaved and partly of unknown images
+    rng = np.random.default_rng(0)
+    image_ids = rng.permutation(20)[:12].tolist()
+    annotations = [
+        {'image_id': int(image_id), 'category_id': k, 'bbox': [k, 0, 2, 2]}
+        for k, image_id in enumerate(rng.integers(0, 20, size=50))
+    ]
+    document = {'annotations': annotations, 'images': [{'id': image_id} for image_id in image_ids]}
+    path = tmp_path / 'annotations.json'
+    path.write_text(json.dumps(document))
+
+    records = list(read_coco(path, block_size=block_size))
+    assert [record.image for record in records] == [str(image_id) for image_id in image_ids]
+    for image_id, record in zip(image_ids, records):
+        labels = [annotation['category_id'] for annotation in annotations if annotation['image_id'] == image_id]
+        assert record.labels.tolist() == labels
+        assert record.boxes == BoundingBoxArray.from_tlwh([(0, label, 2, 2) for label in labels])
+
+
+def test_read_coco_invalid(tmp_path):
+    path = tmp_path / 'annotations.json'
+    path.write_text('{"images": [{"id": 1}')
+    with pytest.raises(ValueError):
+        list(read_coco(path))
+
+
+def test_write_coco(tmp_path):
+    records = [
+        ImageAnnotations('a.jpg', BoundingBoxArray.from_xyxy([(0, 0, 10, 20), (4, 4, 8, 8)]), np.array([3, 1]), (64, 48)),
+        ImageAnnotations('b.jpg', BoundingBoxArray.from_xyxy([]), np.array([], dtype=np.int64)),
+        ImageAnnotations('c.jpg', BoundingBoxArray.from_xyxy([(2, 2, 6, 6)]), np.array([1]), (32, 32))
+    ]
+    path = tmp_path / 'annotations.json'
+    write_coco(path, iter(records))
+
+    document = json.loads(path.read_text())
+    assert document['images'][0] == {'id': 1, 'file_name': 'a.jpg', 'width': 64, 'height': 48}
+    assert document['images'][1] == {'id': 2, 'file_name': 'b.jpg'}
+    assert document['annotations'][0] == {'id': 1, 'image_id': 1, 'category_id': 3, 'bbox': [0, 0, 10, 20], 'area': 200, 'iscrowd': 0}
+    assert [annotation['image_id'] for annotation in document['annotations']] == [1, 1, 3]
+    assert document['categories'] == [{'id': 1, 'name': '1'}, {'id': 3, 'name': '3'}]
+
+    for record, expected in zip(read_coco(path), records):
+        assert record.image == expected.image
+        assert record.boxes == expected.boxes
+        assert record.labels.tolist() == expected.labels.tolist()
+
+
+def test_write_coco_categories(tmp_path):
+    path = tmp_path / 'annotations.json'
+    write_coco(path, [], categories={0: 'person'})
+    assert json.loads(path.read_text()) == {'images': [], 'annotations': [], 'categories': [{'id': 0, 'name': 'person'}]}
+    assert list(read_coco(path)) == []
+
+    path.write_text('{"images": [{"id": 1}, nul')
+    with pytest.raises(ValueError):
+        list(read_coco(path))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+from bbox.io import ImageAnnotations, read_voc, write_voc
+
+ANNOTATION = """
+<annotation>
+    <filename>000001.jpg</filename>
+    <size><width>353</width><height>500</height><depth>3</depth></size>
+    <object>
+        <name>dog</name>
+        <difficult>0</difficult>
+        <bndbox><xmin>48</xmin><ymin>240</ymin><xmax>196</xmax><ymax>372</ymax></bndbox>
+    </object>
+    <object>
+        <name>person</name>
+        <bndbox><xmin>8</xmin><ymin>12</ymin><xmax>352.4</xmax><ymax>498</ymax></bndbox>
+    </object>
+</annotation>
+"""
+
+
+def test_read_voc(tmp_path):
+    (tmp_path / '000001.xml').write_text(ANNOTATION)
+
+    record, = read_voc(tmp_path)
+    assert record.image == '000001.jpg'
+    assert record.size == (353, 500)
+    assert record.boxes == BoundingBoxArray.from_xyxy([(48, 240, 196, 372), (8, 12, 352, 498)])
+    assert record.labels.tolist() == ['dog', 'person']
+
+    record, = read_voc(tmp_path, classes=['person', 'dog'])
+    assert record.labels.tolist() == [1, 0]
+
+    with pytest.raises(ValueError):
+        list(read_voc(tmp_path, classes=['cat']))
+
+
+def test_write_voc(tmp_path):
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 20), (40, 40, 80, 60)])
+    write_voc(tmp_path, [ImageAnnotations('a.jpg', boxes, np.array([1, 0]), (100, 100))], classes=['cat', 'dog'])
+
+    record, = read_voc(tmp_path, classes=['cat', 'dog'])
+    assert record.image == 'a.jpg'
+    assert record.size == (100, 100)
+    assert record.boxes == boxes
+    assert record.labels.tolist() == [1, 0]
+
+
+def test_write_voc_with_odd_sizes(tmp_path):
+    boxes = BoundingBoxArray.from_tlwh([(0, 0, 11, 7), (3, 5, 1, 2)])
+    write_voc(tmp_path, [ImageAnnotations('a.jpg', boxes, np.array([0, 1]))])
+    record, = read_voc(tmp_path)
+    assert record.boxes == boxes
@@ -0,0 +1,37 @@
+import numpy as np
+
+from bbox import BoundingBoxArray
+from bbox.io import ImageAnnotations, read_yolo, write_yolo
+
+
+def test_read_yolo(tmp_path):
+    (tmp_path / 'b.txt').write_text('0 0.5 0.5 0.5 0.5\n2 0.25 0.75 0.1 0.2\n')
+    (tmp_path / 'a.txt').write_text('')
+    (tmp_path / 'classes.names').write_text('cat\n')
+
+    records = list(read_yolo(tmp_path, image_size=(200, 100)))
+    assert [record.image for record in records] == ['a', 'b']
+    assert len(records[0].boxes) == 0
+    assert records[1].boxes == BoundingBoxArray.from_xyxy([(50, 25, 150, 75), (40, 65, 60, 85)])
+    assert records[1].labels.tolist() == [0, 2]
+    assert records[1].size == (200, 100)
+
+    records = list(read_yolo(tmp_path, image_size=lambda name: {'a': (10, 10), 'b': (400, 200)}[name]))
+    assert records[1].boxes == BoundingBoxArray.from_xyxy([(100, 50, 300, 150), (80, 130, 120, 170)])
+
+
+def test_write_yolo(tmp_path):
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 20), (40, 40, 80, 60)])
+    write_yolo(tmp_path / 'labels', [ImageAnnotations('images/a.jpg', boxes, np.array([1, 0]), (100, 100))])
+    assert (tmp_path / 'labels' / 'a.txt').read_text() == '1 0.050000 0.100000 0.100000 0.200000\n0 0.600000 0.500000 0.400000 0.200000\n'
+
+    records = list(read_yolo(tmp_path / 'labels', image_size=(100, 100)))
+    assert records[0].boxes == boxes
+    assert records[0].labels.tolist() == [1, 0]
+
+
+def test_write_yolo_with_odd_sizes(tmp_path):
+    boxes = BoundingBoxArray.from_tlwh([(0, 0, 11, 7), (3, 5, 1, 2)])
+    write_yolo(tmp_path, [ImageAnnotations('a.jpg', boxes, np.array([0, 1]), (640, 480))])
+    record, = read_yolo(tmp_path, image_size=(640, 480))
+    assert record.boxes == boxes
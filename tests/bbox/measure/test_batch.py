@@ -0,0 +1,86 @@
+from functools import partial
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBoxArray
+from bbox.measure import ciou, diou, giou, iou
+from bbox.measure.batch import (ciou_matrix, ciou_paired, diou_matrix, diou_paired,
+                                giou_matrix, giou_paired, iou_matrix, iou_paired)
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, min_size=1)
+
+
+METRICS = (
+    (iou, iou_matrix, iou_paired),
+    (giou, giou_matrix, giou_paired),
+    (diou, diou_matrix, diou_paired),
+    (ciou, ciou_matrix, ciou_paired)
+)
+
+
+@pytest.mark.parametrize('metric,metric_matrix,metric_paired', METRICS)
+def test_matrix(metric: Callable, metric_matrix: Callable, metric_paired: Callable, random_boxes):
+    boxes1 = random_boxes(30, seed=0)
+    boxes2 = random_boxes(20, seed=1)
+    expected = [[metric(bbox1, bbox2) for bbox2 in boxes2] for bbox1 in boxes1]
+    scores = metric_matrix(boxes1, boxes2)
+    assert scores.shape == (30, 20)
+    assert scores.tolist() == expected
+
+
+@pytest.mark.parametrize('metric,metric_matrix,metric_paired', METRICS)
+def test_matrix_with_block_size(metric: Callable, metric_matrix: Callable, metric_paired: Callable, random_boxes):
+    boxes1 = random_boxes(30, seed=2)
+    boxes2 = random_boxes(20, seed=3)
+    expected = metric_matrix(boxes1, boxes2)
+    for block_size in (1, 7, 30, 100):
+        assert np.array_equal(metric_matrix(boxes1, boxes2, block_size=block_size), expected)
+
+
+@pytest.mark.parametrize('metric,metric_matrix,metric_paired', METRICS)
+def test_paired(metric: Callable, metric_matrix: Callable, metric_paired: Callable, random_boxes):
+    boxes1 = random_boxes(30, seed=4)
+    boxes2 = random_boxes(30, seed=5)
+    expected = [metric(bbox1, bbox2) for bbox1, bbox2 in zip(boxes1, boxes2)]
+    assert metric_paired(boxes1, boxes2).tolist() == expected
+
+
+def test_matrix_with_list_of_bounding_boxes():
+    boxes1 = [BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(0, 0, 20, 20)]
+    boxes2 = [BoundingBox.from_xyxy(5, 5, 15, 15)]
+    assert iou_matrix(boxes1, boxes2)[:, 0].tolist() == pytest.approx([0.142857, 0.25])
+
+
+def test_matrix_with_out(random_boxes):
+    boxes1 = random_boxes(10, seed=8)
+    boxes2 = random_boxes(5, seed=9)
+    out = np.zeros((10, 5))
+    assert iou_matrix(boxes1, boxes2, block_size=3, out=out) is out
+    assert np.array_equal(out, iou_matrix(boxes1, boxes2))
+    with pytest.raises(AssertionError, match=r'expected output in shape \(10, 5\)'):
+        iou_matrix(boxes1, boxes2, out=np.zeros((5, 10)))
+
+
+def test_matrix_with_empty_boxes(random_boxes):
+    boxes = random_boxes(5, seed=10)
+    assert iou_matrix(boxes, BoundingBoxArray.from_xyxy([])).shape == (5, 0)
+    assert iou_matrix(BoundingBoxArray.from_xyxy([]), boxes).shape == (0, 5)
+
+
+def test_paired_with_mismatched_length(random_boxes):
+    with pytest.raises(AssertionError, match='expected bounding boxes in the same length'):
+        iou_paired(random_boxes(5, seed=11), random_boxes(4, seed=12))
+
+
+@pytest.mark.parametrize('metric,metric_matrix,metric_paired', METRICS)
+def test_matrix_in_subpixel_precision(metric: Callable, metric_matrix: Callable, metric_paired: Callable):
+    rng = np.random.default_rng(4)
+    xy = rng.uniform(-50, 50, size=(30, 2))
+    boxes = FloatBoundingBoxArray.from_xyxy(np.concatenate((xy, xy + rng.uniform(1, 40, size=(30, 2))), axis=1))
+    expected = [[metric(bbox1, bbox2) for bbox2 in boxes[10:]] for bbox1 in boxes[:10]]
+    assert metric_matrix(boxes[:10], boxes[10:]).tolist() == expected
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from bbox import BoundingBox, FloatBoundingBox
+from bbox.instrument import profile
+from bbox.measure import ciou, intersect, iou, union
+from bbox.measure.cache import CacheStats, MetricCache
+
+
+def test_metric_cache():
+    bbox1, bbox2 = BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)
+    cached_iou = MetricCache(iou)
+    assert cached_iou.symmetric
+    assert cached_iou(bbox1, bbox2) == iou(bbox1, bbox2)
+    assert cached_iou(bbox1, bbox2) == iou(bbox1, bbox2)
+
+    # The entries are keyed on the values and shared by both orders
+    assert cached_iou(BoundingBox.from_xyxy(5, 5, 15, 15), bbox1) == iou(bbox1, bbox2)
+    assert cached_iou.stats == CacheStats(hits=2, misses=1, evictions=0, expirations=0, size=1)
+    assert cached_iou.stats.hit_rate == pytest.approx(2 / 3)
+
+    # The bounding box assigned with new values is measured again
+    bbox2.w = 20
+    assert cached_iou(bbox1, bbox2) == iou(bbox1, bbox2)
+    assert cached_iou.stats.misses == 2 and len(cached_iou) == 2
+
+    cached_iou.clear()
+    assert cached_iou.stats == (0, 0, 0, 0, 0)
+
+
+def test_metric_cache_symmetric():
+    bbox1, bbox2 = BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 20)
+    for metric in (intersect, union, ciou):
+        cache = MetricCache(metric)
+        assert cache(bbox1, bbox2) == cache(bbox2, bbox1) == metric(bbox1, bbox2)
+        assert cache.stats.hits == 1
+
+    # The unknown measurements are ordered
+    difference = MetricCache(lambda bbox1, bbox2: bbox1.area - bbox2.area)
+    assert not difference.symmetric
+    assert difference(bbox1, bbox2) == -difference(bbox2, bbox1)
+    assert difference.stats.misses == 2
+
+    # The profiled measurements are still recognized
+    with profile():
+        assert hasattr(iou, '__wrapped__')
+        assert MetricCache(iou).symmetric
+
+
+def test_metric_cache_float():
+    cached_iou = MetricCache(iou)
+    bbox1, bbox2 = BoundingBox(x=5, y=5, w=11, h=11), BoundingBox(x=10, y=5, w=11, h=11)
+    float1, float2 = FloatBoundingBox(x=5, y=5, w=11, h=11), FloatBoundingBox(x=10, y=5, w=11, h=11)
+    assert cached_iou(bbox1, bbox2) == iou(bbox1, bbox2)
+    # The same values in sub-pixel precision are measured differently
+    assert cached_iou(float1, float2) == iou(float1, float2) != iou(bbox1, bbox2)
+    assert cached_iou(bbox1, float2) == iou(bbox1, float2)
+    assert cached_iou.stats.misses == 3
+
+
+def test_metric_cache_eviction():
+    cached_iou = MetricCache(iou, maxsize=2)
+    boxes = [BoundingBox.from_xyxy(0, 0, 10, 10 + k) for k in range(3)]
+    cached_iou(boxes[0], boxes[1])
+    cached_iou(boxes[0], boxes[2])
+    cached_iou(boxes[1], boxes[0])
+    cached_iou(boxes[1], boxes[2])
+
+    # The least recently used pair is evicted
+    assert cached_iou.stats == CacheStats(hits=1, misses=3, evictions=1, expirations=0, size=2)
+    cached_iou(boxes[0], boxes[1])
+    assert cached_iou.stats.hits == 2
+    cached_iou(boxes[0], boxes[2])
+    assert cached_iou.stats.misses == 4
+
+
+def test_metric_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = [100.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cached_iou = MetricCache(iou, ttl=10)
+    bbox1, bbox2, bbox3 = (BoundingBox.from_xyxy(0, 0, 10, 10 + k) for k in range(3))
+    cached_iou(bbox1, bbox2)
+    now[0] = 105
+    cached_iou(bbox1, bbox3)
+    cached_iou(bbox1, bbox2)
+    assert cached_iou.stats.hits == 1
+
+    now[0] = 112
+    cached_iou(bbox1, bbox2)
+    assert cached_iou.stats == CacheStats(hits=1, misses=3, evictions=0, expirations=1, size=2)
+    now[0] = 116
+    assert cached_iou.expire() == 1
+    assert cached_iou.stats.expirations == 2 and len(cached_iou) == 1
+    assert MetricCache(iou).expire() == 0
+
+
+def test_metric_cache_arguments():
+    with pytest.raises(AssertionError):
+        MetricCache(iou, maxsize=0)
+    with pytest.raises(AssertionError):
+        MetricCache(iou, ttl=0)
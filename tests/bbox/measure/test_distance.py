@@ -0,0 +1,123 @@
+import math
+
+import numpy as np
+import pytest
+
+from bbox import FloatBoundingBoxArray
+from bbox.measure import (anchor_distance_matrix, anchor_distance_topk, contains_matrix, contains_topk, iou_matrix,
+                          overlap_ratio_matrix, overlap_ratio_topk, within_matrix, within_topk)
+
+
+def expected_topk(keys: np.ndarray, k: int):
+    # Sort each row by the keys then the indices, and drop the infinite keys
+    order = np.argsort(keys, axis=1, kind='stable')[:, :k]
+    values = np.take_along_axis(keys, order, axis=1)
+    found = np.isfinite(values)
+    return np.nonzero(found)[0].tolist(), order[found].tolist(), values[found].tolist()
+
+
+@pytest.mark.parametrize('index', range(1, 10))
+@pytest.mark.parametrize('metric', ('l1', 'l2'))
+def test_anchor_distance_matrix(index: int, metric: str, random_boxes):
+    boxes1 = random_boxes(30, seed=0)
+    boxes2 = random_boxes(20, seed=1)
+    expected = []
+    for bbox1 in boxes1:
+        row = []
+        for bbox2 in boxes2:
+            (x1, y1), (x2, y2) = bbox1.anchor(index), bbox2.anchor(index)
+            row.append(abs(x1 - x2) + abs(y1 - y2) if metric == 'l1' else math.hypot(x1 - x2, y1 - y2))
+        expected.append(row)
+    distances = anchor_distance_matrix(boxes1, boxes2, index=index, metric=metric)
+    assert np.allclose(distances, expected, rtol=0, atol=1e-9)
+    assert np.array_equal(anchor_distance_matrix(boxes1, boxes2, index, metric, block_size=7), distances)
+
+
+def test_anchor_distance_invalid(random_boxes):
+    boxes = random_boxes(3, seed=0)
+    with pytest.raises(IndexError):
+        anchor_distance_matrix(boxes, boxes, index=0)
+    with pytest.raises(IndexError):
+        anchor_distance_topk(boxes, boxes, k=1, index=10)
+    with pytest.raises(AssertionError):
+        anchor_distance_matrix(boxes, boxes, metric='cosine')
+
+
+@pytest.mark.parametrize('k', (1, 3, 20, 50))
+@pytest.mark.parametrize('budget', (7, 1 << 22))
+def test_anchor_distance_topk(k: int, budget: int, random_boxes):
+    boxes1 = random_boxes(100, seed=2)
+    boxes2 = random_boxes(20, seed=3)
+    distances = anchor_distance_matrix(boxes1, boxes2, index=2)
+    rows, cols, values = anchor_distance_topk(boxes1, boxes2, k, index=2, budget=budget)
+    assert (rows.tolist(), cols.tolist(), values.tolist()) == expected_topk(distances, k)
+
+    rows, cols, values = anchor_distance_topk(boxes1, boxes2, k, index=2, max_distance=30, budget=budget)
+    assert (rows.tolist(), cols.tolist(), values.tolist()) == expected_topk(np.where(distances > 30, np.inf, distances), k)
+
+
+def test_overlap_ratio(random_boxes):
+    boxes1 = random_boxes(50, seed=4)
+    boxes2 = random_boxes(40, seed=5, max_size=80)
+    g1, g2 = boxes1.to_xyxy()[:, None], boxes2.to_xyxy()[None]
+    inter = (
+        np.clip(np.minimum(g1[..., 2], g2[..., 2]) - np.maximum(g1[..., 0], g2[..., 0]), 0, None)
+        * np.clip(np.minimum(g1[..., 3], g2[..., 3]) - np.maximum(g1[..., 1], g2[..., 1]), 0, None)
+    )
+    ratios = overlap_ratio_matrix(boxes1, boxes2)
+    assert np.allclose(ratios, inter / (np.minimum(boxes1.area[:, None], boxes2.area) + 1e-7))
+    assert np.allclose(ratios[contains_matrix(boxes1, boxes2) & (boxes2.area > 0)], 1)
+
+    for k in (1, 5, 100):
+        rows, cols, values = overlap_ratio_topk(boxes1, boxes2, k)
+        expected_rows, expected_cols, expected_values = expected_topk(np.where(ratios > 0, -ratios, np.inf), k)
+        assert (rows.tolist(), cols.tolist()) == (expected_rows, expected_cols)
+        assert values.tolist() == [-value for value in expected_values]
+    rows, _, values = overlap_ratio_topk(boxes1, boxes2, 3, min_ratio=0.5)
+    assert (values > 0.5).all() and np.bincount(rows).max() <= 3
+
+
+def test_contains_within(random_boxes):
+    boxes1 = random_boxes(60, seed=6, max_size=100)
+    boxes2 = random_boxes(50, seed=7, max_size=20)
+    xyxy1, xyxy2 = boxes1.to_xyxy(), boxes2.to_xyxy()
+    expected = [[
+        a[0] <= b[0] and a[1] <= b[1] and b[2] <= a[2] and b[3] <= a[3] for b in xyxy2.tolist()
+    ] for a in xyxy1.tolist()]
+
+    contains = contains_matrix(boxes1, boxes2)
+    assert contains.dtype == bool and contains.any()
+    assert contains.tolist() == expected
+    assert np.array_equal(contains_matrix(boxes1, boxes2, block_size=7), contains)
+    assert np.array_equal(within_matrix(boxes2, boxes1), contains.T)
+
+    # The tightest pairs come first
+    scores = iou_matrix(boxes1, boxes2)
+    for k in (1, 4, 100):
+        rows, cols = contains_topk(boxes1, boxes2, k, budget=11)
+        expected_rows, expected_cols, _ = expected_topk(np.where(contains, -scores, np.inf), k)
+        assert (rows.tolist(), cols.tolist()) == (expected_rows, expected_cols)
+
+        rows, cols = within_topk(boxes2, boxes1, k)
+        expected_rows, expected_cols, _ = expected_topk(np.where(contains.T, -scores.T, np.inf), k)
+        assert (rows.tolist(), cols.tolist()) == (expected_rows, expected_cols)
+
+
+def test_float():
+    boxes1 = FloatBoundingBoxArray.from_xyxy([(0.5, 0.5, 10.5, 20.5), (2, 2, 3, 3)])
+    boxes2 = FloatBoundingBoxArray.from_xyxy([(0, 0, 11, 21), (0.5, 0.5, 3.5, 3.5)])
+    assert anchor_distance_matrix(boxes1, boxes2, index=2).tolist()[0][0] == pytest.approx(math.hypot(0, 0.5))
+    assert within_matrix(boxes1, boxes2).tolist() == [[True, False], [True, True]]
+    assert within_topk(boxes1, boxes2, k=1)[1].tolist() == [0, 1]
+
+
+def test_empty(random_boxes):
+    boxes = random_boxes(5, seed=8)
+    empty = boxes[:0]
+    assert anchor_distance_matrix(boxes, empty).shape == (5, 0)
+    assert contains_matrix(empty, boxes).shape == (0, 5)
+    for function in (anchor_distance_topk, overlap_ratio_topk, contains_topk, within_topk):
+        assert all(len(result) == 0 for result in function(boxes, empty, 3))
+        assert all(len(result) == 0 for result in function(empty, boxes, 3))
+    with pytest.raises(AssertionError):
+        anchor_distance_topk(boxes, boxes, k=0)
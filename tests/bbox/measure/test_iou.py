@@ -2,8 +2,8 @@ from typing import Tuple
 
 import pytest
 
-from bbox import BoundingBox
-from bbox.measure.iou import ciou, diou, giou, iou
+from bbox import BoundingBox, FloatBoundingBox
+from bbox.measure.iou import all_ious, ciou, diou, giou, intersect, iou, union
 
 XYXY = Tuple[int, int, int, int]
 
@@ -67,3 +67,49 @@ def test_ciou(xyxy1: XYXY, xyxy2: XYXY, score: float):
     bbox1 = BoundingBox.from_xyxy(*xyxy1)
     bbox2 = BoundingBox.from_xyxy(*xyxy2)
     assert ciou(bbox1, bbox2) == pytest.approx(score)
+
+
+@pytest.mark.parametrize(
+    'xyxy1,xyxy2', (
+        ((0, 0, 10, 10), (20, 20, 30, 30)),
+        ((0, 0, 10, 10), (0, 0, 10, 10)),
+        ((0, 0, 10, 10), (5, 5, 15, 15)),
+        ((0, 0, 20, 20), (5, 5, 15, 15)),
+        ((0, 0, 10, 10), (10, 10, 20, 20)),
+        ((0, 0, 11, 7), (3, -4, 16, 9))
+    )
+)
+def test_all_ious(xyxy1: XYXY, xyxy2: XYXY):
+    bbox1 = BoundingBox.from_xyxy(*xyxy1)
+    bbox2 = BoundingBox.from_xyxy(*xyxy2)
+    scores = all_ious(bbox1, bbox2)
+    assert scores == (iou(bbox1, bbox2), giou(bbox1, bbox2), diou(bbox1, bbox2), ciou(bbox1, bbox2))
+    assert scores.iou == iou(bbox1, bbox2)
+    assert scores.ciou == ciou(bbox1, bbox2)
+
+
+@pytest.mark.parametrize(
+    'xyxy1,xyxy2', (
+        ((0.5, 0.5, 10.25, 10.0), (3.0, 2.5, 12.5, 9.0)),
+        ((0.0, 0.0, 10.0, 10.0), (0.0, 0.0, 10.0, 10.0)),
+        ((0.0, 0.0, 5.0, 5.0), (5.0, 5.0, 9.0, 9.0))
+    )
+)
+def test_float_bounding_boxes(xyxy1, xyxy2):
+    bbox1 = FloatBoundingBox.from_xyxy(*xyxy1)
+    bbox2 = FloatBoundingBox.from_xyxy(*xyxy2)
+    w1, h1 = xyxy1[2] - xyxy1[0], xyxy1[3] - xyxy1[1]
+    w2, h2 = xyxy2[2] - xyxy2[0], xyxy2[3] - xyxy2[1]
+    inter_w = max(min(xyxy1[2], xyxy2[2]) - max(xyxy1[0], xyxy2[0]), 0)
+    inter_h = max(min(xyxy1[3], xyxy2[3]) - max(xyxy1[1], xyxy2[1]), 0)
+    inter = inter_w * inter_h
+    assert intersect(bbox1, bbox2) == inter
+    assert union(bbox1, bbox2) == w1 * h1 + w2 * h2 - inter
+    assert iou(bbox1, bbox2) == pytest.approx(inter / (w1 * h1 + w2 * h2 - inter), abs=1e-6)
+
+    # The smallest enclosing bounding box is not snapped to the pixels
+    se_w = max(xyxy1[2], xyxy2[2]) - min(xyxy1[0], xyxy2[0])
+    se_h = max(xyxy1[3], xyxy2[3]) - min(xyxy1[1], xyxy2[1])
+    center_dist = (bbox1.x - bbox2.x) ** 2 + (bbox1.y - bbox2.y) ** 2
+    assert diou(bbox1, bbox2) == pytest.approx(iou(bbox1, bbox2) - center_dist / (se_w ** 2 + se_h ** 2))
+    assert all_ious(bbox1, bbox2) == (iou(bbox1, bbox2), giou(bbox1, bbox2), diou(bbox1, bbox2), ciou(bbox1, bbox2))
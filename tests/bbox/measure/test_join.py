@@ -0,0 +1,46 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+from bbox.measure import iou, overlap_join
+from bbox.measure.batch import iou_matrix
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, low=-100, high=300, max_size=60)
+
+
+@pytest.mark.parametrize('min_iou', (-1, 0, 0.1, 0.5, 0.9, 1))
+@pytest.mark.parametrize('budget', (5, 1 << 22))
+def test_overlap_join(min_iou: float, budget: int, random_boxes):
+    boxes1 = random_boxes(200, seed=0)
+    boxes2 = random_boxes(150, seed=1, max_size=100)
+    expected = iou_matrix(boxes1, boxes2)
+    rows, cols, scores = overlap_join(boxes1, boxes2, min_iou, budget=budget)
+
+    expected_rows, expected_cols = np.nonzero(expected > min_iou)
+    assert rows.tolist() == expected_rows.tolist()
+    assert cols.tolist() == expected_cols.tolist()
+    assert scores.tolist() == expected[expected_rows, expected_cols].tolist()
+
+
+def test_overlap_join_itself(random_boxes):
+    # The duplicated bounding boxes share the same left edges
+    boxes = random_boxes(100, seed=2)
+    boxes = BoundingBoxArray(*(np.concatenate((column, column)) for column in (boxes.x, boxes.y, boxes.w, boxes.h)))
+    rows, cols, scores = overlap_join(boxes, boxes, 0.3)
+
+    expected = [
+        (i, j, iou(bbox1, bbox2))
+        for i, bbox1 in enumerate(boxes) for j, bbox2 in enumerate(boxes)
+        if iou(bbox1, bbox2) > 0.3
+    ]
+    assert list(zip(rows.tolist(), cols.tolist(), scores.tolist())) == expected
+
+
+def test_overlap_join_empty(random_boxes):
+    rows, cols, scores = overlap_join(random_boxes(0, seed=3), random_boxes(10, seed=4), 0.5)
+    assert len(rows) == len(cols) == len(scores) == 0
@@ -0,0 +1,76 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from bbox import FloatBoundingBoxArray
+from bbox.measure.batch import ciou_matrix, diou_matrix, giou_matrix, iou_matrix
+from bbox.measure.parallel import pairs_above, topk
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, low=0, high=400, min_size=1, max_size=60)
+
+
+MATRICES = {
+    'iou': iou_matrix,
+    'giou': giou_matrix,
+    'diou': diou_matrix,
+    'ciou': ciou_matrix
+}
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+@pytest.mark.parametrize('metric,threshold', (('iou', 0.1), ('iou', -1), ('giou', -0.5), ('ciou', 0.0)))
+def test_pairs_above(metric: str, threshold: float, workers: int, random_boxes):
+    boxes1 = random_boxes(150, seed=0)
+    boxes2 = random_boxes(120, seed=1)
+    expected = MATRICES[metric](boxes1, boxes2)
+    rows, cols, scores = pairs_above(boxes1, boxes2, threshold, metric, workers=workers, tile_size=32)
+
+    expected_rows, expected_cols = np.nonzero(expected > threshold)
+    assert rows.tolist() == expected_rows.tolist()
+    assert cols.tolist() == expected_cols.tolist()
+    assert scores.tolist() == expected[expected_rows, expected_cols].tolist()
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+@pytest.mark.parametrize('metric', ('iou', 'diou'))
+def test_topk(metric: str, workers: int, random_boxes):
+    boxes1 = random_boxes(90, seed=2)
+    boxes2 = random_boxes(70, seed=3)
+    expected = MATRICES[metric](boxes1, boxes2)
+    indices, scores = topk(boxes1, boxes2, 5, metric, workers=workers, tile_size=16)
+
+    # The ties of zero IoU are broken by the smaller indices
+    cols = np.broadcast_to(np.arange(70), expected.shape)
+    expected_indices = np.lexsort((cols, -expected), axis=1)[:, :5]
+    assert indices.tolist() == expected_indices.tolist()
+    assert scores.tolist() == np.take_along_axis(expected, expected_indices, axis=1).tolist()
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_subpixel_precision(workers: int, random_boxes):
+    boxes1 = FloatBoundingBoxArray.from_xyxy(random_boxes(60, seed=10).to_xyxy() / 3 + 0.25)
+    boxes2 = random_boxes(50, seed=11)
+    for pair in ((boxes1, boxes1), (boxes1, boxes2), (boxes2, boxes1)):
+        expected = iou_matrix(*pair)
+        rows, cols, scores = pairs_above(*pair, -1, workers=workers, tile_size=16)
+        assert scores.reshape(expected.shape).tolist() == expected.tolist()
+        indices, scores = topk(*pair, 3, workers=workers, tile_size=16)
+        assert scores.tolist() == np.take_along_axis(expected, indices, axis=1).tolist()
+
+
+def test_topk_more_than_candidates(random_boxes):
+    boxes1 = random_boxes(4, seed=4)
+    boxes2 = random_boxes(3, seed=5)
+    indices, scores = topk(boxes1, boxes2, 10, workers=1)
+    assert indices.shape == scores.shape == (4, 3)
+
+
+def test_empty(random_boxes):
+    rows, cols, scores = pairs_above(random_boxes(0, seed=6), random_boxes(5, seed=7), 0.5, workers=1)
+    assert len(rows) == len(cols) == len(scores) == 0
+    indices, scores = topk(random_boxes(0, seed=8), random_boxes(5, seed=9), 2, workers=1)
+    assert indices.shape == scores.shape == (0, 2)
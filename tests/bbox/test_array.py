@@ -0,0 +1,138 @@
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBox, FloatBoundingBoxArray
+from bbox.array import as_array
+
+XYXY = Tuple[int, int, int, int]
+
+XYXYS = (
+    (0, 0, 10, 10),
+    (10, 10, 0, 0),
+    (0, 10, 10, 0),
+    (-10, -10, -20, -20),
+    (10, 10, 10, 20),
+    (10, 20, 20, 20),
+    (10, 10, 10, 10),
+    (0, 0, 11, 7),
+    (-3, 5, 8, -9)
+)
+
+
+class TestBoundingBoxArray:
+    def test_init(self):
+        boxes = BoundingBoxArray(x=[0, -1], y=[10, 0], w=[10, 0], h=[0, 10])
+        assert len(boxes) == 2
+        assert boxes.x.dtype == np.int64
+
+    def test_init_with_negative_width(self):
+        with pytest.raises(ValueError, match='w cannot be negative'):
+            BoundingBoxArray(x=[0], y=[0], w=[-1], h=[0])
+
+    def test_init_with_negative_height(self):
+        with pytest.raises(ValueError, match='h cannot be negative'):
+            BoundingBoxArray(x=[0], y=[0], w=[0], h=[-1])
+
+    def test_init_with_fractional_value(self):
+        with pytest.raises(ValueError, match='expected integral x'):
+            BoundingBoxArray(x=[0.5], y=[0], w=[0], h=[0])
+
+    def test_init_with_mismatched_length(self):
+        with pytest.raises(ValueError, match='expected columns in the same length'):
+            BoundingBoxArray(x=[0, 1], y=[0], w=[0], h=[0])
+
+    def test_from_xyxy(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        assert boxes.to_boxes() == [BoundingBox.from_xyxy(*xyxy) for xyxy in XYXYS]
+
+    def test_from_xyxy_with_invalid_shape(self):
+        with pytest.raises(ValueError, match=r'expected xyxy in shape \(N, 4\)'):
+            BoundingBoxArray.from_xyxy([(0, 0, 10)])
+
+    def test_from_tlwh(self):
+        tlwhs = ((0, 0, 10, 10), (-10, -10, 10, 10), (10, 10, 10, 0), (10, 10, 0, 10), (3, 7, 5, 9))
+        boxes = BoundingBoxArray.from_tlwh(tlwhs)
+        assert boxes.to_boxes() == [BoundingBox.from_tlwh(*tlwh) for tlwh in tlwhs]
+
+    def test_empty(self):
+        boxes = BoundingBoxArray.from_xyxy([])
+        assert len(boxes) == 0
+        assert boxes.to_xyxy().shape == (0, 4)
+        assert BoundingBoxArray.from_boxes([]) == boxes
+
+    def test_width_height_area(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        expected = [BoundingBox.from_xyxy(*xyxy) for xyxy in XYXYS]
+        assert boxes.width.tolist() == [bbox.width for bbox in expected]
+        assert boxes.height.tolist() == [bbox.height for bbox in expected]
+        assert boxes.area.tolist() == [bbox.area for bbox in expected]
+
+    @pytest.mark.parametrize('index', range(1, 10))
+    def test_anchor(self, index: int):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        x, y = boxes.anchor(index)
+        assert list(zip(x.tolist(), y.tolist())) == [BoundingBox.from_xyxy(*xyxy).anchor(index) for xyxy in XYXYS]
+
+    def test_anchor_with_invalid_index(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        with pytest.raises(IndexError, match='expected index between 1 to 9, got 10'):
+            boxes.anchor(10)
+        with pytest.raises(IndexError, match='expected index between 1 to 9, got 0'):
+            boxes.anchor(0)
+
+    def test_to_xyxy(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        assert [tuple(row) for row in boxes.to_xyxy().tolist()] == [BoundingBox.from_xyxy(*xyxy).to_xyxy() for xyxy in XYXYS]
+
+    def test_to_tlwh(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        assert [tuple(row) for row in boxes.to_tlwh().tolist()] == [BoundingBox.from_xyxy(*xyxy).to_tlwh() for xyxy in XYXYS]
+
+    def test_boxes_roundtrip(self):
+        expected = [BoundingBox.from_xyxy(*xyxy) for xyxy in XYXYS]
+        boxes = BoundingBoxArray.from_boxes(expected)
+        assert boxes.to_boxes() == expected
+        assert list(boxes) == expected
+
+    def test_getitem(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        assert boxes[0] == BoundingBox.from_xyxy(*XYXYS[0])
+        assert boxes[-1] == BoundingBox.from_xyxy(*XYXYS[-1])
+        assert boxes[1:3] == BoundingBoxArray.from_xyxy(XYXYS[1:3])
+        assert boxes[[0, 2]] == BoundingBoxArray.from_xyxy([XYXYS[0], XYXYS[2]])
+
+    def test_getitem_with_mask(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        mask = boxes.area > 0
+        assert boxes[mask].to_boxes() == [bbox for bbox in boxes if bbox.area > 0]
+        with pytest.raises(IndexError, match='expected boolean mask in shape'):
+            boxes[mask[:-1]]
+
+    def test_eq(self):
+        boxes = BoundingBoxArray.from_xyxy(XYXYS)
+        assert boxes == BoundingBoxArray.from_xyxy(XYXYS)
+        assert boxes != BoundingBoxArray.from_xyxy(XYXYS[:-1])
+        assert boxes != BoundingBoxArray.from_xyxy(XYXYS[:-1] + ((0, 0, 1, 1),))
+
+
+def test_as_array():
+    boxes = BoundingBoxArray.from_xyxy(XYXYS)
+    assert as_array(boxes) is boxes
+    assert as_array(boxes.to_boxes()) == boxes
+
+
+def test_float_array():
+    xyxy = [(0.5, 0.5, 10.25, 10.0), (3.0, 2.5, 12.5, 9.0), (1.0, 1.0, 1.0, 1.0)]
+    boxes = FloatBoundingBoxArray.from_xyxy(xyxy)
+    assert boxes.x.dtype == np.float64
+    assert boxes.to_xyxy().tolist() == [list(row) for row in xyxy]
+    assert boxes.to_boxes() == [FloatBoundingBox.from_xyxy(*row) for row in xyxy]
+    assert isinstance(boxes[0], FloatBoundingBox)
+    assert isinstance(boxes[1:], FloatBoundingBoxArray)
+    assert as_array(boxes.to_boxes()) == boxes
+    assert isinstance(as_array(boxes.to_boxes()), FloatBoundingBoxArray)
+    assert boxes.to_pixels() == BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (3, 2, 12, 9), (1, 1, 1, 1)])
+    with pytest.raises(ValueError, match='w cannot be negative'):
+        FloatBoundingBoxArray([0.0], [0.0], [-0.5], [0.0])
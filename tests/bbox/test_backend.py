@@ -0,0 +1,112 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, FloatBoundingBox, backend, instrument
+from bbox.backend import available_backends, get_backend, set_backend, use_backend
+from bbox.measure import all_ious, ciou, diou, giou, iou
+from bbox.measure.cache import MetricCache
+from bbox.transform import smallest_enclosing
+
+requires_numba = pytest.mark.skipif(importlib.util.find_spec('numba') is None, reason='numba is not installed')
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = get_backend()
+    yield
+    set_backend(previous)
+
+
+def random_box(rng: np.random.Generator, kind: str) -> BoundingBox:
+    if kind == 'int':
+        x1, y1 = rng.integers(-20, 20, 2).tolist()
+        w, h = rng.integers(0, 20, 2).tolist()
+        return BoundingBox.from_xyxy(x1, y1, x1 + w, y1 + h)
+    x1, y1 = (rng.integers(-40, 40, 2) / 2 + rng.random(2)).tolist()
+    w, h = (rng.integers(0, 40, 2) / 2).tolist()
+    return FloatBoundingBox.from_xyxy(x1, y1, x1 + w, y1 + h)
+
+
+def measure(metric, bbox1: BoundingBox, bbox2: BoundingBox):
+    try:
+        result = metric(bbox1, bbox2)
+    except ZeroDivisionError:
+        return ZeroDivisionError
+    if isinstance(result, BoundingBox):
+        fields = (result.x, result.y, result.w, result.h)
+        return type(result), fields, tuple(type(field) for field in fields)
+    return result
+
+
+def test_select():
+    assert 'python' in available_backends()
+    assert set_backend('python') == get_backend() == 'python'
+    assert backend._native is None
+    assert set_backend('auto') == available_backends()[-1]
+
+    with pytest.raises(AssertionError):
+        set_backend('cython')
+
+
+def test_fallback(monkeypatch):
+    monkeypatch.setattr(backend, 'available_backends', lambda: ['python'])
+    with pytest.warns(RuntimeWarning):
+        assert set_backend('numba') == 'python'
+    assert get_backend() == 'python'
+
+
+@requires_numba
+def test_use_backend():
+    set_backend('python')
+    with use_backend('numba') as name:
+        assert name == get_backend() == 'numba'
+    assert get_backend() == 'python'
+
+    with pytest.raises(KeyError):
+        with use_backend('numba'):
+            raise KeyError
+    assert get_backend() == 'python'
+
+
+@requires_numba
+@pytest.mark.parametrize('kinds', [('int', 'int'), ('float', 'float'), ('int', 'float'), ('float', 'int')])
+def test_parity(kinds):
+    rng = np.random.default_rng(0)
+    metrics = (iou, giou, diou, ciou, all_ious, smallest_enclosing)
+    for _ in range(500):
+        bbox1, bbox2 = random_box(rng, kinds[0]), random_box(rng, kinds[1])
+        expected = [measure(metric, bbox1, bbox2) for metric in metrics]
+        with use_backend('numba'):
+            result = [measure(metric, bbox1, bbox2) for metric in metrics]
+        # The results are identical including the types, not just close
+        assert result == expected
+        assert [type(r) for r in result] == [type(e) for e in expected]
+
+
+@requires_numba
+def test_zero_division():
+    bbox1, bbox2 = BoundingBox(x=0, y=0, w=0, h=0), BoundingBox(x=0, y=0, w=0, h=0)
+    with use_backend('numba'):
+        with pytest.raises(ZeroDivisionError):
+            giou(bbox1, bbox2)
+        with pytest.raises(ZeroDivisionError):
+            diou(bbox1, bbox2)
+
+
+@requires_numba
+def test_compatible():
+    bbox1, bbox2 = BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)
+    with use_backend('numba'):
+        cache = MetricCache(iou)
+        assert cache.symmetric
+        assert cache(bbox1, bbox2) == cache(bbox2, bbox1) == iou(bbox1, bbox2)
+        assert cache.stats.hits == 1
+
+        with instrument.profile() as profile:
+            iou(bbox1, bbox2)
+            smallest_enclosing(bbox1, bbox2)
+        snapshot = profile.snapshot()
+        assert snapshot['measure.iou']['calls'] == 1
+        assert snapshot['transform.smallest_enclosing']['calls'] == 1
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray
+from bbox.cluster import AnchorFitness, MiniBatchKMeans, anchor_fitness, anchor_iou, kmeans_anchors
+from bbox.measure import iou
+
+
+def random_sizes(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.exp(rng.normal(3, 0.7, size=(n, 2))).round() + 1
+
+
+def clustered_sizes(n: int, seed: int) -> np.ndarray:
+    centers = np.array([(10, 10), (40, 20), (20, 80)])
+    rng = np.random.default_rng(seed)
+    return centers[rng.integers(3, size=n)] + rng.integers(-1, 2, size=(n, 2))
+
+
+def test_anchor_iou():
+    # The even sizes are never snapped by the integer bounding boxes
+    sizes = 2 * random_sizes(50, 0)
+    anchors = 2 * random_sizes(5, 1)
+    boxes = [BoundingBox(x=0, y=0, w=int(w), h=int(h)) for w, h in sizes]
+    expected = [[iou(bbox, BoundingBox(x=0, y=0, w=int(w), h=int(h))) for w, h in anchors] for bbox in boxes]
+    assert np.allclose(anchor_iou(sizes, anchors), expected)
+    assert np.allclose(anchor_iou(boxes, BoundingBoxArray.from_xyxy(np.concatenate((-anchors, anchors), axis=1))), anchor_iou(sizes, 2 * anchors))
+    assert anchor_iou(sizes[:0], anchors).shape == (0, 5)
+
+    with pytest.raises(AssertionError):
+        anchor_iou(np.zeros((3, 4)), anchors)
+    with pytest.raises(AssertionError):
+        anchor_iou(-sizes, anchors)
+
+
+def test_kmeans_anchors():
+    sizes = clustered_sizes(3000, 0)
+    anchors = kmeans_anchors(sizes, k=3, seed=0)
+    assert anchors.shape == (3, 2)
+    assert np.allclose(anchors, [(10, 10), (40, 20), (20, 80)], atol=0.2)
+
+    fitness = anchor_fitness(sizes, anchors)
+    assert isinstance(fitness, AnchorFitness)
+    assert fitness.average_iou > 0.85
+    assert fitness.best_possible_recall == 1
+
+
+def test_kmeans_anchors_random_initialization():
+    sizes = random_sizes(2000, 0)
+    anchors = kmeans_anchors(sizes, k=9, init='random', seed=0)
+    assert anchors.shape == (9, 2)
+    assert len(np.unique(anchors, axis=0)) == 9
+    assert anchor_fitness(sizes, anchors).average_iou > 0.6
+
+
+def test_kmeans_anchors_is_stable():
+    sizes = random_sizes(2000, 0)
+    anchors = kmeans_anchors(sizes, k=9, seed=0)
+    areas = anchors[:, 0] * anchors[:, 1]
+    assert (np.diff(areas) >= 0).all()
+    assert np.array_equal(kmeans_anchors(sizes, k=9, seed=0), anchors)
+
+    # Each anchor is the mean size of the bounding boxes assigned to it
+    labels = anchor_iou(sizes, anchors).argmax(axis=1)
+    assert np.allclose([sizes[labels == k].mean(axis=0) for k in range(9)], anchors)
+
+    # The clustering improves the fitness of its initialization
+    initial = sizes[np.random.default_rng(0).choice(len(sizes), 9, replace=False)]
+    assert anchor_fitness(sizes, anchors).average_iou > anchor_fitness(sizes, initial).average_iou
+
+    boxes = BoundingBoxArray(np.zeros(len(sizes)), np.zeros(len(sizes)), sizes[:, 0], sizes[:, 1])
+    assert np.array_equal(kmeans_anchors(boxes, k=9, seed=0), anchors)
+
+
+def test_kmeans_anchors_too_few_sizes():
+    with pytest.raises(AssertionError):
+        kmeans_anchors(np.array([(1, 1), (1, 1), (2, 2)]), k=3)
+
+
+def test_mini_batch_kmeans():
+    sizes = clustered_sizes(5000, 0)
+    clustering = MiniBatchKMeans(k=3, init_size=500, seed=0)
+    assert clustering.fit(np.array_split(sizes, 50)) is clustering
+    assert clustering.n_seen == 5000
+    assert np.allclose(clustering.anchors, [(10, 10), (40, 20), (20, 80)], atol=0.2)
+    assert anchor_fitness(sizes, clustering.anchors).best_possible_recall == 1
+
+
+def test_mini_batch_kmeans_streaming_records():
+    sizes = random_sizes(3000, 0)
+    clustering = MiniBatchKMeans(k=9, init_size=300, seed=0)
+    for start in range(0, len(sizes), 7):
+        # A batch of each image, which may be empty
+        w, h = sizes[start:start + 7].T
+        clustering.partial_fit(BoundingBoxArray(np.zeros(len(w)), np.zeros(len(w)), w, h))
+        clustering.partial_fit([])
+    assert clustering.n_seen == 3000
+
+    fitness = anchor_fitness(sizes, clustering.anchors)
+    assert fitness.average_iou > anchor_fitness(sizes, kmeans_anchors(sizes, k=9, seed=0)).average_iou - 0.02
+
+
+def test_mini_batch_kmeans_initialization():
+    clustering = MiniBatchKMeans(k=3, init_size=3, seed=0)
+    clustering.partial_fit(np.ones((5, 2)))
+    with pytest.raises(RuntimeError):
+        clustering.anchors
+
+    # The bounding boxes are buffered until enough different sizes
+    clustering.partial_fit(np.array([(2, 2), (3, 9)]))
+    assert clustering.n_seen == 7
+    assert clustering.anchors.tolist() == [[1, 1], [2, 2], [3, 9]]
+
+    with pytest.raises(AssertionError):
+        MiniBatchKMeans(k=3, init_size=2)
+
+
+def test_anchor_fitness():
+    anchors = np.array([(10, 10)])
+    fitness = anchor_fitness(np.array([(10, 10), (20, 5), (10, 9)]), anchors)
+    assert fitness.average_iou == pytest.approx((1 + 1 / 3 + 0.9) / 3)
+    assert fitness.best_possible_recall == pytest.approx(2 / 3)
+    assert anchor_fitness(np.array([(10, 10), (20, 5)]), anchors, iou_threshold=0.2).best_possible_recall == 1
+    assert anchor_fitness(np.empty((0, 2)), anchors) == (0, 0)
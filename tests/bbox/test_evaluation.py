@@ -0,0 +1,102 @@
+import math
+import pickle
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+from bbox.evaluation import DetectionEvaluator
+
+
+def random_image(rng: np.random.Generator):
+    xy = rng.integers(0, 100, size=(8, 2))
+    gt_boxes = BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + rng.integers(5, 30, size=(8, 2))), axis=1))
+    gt_labels = rng.integers(0, 3, size=8)
+
+    # Jitter the groundtruths and add some false positives
+    xyxy = np.concatenate((gt_boxes.to_xyxy() + rng.integers(-3, 4, size=(8, 4)), rng.integers(0, 100, size=(4, 4))))
+    boxes = BoundingBoxArray.from_xyxy(xyxy)
+    labels = np.concatenate((gt_labels, rng.integers(0, 3, size=4)))
+    return boxes, rng.random(12), labels, gt_boxes, gt_labels
+
+
+def test_perfect_predictions():
+    evaluator = DetectionEvaluator()
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (20, 20, 40, 40)])
+    evaluator.update(boxes, [0.9, 0.8], [0, 1], boxes, [0, 1])
+    metrics = evaluator.compute()
+    assert metrics['AP'] == metrics['AP50'] == metrics['AP95'] == metrics['AR'] == 1.0
+    assert evaluator.labels == [0, 1]
+
+
+def test_duplicated_and_false_positive():
+    evaluator = DetectionEvaluator(iou_thresholds=[0.5, 0.95])
+    evaluator.update(
+        BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (0, 0, 10, 9), (50, 50, 60, 60)]), [0.9, 0.8, 0.95], [0, 0, 0],
+        BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (100, 100, 110, 110)]), [0, 0]
+    )
+    metrics = evaluator.compute()
+
+    # The only true positive is ranked second, the precision is 0.5 up to the recall 0.5
+    assert metrics['AP50'] == pytest.approx(51 * 0.5 / 101)
+    assert metrics['AP95'] == pytest.approx(51 * 0.5 / 101)
+    assert metrics['AR'] == 0.5
+
+
+def test_iou_threshold():
+    evaluator = DetectionEvaluator(iou_thresholds=[0.5, 0.75])
+    evaluator.update(BoundingBoxArray.from_xyxy([(0, 0, 10, 6)]), [0.9], [0], BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), [0])
+    metrics = evaluator.compute()
+    assert metrics['AP50'] == 1.0
+    assert metrics['AP75'] == 0.0
+    assert metrics['AP'] == 0.5
+
+
+def test_max_detections():
+    evaluator = DetectionEvaluator(iou_thresholds=[0.5], max_detections=1)
+    evaluator.update(
+        BoundingBoxArray.from_xyxy([(50, 50, 60, 60), (0, 0, 10, 10)]), [0.9, 0.8], [0, 0],
+        BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), [0]
+    )
+    assert evaluator.compute()['AR'] == 0.0
+
+
+def test_class_without_groundtruth_is_ignored():
+    evaluator = DetectionEvaluator(iou_thresholds=[0.5])
+    evaluator.update(
+        BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (50, 50, 60, 60)]), [0.9, 0.8], [0, 1],
+        BoundingBoxArray.from_xyxy([(0, 0, 10, 10)]), [0]
+    )
+    assert evaluator.compute()['AP'] == 1.0
+
+
+def test_empty():
+    metrics = DetectionEvaluator().compute()
+    assert math.isnan(metrics['AP'])
+    assert math.isnan(metrics['AR'])
+
+
+def test_merge():
+    rng = np.random.default_rng(0)
+    images = [random_image(rng) for _ in range(200)]
+
+    evaluator = DetectionEvaluator()
+    for image in images:
+        evaluator.update(*image)
+
+    # Simulate the workers by pickling the partial evaluators
+    workers = [DetectionEvaluator() for _ in range(3)]
+    for index, image in enumerate(images):
+        workers[index % 3].update(*image)
+    merged = DetectionEvaluator()
+    for worker in workers:
+        merged.merge(pickle.loads(pickle.dumps(worker)))
+
+    expected = evaluator.compute()
+    assert 0 < expected['AP'] < 1
+    assert merged.compute() == pytest.approx(expected)
+
+
+def test_merge_with_different_thresholds():
+    with pytest.raises(AssertionError, match='expected evaluators with the same IoU thresholds'):
+        DetectionEvaluator().merge(DetectionEvaluator(iou_thresholds=[0.5]))
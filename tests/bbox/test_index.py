@@ -0,0 +1,73 @@
+import math
+from functools import partial
+
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray
+from bbox.index import BoxIndex
+from bbox.measure import intersect, iou
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, low=-200, high=200)
+
+
+def distance(bbox: BoundingBox, x1: int, y1: int, x2: int, y2: int) -> float:
+    a1, b1, a2, b2 = bbox.to_xyxy()
+    dx = max(a1 - x2, x1 - a2, 0)
+    dy = max(b1 - y2, y1 - b2, 0)
+    return math.sqrt(dx * dx + dy * dy)
+
+
+@pytest.fixture(params=((16, 16), (1, 2), (4, 3)), ids=lambda param: f'leaf_size={param[0]},fanout={param[1]}')
+def index(request, random_boxes) -> BoxIndex:
+    leaf_size, fanout = request.param
+    return BoxIndex(random_boxes(500, seed=0), leaf_size=leaf_size, fanout=fanout)
+
+
+def test_query_intersecting(index: BoxIndex, random_boxes):
+    for query in random_boxes(50, seed=1):
+        expected = [i for i, bbox in enumerate(index.boxes) if intersect(query, bbox) > 0]
+        assert index.query_intersecting(query).tolist() == expected
+
+
+def test_query_intersecting_many(index: BoxIndex, random_boxes):
+    queries = random_boxes(50, seed=2)
+    q, b = index.query_intersecting_many(queries)
+    expected = [(i, j) for i, query in enumerate(queries) for j, bbox in enumerate(index.boxes) if intersect(query, bbox) > 0]
+    assert list(zip(q.tolist(), b.tolist())) == expected
+
+
+@pytest.mark.parametrize('threshold', (-0.1, 0.0, 0.1, 0.5))
+def test_query_iou_above(index: BoxIndex, threshold: float, random_boxes):
+    for query in random_boxes(20, seed=3):
+        expected = [i for i, bbox in enumerate(index.boxes) if iou(query, bbox) > threshold]
+        assert index.query_iou_above(query, threshold).tolist() == expected
+
+
+@pytest.mark.parametrize('k', (1, 5, 600))
+def test_nearest(index: BoxIndex, k: int, random_boxes):
+    for query in random_boxes(20, seed=4):
+        x1, y1, x2, y2 = query.to_xyxy()
+        expected = sorted(range(len(index)), key=lambda i: (distance(index.boxes[i], x1, y1, x2, y2), i))[:k]
+        assert index.nearest(query, k).tolist() == expected
+
+        expected = sorted(range(len(index)), key=lambda i: (distance(index.boxes[i], query.x, query.y, query.x, query.y), i))[:k]
+        assert index.nearest((query.x, query.y), k).tolist() == expected
+
+
+def test_empty_index():
+    index = BoxIndex(BoundingBoxArray.from_xyxy([]))
+    query = BoundingBox.from_xyxy(0, 0, 10, 10)
+    assert len(index) == 0
+    assert index.query_intersecting(query).tolist() == []
+    assert index.query_iou_above(query, -1).tolist() == []
+    assert index.nearest(query).tolist() == []
+
+
+def test_example():
+    index = BoxIndex([BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15), BoundingBox.from_xyxy(20, 20, 30, 30)])
+    assert index.query_intersecting(BoundingBox.from_xyxy(8, 8, 12, 12)).tolist() == [0, 1]
+    assert index.query_iou_above(BoundingBox.from_xyxy(5, 5, 15, 15), 0.5).tolist() == [1]
+    assert index.nearest((30, 40), k=2).tolist() == [2, 1]
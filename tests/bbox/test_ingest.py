@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBoxArray
+from bbox.ingest import from_array, from_buffer, iter_chunks, load, save
+
+
+@pytest.fixture
+def boxes() -> BoundingBoxArray:
+    rng = np.random.default_rng(0)
+    xy = rng.integers(0, 100, size=(50, 2))
+    return BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + 2 * rng.integers(0, 25, size=(50, 2))), axis=1))
+
+
+def test_from_array_xywh_without_copy():
+    xywh = np.array([(5, 5, 10, 10), (20, 20, 4, 4)], dtype=np.int64)
+    boxes = from_array(xywh, layout='xywh')
+    assert boxes.to_boxes() == [BoundingBox(x=5, y=5, w=10, h=10), BoundingBox(x=20, y=20, w=4, h=4)]
+    for column in (boxes.x, boxes.y, boxes.w, boxes.h):
+        assert np.shares_memory(column, xywh)
+
+    unchecked = from_array(xywh, layout='xywh', validate=False)
+    assert np.shares_memory(unchecked.w, xywh)
+    assert unchecked == boxes
+
+
+def test_from_array_layouts(boxes: BoundingBoxArray):
+    xyxy = boxes.to_xyxy()
+    ltwh = boxes.to_tlwh()
+    tlwh = ltwh[:, [1, 0, 2, 3]]
+    xywh = np.stack((boxes.x, boxes.y, boxes.w, boxes.h), axis=1)
+    assert from_array(xyxy, 'xyxy') == BoundingBoxArray.from_xyxy(xyxy)
+    assert from_array(tlwh, 'tlwh') == BoundingBoxArray.from_tlwh(tlwh)
+    assert from_array(ltwh, 'ltwh') == BoundingBoxArray.from_tlwh(tlwh)
+    assert from_array(xywh, 'xywh') == boxes
+    for layout, values in (('tlwh', tlwh), ('ltwh', ltwh), ('xywh', xywh)):
+        assert from_array(values, layout, validate=False) == from_array(values, layout)
+
+
+def test_from_array_float():
+    xyxy = np.array([(0.2, 0.4, 10.4, 9.6)], dtype=np.float32)
+    assert from_array(xyxy).to_boxes() == [BoundingBox.from_xyxy(0, 0, 10, 10)]
+
+
+def test_from_array_subpixel():
+    xyxy = np.array([(0.25, 0.5, 0.75, 1.0)])
+    boxes = from_array(xyxy, image_size=(201, 101), subpixel=True)
+    assert isinstance(boxes, FloatBoundingBoxArray)
+    assert boxes.to_xyxy().tolist() == [[50.25, 50.5, 150.75, 101.0]]
+    assert from_array(boxes.to_tlwh(), 'ltwh', subpixel=True) == boxes
+    assert from_buffer(xyxy.tobytes(), dtype='float64', subpixel=True).to_xyxy().tolist() == xyxy.tolist()
+
+
+def test_from_array_normalized():
+    xyxy = np.array([(0.0, 0.0, 0.5, 0.5), (0.25, 0.5, 0.75, 1.0)])
+    assert from_array(xyxy, image_size=(200, 100)) == BoundingBoxArray.from_xyxy([(0, 0, 100, 50), (50, 50, 150, 100)])
+
+    tlwh = np.array([(0.5, 0.25, 0.5, 0.5)])
+    assert from_array(tlwh, 'tlwh', image_size=(200, 100)) == BoundingBoxArray.from_tlwh([(50, 50, 100, 50)])
+
+
+def test_from_array_invalid():
+    with pytest.raises(ValueError):
+        from_array(np.zeros((2, 4)), layout='yxyx')
+    with pytest.raises(ValueError):
+        from_array(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        from_array([(0, 0, -1, 1)], layout='xywh')
+
+
+def test_from_buffer(boxes: BoundingBoxArray):
+    buffer = boxes.to_xyxy().astype(np.float32).tobytes()
+    assert from_buffer(buffer) == boxes
+    assert from_buffer(buffer, count=10) == boxes[:10]
+    assert from_buffer(buffer, count=10, offset=16 * 5) == boxes[5:15]
+
+    buffer = memoryview(np.stack((boxes.x, boxes.y, boxes.w, boxes.h), axis=1).astype(np.int32))
+    assert from_buffer(buffer, dtype='int32', layout='xywh') == boxes
+
+
+def test_load_npy(boxes: BoundingBoxArray, tmp_path):
+    path = tmp_path / 'boxes.npy'
+    save(path, boxes)
+    loaded = load(path)
+    assert loaded == boxes
+    assert not loaded.x.flags.owndata
+
+    np.save(tmp_path / 'xyxy.npy', boxes.to_xyxy().astype(np.float32))
+    assert load(tmp_path / 'xyxy.npy', layout='xyxy') == boxes
+
+
+def test_load_raw(boxes: BoundingBoxArray, tmp_path):
+    path = tmp_path / 'boxes.bin'
+    with open(path, 'wb') as f:
+        f.write(b'header')
+        f.write(boxes.to_xyxy().astype(np.uint16).tobytes())
+    assert load(path, layout='xyxy', dtype='uint16', offset=6) == boxes
+
+
+def test_iter_chunks(boxes: BoundingBoxArray, tmp_path):
+    path = tmp_path / 'boxes.npy'
+    save(path, boxes)
+    chunks = list(iter_chunks(path, chunk_size=16))
+    assert [len(chunk) for chunk in chunks] == [16, 16, 16, 2]
+    assert all(chunk == boxes[i * 16:(i + 1) * 16] for i, chunk in enumerate(chunks))
@@ -0,0 +1,92 @@
+import json
+from functools import partial
+
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, instrument
+from bbox.measure import iou, union
+from bbox.measure.cache import MetricCache
+from bbox.transform import scaling_all
+
+
+@pytest.fixture
+def boxes():
+    return BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)
+
+
+def test_profile(boxes):
+    bbox1, bbox2 = boxes
+    with instrument.profile() as profile:
+        iou(bbox1, bbox2)
+        union(bbox1, bbox2)
+        BoundingBox(x=0, y=0, w=2, h=2)
+        scaling_all(BoundingBoxArray.from_boxes([bbox1, bbox2, bbox1]), 2.0)
+        with pytest.raises(ValueError):
+            BoundingBox(x=0, y=0, w=-1, h=0)
+    # Only the block is recorded
+    iou(bbox1, bbox2)
+
+    snapshot = profile.snapshot()
+    assert snapshot['measure.iou']['calls'] == 1
+    assert snapshot['measure.iou']['boxes'] == 2
+    assert snapshot['measure.intersect']['calls'] == 1
+    assert snapshot['transform.scaling_all']['boxes'] == 3
+    assert snapshot['BoundingBox.__init__']['calls'] == 2
+    stats = snapshot['measure.union']
+    assert 0 < stats['p50'] <= stats['p90'] <= stats['p99']
+    assert stats['total'] == pytest.approx(stats['mean'] * stats['calls'])
+
+
+def test_profile_restores_methods(boxes):
+    import bbox.measure
+    functions = (iou, bbox.measure.iou, BoundingBox.__dict__['from_xyxy'], BoundingBox.to_xyxy)
+    with instrument.profile():
+        # The functions are wrapped once, only the methods are patched on the classes
+        assert (iou, bbox.measure.iou) == functions[:2]
+        assert BoundingBox.to_xyxy is not functions[3]
+    assert (iou, bbox.measure.iou, BoundingBox.__dict__['from_xyxy'], BoundingBox.to_xyxy) == functions
+    assert '__init__' not in BoundingBox.__dict__
+
+
+def test_profile_stored_references(boxes):
+    # The references taken before the profile are recorded as well
+    cached_iou = MetricCache(iou)
+    metrics = {'iou': iou}
+    scaled = partial(scaling_all, scale=2.0)
+    with instrument.profile() as profile:
+        iou(*boxes)
+        cached_iou(*boxes)
+        metrics['iou'](*boxes)
+        scaled(boxes[0])
+    snapshot = profile.snapshot()
+    assert snapshot['measure.iou']['calls'] == 3
+    assert snapshot['transform.scaling_all']['calls'] == 1
+    assert cached_iou.symmetric
+
+
+def test_nested_profiles(boxes):
+    with instrument.profile() as outer:
+        iou(*boxes)
+        with instrument.profile() as inner:
+            iou(*boxes)
+    assert outer.snapshot()['measure.iou']['calls'] == 2
+    assert inner.snapshot()['measure.iou']['calls'] == 1
+
+
+def test_enable(boxes, tmp_path):
+    instrument.enable()
+    try:
+        assert instrument.is_enabled()
+        iou(*boxes)
+        with instrument.profile():
+            iou(*boxes)
+    finally:
+        instrument.disable()
+    iou(*boxes)
+
+    assert not instrument.is_enabled()
+    assert instrument.snapshot()['measure.iou']['calls'] == 2
+    assert json.loads(instrument.to_json(tmp_path / 'profile.json')) == instrument.snapshot()
+    assert json.loads((tmp_path / 'profile.json').read_text()) == instrument.snapshot()
+    instrument.reset()
+    assert instrument.snapshot() == {}
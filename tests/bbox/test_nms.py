@@ -0,0 +1,119 @@
+import math
+from functools import partial
+from typing import Callable, List
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray, FloatBoundingBoxArray
+from bbox.measure import diou, iou
+from bbox.nms import batched_nms, diou_nms, nms, soft_nms
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, low=0, high=100, max_size=60)
+
+
+def greedy(boxes: BoundingBoxArray, scores: np.ndarray, threshold: float, metric: Callable = iou) -> List[int]:
+    boxes = boxes.to_boxes()
+    keep = []
+    for index in sorted(range(len(boxes)), key=lambda k: -scores[k]):
+        if all(not metric(boxes[index], boxes[k]) > threshold for k in keep):
+            keep.append(index)
+    return keep
+
+
+def test_nms():
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (1, 1, 11, 11), (20, 20, 30, 30)])
+    assert nms(boxes, [0.8, 0.9, 0.7]).tolist() == [1, 2]
+    assert nms(boxes, [0.8, 0.9, 0.7], iou_threshold=0.9).tolist() == [1, 0, 2]
+    assert nms(boxes.to_boxes(), [0.8, 0.9, 0.7]).tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('threshold', (-0.5, 0.0, 0.3, 0.7))
+def test_nms_matches_greedy(seed: int, threshold: float, random_boxes):
+    boxes = random_boxes(200, seed)
+    scores = np.random.default_rng(seed).random(200)
+    assert nms(boxes, scores, threshold).tolist() == greedy(boxes, scores, threshold)
+
+
+@pytest.mark.parametrize('scale', (10, 0.1))
+def test_nms_near_threshold(scale: float):
+    # The pairs just above the threshold are never pruned by the bounds of the sweep
+    xyxy = np.array([(0, 0, 10, 10), (5, 0, 15, 10), (0, 5, 10, 15)]) * scale
+    boxes = BoundingBoxArray.from_xyxy(xyxy) if scale > 1 else FloatBoundingBoxArray.from_xyxy(xyxy)
+    score = iou(boxes[0], boxes[1])
+    assert nms(boxes, [0.9, 0.8, 0.7], np.nextafter(score, 0)).tolist() == [0]
+    assert nms(boxes, [0.9, 0.8, 0.7], score).tolist() == [0, 1, 2]
+    assert diou_nms(boxes, [0.9, 0.8, 0.7], np.nextafter(diou(boxes[0], boxes[1]), 0)).tolist() == [0]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_diou_nms_matches_greedy(seed: int, random_boxes):
+    boxes = random_boxes(200, seed)
+    scores = np.random.default_rng(seed).random(200)
+    assert diou_nms(boxes, scores, 0.3).tolist() == greedy(boxes, scores, 0.3, diou)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batched_nms(seed: int, random_boxes):
+    boxes = random_boxes(200, seed)
+    rng = np.random.default_rng(seed)
+    scores = rng.random(200)
+    labels = rng.integers(0, 4, size=200)
+
+    expected = []
+    for label in range(4):
+        indices = np.flatnonzero(labels == label)
+        expected += indices[greedy(boxes[indices], scores[indices], 0.5)].tolist()
+    keep = batched_nms(boxes, scores, labels, 0.5)
+    assert sorted(keep.tolist()) == sorted(expected)
+    assert np.all(np.diff(scores[keep]) <= 0)
+
+
+def test_empty():
+    boxes = BoundingBoxArray.from_xyxy([])
+    assert nms(boxes, []).tolist() == []
+    assert batched_nms(boxes, [], []).tolist() == []
+    keep, scores = soft_nms(boxes, [])
+    assert keep.tolist() == scores.tolist() == []
+
+
+def test_with_mismatched_scores(random_boxes):
+    with pytest.raises(AssertionError, match=r'expected scores in shape \(3,\)'):
+        nms(random_boxes(3, seed=0), [0.5, 0.5])
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('method', ('linear', 'gaussian'))
+def test_soft_nms(seed: int, method: str, random_boxes):
+    boxes = random_boxes(100, seed)
+    scores = np.random.default_rng(seed).random(100)
+
+    # Reference implementation decaying all the remaining bounding boxes in each step
+    bboxes = boxes.to_boxes()
+    current = scores.tolist()
+    remaining = [k for k in range(100) if current[k] >= 0.001]
+    expected = []
+    while remaining:
+        index = max(remaining, key=lambda k: (current[k], -k))
+        expected.append(index)
+        remaining.remove(index)
+        for k in remaining:
+            overlap = iou(bboxes[index], bboxes[k])
+            if method == 'linear':
+                current[k] *= 1 - overlap if overlap > 0.3 else 1
+            else:
+                current[k] *= math.exp(-overlap ** 2 / 0.5)
+        remaining = [k for k in remaining if current[k] >= 0.001]
+
+    keep, decayed = soft_nms(boxes, scores, method=method)
+    assert keep.tolist() == expected
+    assert decayed.tolist() == pytest.approx([current[k] for k in expected])
+
+
+def test_soft_nms_with_invalid_method(random_boxes):
+    with pytest.raises(AssertionError, match='expected method linear or gaussian, got hard'):
+        soft_nms(random_boxes(3, seed=0), [0.5, 0.5, 0.5], method='hard')
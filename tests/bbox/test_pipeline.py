@@ -0,0 +1,134 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBoxArray
+from bbox.measure import iou_matrix
+from bbox.pipeline import Pipeline, area, height, max_iou, pipe, width, x1, y2
+from bbox.transform import clip, scaling, scaling_all, translate
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    # The even widths and heights are never snapped, so the scaled corners stay integral
+    return partial(random_boxes, high=700, even=True)
+
+
+def test_pipeline_matches_transforms(random_boxes):
+    boxes = random_boxes(1000, 0)
+    pipeline = boxes.pipe().scale(2).translate(3, -4).clip(640, 480).filter(area > 16)
+    assert isinstance(pipeline, Pipeline)
+
+    expected = clip(translate(scaling_all(boxes, 2), 3, -4), 640, 480)
+    expected = expected[expected.area > 16]
+    assert pipeline.collect() == expected
+    # The exact corners are not snapped to the pixels like the ones of the bounding boxes
+    assert BoundingBoxArray.from_xyxy(pipeline.to_xyxy()) == expected
+
+
+def test_pipeline_odd_sizes():
+    boxes = BoundingBoxArray(x=[50], y=[50], w=[11], h=[7])
+    assert boxes.pipe().collect()[0] == BoundingBox(x=50, y=50, w=11, h=7)
+    assert boxes.pipe().to_xyxy().tolist() == [[45, 47, 56, 54]]
+
+    rng = np.random.default_rng(4)
+    xy = rng.integers(-50, 700, size=(2000, 2))
+    boxes = BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + rng.integers(0, 80, size=(2000, 2))), axis=1))
+    assert (boxes.w % 2).any() and (boxes.h % 2).any()
+    assert boxes.pipe().collect() == boxes
+    assert boxes.pipe().translate(3, -2).collect() == translate(boxes, 3, -2)
+    assert boxes.pipe().translate(3, -2).translate(-3, 2).collect() == boxes
+    corners = boxes.pipe().to_xyxy()
+    assert np.array_equal(corners[:, 2] - corners[:, 0], boxes.w)
+    assert np.array_equal(corners[:, 3] - corners[:, 1], boxes.h)
+
+
+def test_pipeline_is_lazy_and_immutable(random_boxes):
+    boxes = random_boxes(100, 0)
+    base = boxes.pipe().translate(10, 10)
+    scaled = base.scale(2, 1)
+    assert base.collect() == translate(boxes, 10, 10)
+    assert scaled.collect() == scaling(translate(boxes, 10, 10), left=2, right=2)
+    assert boxes == random_boxes(100, 0)
+    assert pipe(boxes).collect() == boxes
+
+
+def test_pipeline_rounds_once():
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])
+    # The intermediate corners are not rounded
+    assert pipe(boxes).scale(1.25).scale(0.8).collect() == boxes
+    assert pipe(boxes).scale(1.5).to_xyxy().tolist() == [[-2.5, -2.5, 12.5, 12.5]]
+    assert pipe(boxes).scale(1.5).collect() == BoundingBoxArray.from_xyxy([(-2, -2, 12, 12)])
+
+
+def test_pipeline_float():
+    rng = np.random.default_rng(0)
+    boxes = FloatBoundingBoxArray(rng.uniform(0, 640, 100), rng.uniform(0, 480, 100), rng.uniform(0, 50, 100), rng.uniform(0, 50, 100))
+    result = boxes.pipe().scale(1.5).translate(0.5, -0.25).clip(640, 480).collect()
+    assert isinstance(result, FloatBoundingBoxArray)
+
+    xyxy = scaling_all(boxes, 1.5).to_xyxy() + (0.5, -0.25, 0.5, -0.25)
+    assert np.allclose(result.to_xyxy(), np.clip(xyxy, 0, (640, 480, 640, 480)))
+
+
+def test_pipeline_filter(random_boxes):
+    boxes = random_boxes(500, 1)
+    corners = boxes.to_xyxy()
+    w, h = corners[:, 2] - corners[:, 0], corners[:, 3] - corners[:, 1]
+
+    result = boxes.pipe().filter((width > 20) & ~(height < 10) | (x1 <= 0)).collect()
+    assert result == boxes[((w > 20) & ~(h < 10)) | (corners[:, 0] <= 0)]
+    assert boxes.pipe().filter(width >= height).filter(y2 < 300).collect() == boxes[(w >= h) & (corners[:, 3] < 300)]
+    assert boxes.pipe().filter(lambda corners: corners[0] > 100).collect() == boxes[corners[:, 0] > 100]
+    assert len(boxes.pipe().filter(area < 0).collect()) == 0
+
+
+def test_pipeline_max_iou(random_boxes):
+    boxes = random_boxes(500, 2)
+    zones = BoundingBoxArray.from_xyxy([(0, 0, 100, 100), (300, 300, 400, 350)])
+    result = boxes.pipe().filter(max_iou(zones) > 0.1).collect()
+    assert result == boxes[iou_matrix(boxes, zones).max(axis=1) > 0.1]
+    assert len(boxes.pipe().filter(max_iou(zones[:0]) > 0).collect()) == 0
+
+
+def test_pipeline_iter_chunks(random_boxes):
+    boxes = random_boxes(1000, 3)
+    pipeline = boxes.pipe().scale(2).clip(640, 480).filter(area > 16)
+    chunks = list(pipeline.iter_chunks(128))
+    assert len(chunks) == 8
+    collected = pipeline.collect()
+    assert np.array_equal(np.concatenate([chunk.to_xyxy() for chunk in chunks]), collected.to_xyxy())
+    assert np.array_equal(pipeline.to_xyxy(chunk_size=128), pipeline.to_xyxy())
+    assert BoundingBoxArray.from_xyxy(pipeline.to_xyxy(chunk_size=128)) == collected
+    assert pipeline.collect(chunk_size=7) == collected
+
+    with pytest.raises(AssertionError):
+        next(pipeline.iter_chunks(0))
+
+
+def test_pipeline_stream(random_boxes):
+    frames = [random_boxes(n, seed) for seed, n in enumerate((5, 0, 300, 12))]
+    pipeline = pipe(iter(frames)).translate(5, 5).filter(area > 100)
+
+    # Each frame is yielded even if empty, the large ones are split
+    chunks = list(pipeline.iter_chunks(256))
+    assert [len(chunk) for chunk in chunks[:2]] == [(frames[0].area > 100).sum(), 0]
+    assert len(chunks) == 5
+
+    expected = [translate(frame, 5, 5)[frame.area > 100] for frame in frames]
+    assert pipe(frames).translate(5, 5).filter(area > 100).collect() == BoundingBoxArray.from_xyxy(
+        np.concatenate([frame.to_xyxy() for frame in expected])
+    )
+
+
+def test_pipeline_sources():
+    boxes = [BoundingBox.from_xyxy(0, 0, 10, 10), BoundingBox.from_xyxy(5, 5, 15, 15)]
+    assert pipe(boxes).collect() == BoundingBoxArray.from_boxes(boxes)
+    assert len(pipe([]).collect()) == 0
+    assert pipe([]).to_xyxy().shape == (0, 4)
+
+    with pytest.raises(AssertionError):
+        pipe(boxes).scale(-1)
+    with pytest.raises(AssertionError):
+        pipe(boxes).translate(np.arange(2))
@@ -0,0 +1,143 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, FloatBoundingBox, FloatBoundingBoxArray, RotatedBoundingBox, RotatedBoundingBoxArray
+from bbox.measure import iou_matrix
+from bbox.rotated import _paired_iou, rotated_iou, rotated_iou_matrix, rotated_nms
+
+
+def random_boxes(n: int, seed: int) -> RotatedBoundingBoxArray:
+    rng = np.random.default_rng(seed)
+    return RotatedBoundingBoxArray(
+        rng.uniform(0, 100, n), rng.uniform(0, 100, n),
+        rng.uniform(0, 40, n), rng.uniform(0, 40, n), rng.uniform(-180, 180, n)
+    )
+
+
+def sampled_iou(bbox1: RotatedBoundingBox, bbox2: RotatedBoundingBox, n: int = 1000000) -> float:
+    points = np.random.default_rng(0).uniform(-20, 20, size=(n, 2))
+
+    def inside(bbox: RotatedBoundingBox) -> np.ndarray:
+        radians = np.deg2rad(bbox.angle)
+        dx, dy = points[:, 0] - bbox.x, points[:, 1] - bbox.y
+        u = dx * np.cos(radians) + dy * np.sin(radians)
+        v = dy * np.cos(radians) - dx * np.sin(radians)
+        return (np.abs(u) <= bbox.w / 2) & (np.abs(v) <= bbox.h / 2)
+
+    inside1, inside2 = inside(bbox1), inside(bbox2)
+    return (inside1 & inside2).sum() / (inside1 | inside2).sum()
+
+
+def greedy(boxes: RotatedBoundingBoxArray, scores: np.ndarray, threshold: float) -> List[int]:
+    # The scores of every pair without the prefilter
+    n = len(boxes)
+    i, j = np.divmod(np.arange(n * n), n)
+    matrix = _paired_iou(boxes[i], boxes[j]).reshape(n, n)
+    keep = []
+    for index in sorted(range(n), key=lambda k: -scores[k]):
+        if all(not matrix[index, k] > threshold for k in keep):
+            keep.append(index)
+    return keep
+
+
+def test_rotated_bounding_box():
+    bbox = RotatedBoundingBox(x=0, y=0, w=2, h=2, angle=90)
+    assert bbox.area == 4
+    assert np.allclose(bbox.corners(), [(1, -1), (1, 1), (-1, 1), (-1, -1)])
+
+    aligned = bbox.model_copy(update={'angle': 45}).to_aligned()
+    assert isinstance(aligned, FloatBoundingBox)
+    assert aligned.x == aligned.y == 0
+    assert aligned.w == pytest.approx(2 * np.sqrt(2))
+
+    bbox = RotatedBoundingBox.from_aligned(BoundingBox(x=5, y=5, w=10, h=4), angle=30)
+    assert bbox == RotatedBoundingBox(x=5, y=5, w=10, h=4, angle=30)
+
+    with pytest.raises(ValueError):
+        RotatedBoundingBox(x=0, y=0, w=-1, h=2)
+
+
+def test_rotated_bounding_box_array():
+    boxes = random_boxes(20, 0)
+    assert len(boxes) == 20
+    assert boxes[3] == boxes.to_boxes()[3]
+    assert len(boxes[boxes.angle > 0]) == (boxes.angle > 0).sum()
+    assert RotatedBoundingBoxArray.from_boxes(boxes).corners().tolist() == boxes.corners().tolist()
+
+    corners = boxes.corners()
+    aligned = boxes.to_aligned()
+    assert isinstance(aligned, FloatBoundingBoxArray)
+    assert np.allclose(aligned.to_xyxy(), np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1))
+
+    # The rotation preserves the areas
+    for bbox, polygon in zip(boxes, corners):
+        assert np.linalg.norm(polygon[1] - polygon[0]) == pytest.approx(bbox.w)
+        assert np.linalg.norm(polygon[3] - polygon[0]) == pytest.approx(bbox.h)
+
+    with pytest.raises(ValueError):
+        RotatedBoundingBoxArray([0], [0], [-1], [1])
+    with pytest.raises(ValueError):
+        RotatedBoundingBoxArray([0], [0], [1], [1], [0, 1])
+
+
+def test_rotated_iou():
+    bbox = RotatedBoundingBox(x=0, y=0, w=2, h=2)
+    assert rotated_iou(bbox, bbox) == pytest.approx(1)
+    assert rotated_iou(bbox, bbox.model_copy(update={'angle': 90})) == pytest.approx(1)
+    # The overlap of the square and the rotated one is a regular octagon
+    assert rotated_iou(bbox, bbox.model_copy(update={'angle': 45})) == pytest.approx(1 / np.sqrt(2))
+    assert rotated_iou(bbox, bbox.model_copy(update={'x': 5})) == 0
+    assert rotated_iou(bbox, bbox.model_copy(update={'w': 0})) == 0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rotated_iou_matches_sampling(seed: int):
+    rng = np.random.default_rng(seed)
+    bbox1 = RotatedBoundingBox(x=0, y=0, w=rng.uniform(2, 10), h=rng.uniform(2, 10), angle=rng.uniform(-180, 180))
+    bbox2 = RotatedBoundingBox(
+        x=rng.uniform(-3, 3), y=rng.uniform(-3, 3), w=rng.uniform(2, 10), h=rng.uniform(2, 10), angle=rng.uniform(-180, 180)
+    )
+    assert rotated_iou(bbox1, bbox2) == pytest.approx(sampled_iou(bbox1, bbox2), abs=5e-3)
+
+
+def test_rotated_iou_matrix_without_rotation():
+    rng = np.random.default_rng(0)
+    xy, wh = rng.uniform(0, 100, size=(100, 2)), rng.uniform(0, 40, size=(100, 2))
+    boxes = FloatBoundingBoxArray(xy[:, 0], xy[:, 1], wh[:, 0], wh[:, 1])
+    rotated = RotatedBoundingBoxArray.from_aligned(boxes)
+    assert np.allclose(rotated_iou_matrix(rotated, rotated[:50]), iou_matrix(boxes, boxes[:50]))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_rotated_iou_matrix(seed: int):
+    boxes1, boxes2 = random_boxes(40, seed), random_boxes(30, seed + 10)
+    matrix = rotated_iou_matrix(boxes1, boxes2)
+    assert matrix.shape == (40, 30)
+    expected = [[rotated_iou(bbox1, bbox2) for bbox2 in boxes2] for bbox1 in boxes1]
+    assert np.allclose(matrix, expected)
+    assert np.allclose(rotated_iou_matrix(boxes2, boxes1), matrix.T)
+    assert rotated_iou_matrix(boxes1.to_boxes(), boxes2.to_boxes()).tolist() == matrix.tolist()
+    assert rotated_iou_matrix(boxes1[:0], boxes2).shape == (0, 30)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('threshold', (-0.5, 0.0, 0.3, 0.7))
+def test_rotated_nms_matches_greedy(seed: int, threshold: float):
+    boxes = random_boxes(100, seed)
+    scores = np.random.default_rng(seed).random(100)
+    assert rotated_nms(boxes, scores, threshold).tolist() == greedy(boxes, scores, threshold)
+
+
+def test_rotated_nms():
+    boxes = [
+        RotatedBoundingBox(x=0, y=0, w=10, h=2, angle=45),
+        RotatedBoundingBox(x=0, y=0, w=10, h=2, angle=50),
+        RotatedBoundingBox(x=0, y=0, w=10, h=2, angle=-45)
+    ]
+    # The last one is perpendicular to the others, though all of their enclosing bounding boxes overlap
+    assert rotated_nms(boxes, [0.8, 0.9, 0.7]).tolist() == [1, 2]
+    assert rotated_nms(boxes[:0], []).tolist() == []
+    with pytest.raises(AssertionError):
+        rotated_nms(boxes, [0.8, 0.9])
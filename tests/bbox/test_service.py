@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pytest
+
+from bbox import FloatBoundingBoxArray
+from bbox.measure import giou_matrix, iou_matrix
+from bbox.service import BatchScorer
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, min_size=1)
+
+
+@pytest.fixture
+def requests(random_boxes):
+    return [(random_boxes(n, seed=n), random_boxes(m, seed=m + 100)) for n, m in ((3, 4), (0, 2), (5, 1), (7, 7), (2, 0))]
+
+
+async def client(scorer: BatchScorer, requests):
+    # A stub client sending all the requests concurrently
+    return await asyncio.gather(*(scorer.score(boxes1, boxes2) for boxes1, boxes2 in requests))
+
+
+def test_score(requests):
+    async def main():
+        async with BatchScorer(max_delay=0.01) as scorer:
+            return await client(scorer, requests), scorer.metrics
+
+    results, metrics = asyncio.run(main())
+    for (boxes1, boxes2), scores in zip(requests, results):
+        assert scores.tolist() == iou_matrix(boxes1, boxes2).tolist()
+    assert metrics.requests == 5
+    assert metrics.batches == 1
+    assert metrics.max_batch_size == 5
+    assert metrics.queue_depth == 0
+    assert metrics.p99_latency >= metrics.mean_latency > 0
+
+
+def test_score_with_max_batch_size(requests):
+    async def main():
+        async with BatchScorer(max_batch_size=2, max_delay=0) as scorer:
+            return await client(scorer, requests), scorer.metrics
+
+    results, metrics = asyncio.run(main())
+    for (boxes1, boxes2), scores in zip(requests, results):
+        assert scores.tolist() == iou_matrix(boxes1, boxes2).tolist()
+    assert metrics.batches == 3
+    assert metrics.mean_batch_size == 5 / 3
+
+
+def test_score_in_process_pool(requests, random_boxes):
+    requests = requests + [(FloatBoundingBoxArray.from_xyxy([(0.5, 0.5, 4.5, 3.0)]), random_boxes(3, seed=0))]
+
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            async with BatchScorer('giou', executor=executor) as scorer:
+                return await client(scorer, requests)
+
+    for (boxes1, boxes2), scores in zip(requests, asyncio.run(main())):
+        assert scores.tolist() == giou_matrix(boxes1, boxes2).tolist()
+
+
+def test_score_after_close(requests):
+    async def main():
+        scorer = BatchScorer()
+        await scorer.score(*requests[0])
+        await scorer.close()
+        await scorer.score(*requests[0])
+
+    with pytest.raises(RuntimeError, match='scorer is closed'):
+        asyncio.run(main())
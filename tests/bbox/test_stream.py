@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBox, FloatBoundingBoxArray
+from bbox.measure.batch import _geometry
+from bbox.stream import BoxStream
+from bbox.transform import smallest_enclosing_many
+
+
+def random_frame(rng: np.random.Generator, n: int) -> BoundingBoxArray:
+    xy = rng.integers(-100, 500, size=(n, 2))
+    wh = rng.integers(0, 80, size=(n, 2))
+    return BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + wh), axis=1))
+
+
+def test_delta():
+    stream = BoxStream()
+    delta = stream.update([3, 1], BoundingBoxArray.from_xyxy([(20, 20, 30, 30), (0, 0, 10, 10)]))
+    assert delta.added.tolist() == [1, 3]
+    assert len(delta.moved) == len(delta.removed) == 0
+    assert stream.ids.tolist() == [1, 3]
+    assert stream.boxes == BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (20, 20, 30, 30)])
+
+    delta = stream.update([5, 3, 1], BoundingBoxArray.from_xyxy([(0, 0, 4, 4), (20, 20, 30, 30), (1, 0, 11, 10)]))
+    assert (delta.added.tolist(), delta.moved.tolist(), delta.removed.tolist()) == ([5], [1], [])
+
+    delta = stream.update([5], BoundingBoxArray.from_xyxy([(0, 0, 4, 6)]))
+    assert (delta.added.tolist(), delta.moved.tolist(), delta.removed.tolist()) == ([], [5], [1, 3])
+    assert len(stream) == 1
+
+    delta = stream.update([], BoundingBoxArray.from_xyxy(np.empty((0, 4))))
+    assert delta.removed.tolist() == [5]
+    assert len(stream) == 0 and stream.enclosing is None
+
+    with pytest.raises(AssertionError):
+        stream.update([1, 1], BoundingBoxArray.from_xyxy([(0, 0, 4, 4), (0, 0, 4, 4)]))
+
+
+def test_tolerance():
+    stream = BoxStream(tolerance=2)
+    stream.update([0], [BoundingBox(x=10, y=10, w=10, h=10)])
+    assert len(stream.update([0], [BoundingBox(x=11, y=10, w=10, h=10)]).moved) == 0
+    # The jitters are measured from the recorded bounding box, so they never accumulate
+    assert len(stream.update([0], [BoundingBox(x=12, y=10, w=10, h=10)]).moved) == 0
+    assert stream.update([0], [BoundingBox(x=13, y=10, w=10, h=10)]).moved.tolist() == [0]
+    assert stream.boxes[0] == BoundingBox(x=13, y=10, w=10, h=10)
+
+
+def test_max_age():
+    stream = BoxStream(max_age=2)
+    stream.update([0, 1], BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (20, 20, 30, 30)]))
+    assert len(stream.update([0], BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])).removed) == 0
+    assert len(stream.update([0], BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])).removed) == 0
+    assert stream.ids.tolist() == [0, 1]
+    assert stream.update([0], BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])).removed.tolist() == [1]
+
+    # A bounding box seen again within the age is not added again
+    stream.update([], BoundingBoxArray.from_xyxy(np.empty((0, 4))))
+    assert len(stream.update([0], BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])).added) == 0
+
+
+def test_derived_structures():
+    rng = np.random.default_rng(0)
+    stream = BoxStream(cell_size=32)
+    live = {}
+    for _ in range(60):
+        # Keep, move, drop and add some bounding boxes in each frame
+        ids = [i for i in live if rng.random() > 0.2] + rng.integers(0, 500, size=10).tolist()
+        ids = np.unique(ids)
+        frame = random_frame(rng, len(ids))
+        for k, i in enumerate(ids.tolist()):
+            if i in live and rng.random() < 0.7:
+                frame.x[k], frame.y[k], frame.w[k], frame.h[k] = live[i]
+        stream.update(ids, frame)
+        live = {i: (x, y, w, h) for i, x, y, w, h in zip(ids.tolist(), frame.x, frame.y, frame.w, frame.h)}
+
+        assert stream.ids.tolist() == ids.tolist()
+        assert stream.boxes == frame
+        assert np.array_equal(stream.areas, frame.area)
+        assert stream.enclosing == smallest_enclosing_many(frame)
+
+        query = BoundingBox.from_xyxy(*sorted(rng.integers(-100, 500, 2)), *sorted(rng.integers(-100, 500, 2)))
+        g = _geometry(frame)
+        a1, b1, a2, b2 = query.to_xyxy()
+        overlapping = (np.minimum(g.x2, a2) - np.maximum(g.x1, a1) > 0) & (np.minimum(g.y2, b2) - np.maximum(g.y1, b1) > 0)
+        assert stream.query_intersecting(query).tolist() == ids[overlapping].tolist()
+
+
+def test_ema():
+    stream = BoxStream(smoothing='ema', alpha=0.5)
+    for x in (10, 20, 20):
+        stream.update([0], [BoundingBox(x=x, y=10, w=10, h=10)])
+    assert stream.smoothed.x.tolist() == [17.5]
+    assert stream.boxes.x.tolist() == [20]
+
+    stream = BoxStream(smoothing=None)
+    stream.update([0], [BoundingBox(x=10, y=10, w=10, h=10)])
+    stream.update([0], [BoundingBox(x=20, y=10, w=10, h=10)])
+    assert stream.smoothed.x.tolist() == [20]
+
+
+def test_velocity():
+    stream = BoxStream(smoothing='velocity', alpha=0.5, beta=0.5, max_age=3)
+    for t in range(40):
+        stream.update([0, 1], BoundingBoxArray(x=[3 * t, 0], y=[100 - t, 0], w=[10, 10], h=[10, 10]))
+    # The constant velocity is tracked without lagging behind
+    assert np.allclose(stream.smoothed.x, [117, 0], atol=1e-3)
+    assert np.allclose(stream.smoothed.y, [61, 0], atol=1e-3)
+
+    # The unseen bounding box keeps moving
+    stream.update([1], BoundingBoxArray(x=[0], y=[0], w=[10], h=[10]))
+    stream.update([1], BoundingBoxArray(x=[0], y=[0], w=[10], h=[10]))
+    assert np.allclose(stream.smoothed.x, [123, 0], atol=1e-3)
+    assert stream.boxes.x.tolist() == [117, 0]
+    stream.update([0], BoundingBoxArray(x=[126], y=[58], w=[10], h=[10]))
+    assert np.allclose(stream.smoothed.x[0], 126, atol=1e-3)
+
+
+def test_float():
+    stream = BoxStream()
+    stream.update([0], [BoundingBox(x=10, y=10, w=10, h=10)])
+    stream.update([0, 1], [FloatBoundingBox(x=10.5, y=10, w=10, h=10), BoundingBox(x=0, y=0, w=3, h=3)])
+    assert isinstance(stream.boxes, FloatBoundingBoxArray)
+    assert stream.boxes.x.tolist() == [10.5, 0]
+    assert stream.enclosing == FloatBoundingBox.from_xyxy(-1.5, -1.5, 15.5, 15)
+
+
+def test_growth():
+    rng = np.random.default_rng(1)
+    stream = BoxStream()
+    for start in range(0, 1000, 100):
+        ids = np.arange(start, start + 300)
+        frame = random_frame(rng, len(ids))
+        stream.update(ids, frame)
+        assert stream.boxes == frame
+    assert stream._columns.shape[1] < 1000
@@ -0,0 +1,119 @@
+import itertools
+from functools import partial
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+from bbox.measure import diou, giou, iou
+from bbox.track import associate, cost_matrix, linear_assignment
+
+
+@pytest.fixture
+def random_boxes(random_boxes):
+    return partial(random_boxes, low=0, high=200, min_size=5)
+
+
+def brute_force_assignment(cost: np.ndarray) -> float:
+    n, m = cost.shape
+    if n <= m:
+        totals = (cost[np.arange(n), list(cols)].sum() for cols in itertools.permutations(range(m), n))
+    else:
+        totals = (cost[list(rows), np.arange(m)].sum() for rows in itertools.permutations(range(n), m))
+    return min(totals)
+
+
+@pytest.mark.parametrize('shape', ((1, 1), (3, 3), (4, 6), (6, 4), (5, 5)))
+def test_linear_assignment(shape):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        cost = rng.integers(0, 10, size=shape).astype(np.float64)
+        rows, cols = linear_assignment(cost)
+        assert len(rows) == len(cols) == min(shape)
+        assert len(set(rows.tolist())) == len(set(cols.tolist())) == min(shape)
+        assert rows.tolist() == sorted(rows.tolist())
+        assert cost[rows, cols].sum() == brute_force_assignment(cost)
+
+
+def test_linear_assignment_forbidden():
+    cost = np.array([[1, np.inf], [np.inf, 2]])
+    assert [r.tolist() for r in linear_assignment(cost)] == [[0, 1], [0, 1]]
+    with pytest.raises(ValueError):
+        linear_assignment([[1, np.inf], [2, np.inf]])
+
+
+def test_linear_assignment_empty():
+    rows, cols = linear_assignment(np.empty((0, 3)))
+    assert rows.tolist() == cols.tolist() == []
+
+
+@pytest.mark.parametrize('metric, measure', (('iou', iou), ('giou', giou), ('diou', diou)))
+def test_cost_matrix(metric, measure, random_boxes):
+    tracks, detections = random_boxes(20, seed=1), random_boxes(30, seed=2)
+    expected = [[1 - measure(a, b) for b in detections] for a in tracks]
+    assert cost_matrix(tracks, detections, metric).tolist() == expected
+
+    gated = cost_matrix(tracks, detections, metric, gated=True)
+    intersecting = (cost_matrix(tracks, detections, 'iou') < 1)
+    assert np.isinf(gated[~intersecting]).all()
+    assert gated[intersecting].tolist() == np.array(expected)[intersecting].tolist()
+
+
+@pytest.mark.parametrize('metric', ('iou', 'giou', 'diou'))
+@pytest.mark.parametrize('threshold', (0.1, 0.5))
+def test_associate_optimal(metric, threshold, random_boxes):
+    tracks, detections = random_boxes(40, seed=3), random_boxes(40, seed=4)
+    matches, unmatched_tracks, unmatched_detections = associate(tracks, detections, threshold, metric)
+    cost = cost_matrix(tracks, detections, metric)
+    assert (cost[matches[:, 0], matches[:, 1]] <= 1 - threshold).all()
+    assert sorted(matches[:, 0].tolist() + unmatched_tracks.tolist()) == list(range(len(tracks)))
+    assert sorted(matches[:, 1].tolist() + unmatched_detections.tolist()) == list(range(len(detections)))
+
+    # Same as solving the whole matrix with the pairs below the threshold penalized
+    limit = 1 - threshold
+    penalized = np.where(cost <= limit, cost, limit + 1e-5)
+    rows, cols = linear_assignment(penalized)
+    valid = penalized[rows, cols] <= limit
+    assert np.isclose(cost[matches[:, 0], matches[:, 1]].sum(), cost[rows[valid], cols[valid]].sum())
+    assert len(matches) == valid.sum()
+
+
+def test_associate_greedy(random_boxes):
+    tracks, detections = random_boxes(40, seed=5), random_boxes(40, seed=6)
+    matches, _, _ = associate(tracks, detections, 0.1, method='greedy')
+
+    cost = cost_matrix(tracks, detections)
+    expected = []
+    while cost.size and cost.min() <= 0.9:
+        row, col = np.unravel_index(np.argmin(cost), cost.shape)
+        expected.append((int(row), int(col)))
+        cost[row], cost[:, col] = np.inf, np.inf
+    assert sorted(map(tuple, matches.tolist())) == sorted(expected)
+
+
+def test_associate_moving():
+    rng = np.random.default_rng(7)
+    xy = rng.integers(0, 1000, size=(100, 2))
+    tracks = BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + rng.integers(20, 40, size=(100, 2))), axis=1))
+    order = rng.permutation(len(tracks))
+    detections = BoundingBoxArray.from_xyxy(tracks[order].to_xyxy() + rng.integers(-2, 3, size=(100, 4)))
+    matches, unmatched_tracks, unmatched_detections = associate(tracks, detections, threshold=0.3)
+    assert order[matches[:, 1]].tolist() == matches[:, 0].tolist() == list(range(100))
+    assert unmatched_tracks.tolist() == unmatched_detections.tolist() == []
+
+
+def test_associate_empty(random_boxes):
+    tracks = random_boxes(3, seed=8)
+    matches, unmatched_tracks, unmatched_detections = associate(tracks, BoundingBoxArray.from_xyxy([]))
+    assert matches.shape == (0, 2)
+    assert unmatched_tracks.tolist() == [0, 1, 2]
+    assert unmatched_detections.tolist() == []
+
+
+def test_example():
+    tracks = BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (20, 20, 30, 30)])
+    detections = BoundingBoxArray.from_xyxy([(21, 21, 31, 31), (100, 100, 110, 110), (1, 1, 11, 11)])
+    matches, unmatched_tracks, unmatched_detections = associate(tracks, detections, threshold=0.3)
+    assert matches.tolist() == [[0, 2], [1, 0]]
+    assert unmatched_tracks.tolist() == []
+    assert unmatched_detections.tolist() == [1]
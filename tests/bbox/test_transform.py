@@ -1,9 +1,11 @@
 from typing import Tuple
 
+import numpy as np
 import pytest
 
-from bbox import BoundingBox
-from bbox.transform import bound, scaling, scaling_all, smallest_enclosing
+from bbox import BoundingBox, BoundingBoxArray, FloatBoundingBox, FloatBoundingBoxArray
+from bbox.transform import (bound, clip, rescale, scaling, scaling_all, smallest_enclosing,
+                            smallest_enclosing_many, translate, unletterbox)
 
 XYXY = Tuple[int, int, int, int]
 
@@ -74,3 +76,135 @@ def test_scaling_all_with_negative_scale():
     bbox = BoundingBox.from_xyxy(0, 0, 100, 100)
     with pytest.raises(AssertionError, match='scale cannot be negative'):
         scaling_all(bbox, scale=-0.1)
+
+
+def test_smallest_enclosing_many(random_boxes):
+    boxes = random_boxes(50, seed=0)
+    for bbox1, bbox2 in zip(boxes[:25], boxes[25:]):
+        assert smallest_enclosing_many([bbox1, bbox2]) == smallest_enclosing(bbox1, bbox2)
+
+    xyxy = boxes.to_xyxy()
+    assert smallest_enclosing_many(boxes).to_xyxy() == BoundingBox.from_xyxy(
+        xyxy[:, 0].min(), xyxy[:, 1].min(), xyxy[:, 2].max(), xyxy[:, 3].max()
+    ).to_xyxy()
+
+
+def test_smallest_enclosing_many_with_labels(random_boxes):
+    boxes = random_boxes(50, seed=1)
+    labels = np.random.default_rng(1).integers(0, 5, size=50) * 10
+    unique_labels, enclosing = smallest_enclosing_many(boxes, labels)
+    assert unique_labels.tolist() == sorted(set(labels.tolist()))
+    assert enclosing.to_boxes() == [smallest_enclosing_many(boxes[labels == label]) for label in unique_labels]
+
+
+def test_smallest_enclosing_many_with_empty_boxes():
+    unique_labels, enclosing = smallest_enclosing_many(BoundingBoxArray.from_xyxy([]), [])
+    assert len(unique_labels) == len(enclosing) == 0
+    with pytest.raises(AssertionError, match='expected at least one bounding box'):
+        smallest_enclosing_many(BoundingBoxArray.from_xyxy([]))
+
+
+@pytest.mark.parametrize(
+    'top,bottom,left,right', (
+        (1.0, 1.0, 1.0, 1.0),
+        (2.0, 1.0, 0.0, 3.0),
+        (0.0, 0.0, 0.0, 0.0)
+    )
+)
+def test_scaling_array(top: float, bottom: float, left: float, right: float, random_boxes):
+    boxes = random_boxes(50, seed=2)
+    assert scaling(boxes, top, bottom, left, right).to_boxes() == [scaling(bbox, top, bottom, left, right) for bbox in boxes]
+
+
+def test_scaling_array_with_fractional_corner():
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 10, 10)])
+    with pytest.raises(ValueError):
+        scaling(boxes, top=1.1)
+
+
+def test_scaling_all_array(random_boxes):
+    boxes = random_boxes(50, seed=3)
+    assert scaling_all(boxes, 2.0).to_boxes() == [scaling_all(bbox, 2.0) for bbox in boxes]
+
+
+def test_translate(random_boxes):
+    boxes = random_boxes(50, seed=4)
+    assert translate(boxes, 3, -2).to_boxes() == [BoundingBox(x=bbox.x + 3, y=bbox.y - 2, w=bbox.w, h=bbox.h) for bbox in boxes]
+    assert translate(boxes, dx=np.arange(50)).x.tolist() == (boxes.x + np.arange(50)).tolist()
+
+
+def test_clip():
+    boxes = BoundingBoxArray.from_xyxy([(-10, -10, 10, 10), (90, 5, 110, 15), (200, 200, 300, 300), (20, 20, 40, 40)])
+    assert clip(boxes, 100, 50) == BoundingBoxArray.from_xyxy([(0, 0, 10, 10), (90, 5, 100, 15), (100, 50, 100, 50), (20, 20, 40, 40)])
+
+
+def test_rescale():
+    boxes = BoundingBoxArray.from_xyxy([(0, 0, 320, 320), (10, 20, 30, 40)])
+    assert rescale(boxes, (640, 640), (1280, 960)) == BoundingBoxArray.from_xyxy([(0, 0, 640, 480), (20, 30, 60, 60)])
+
+
+def test_clip_and_rescale_with_odd_sizes(random_boxes):
+    # The odd widths and heights are kept rather than snapped by `to_xyxy`
+    boxes = BoundingBoxArray(x=[50, 2], y=[50, 2], w=[11, 11], h=[7, 7])
+    assert clip(boxes, 640, 480) == BoundingBoxArray.from_xyxy([(45, 47, 56, 54), (0, 0, 8, 6)])
+    assert rescale(boxes, (640, 480), (640, 480)) == boxes
+    assert rescale(boxes, (640, 480), (1280, 960)) == BoundingBoxArray.from_xyxy([(90, 94, 112, 108), (-6, -2, 16, 12)])
+
+    boxes = random_boxes(200, seed=5)
+    assert (boxes.w % 2).any()
+    assert clip(translate(boxes, 100, 100), 1000, 1000) == translate(boxes, 100, 100)
+
+
+def test_unletterbox():
+    # A 1280x720 image is letterboxed into 640x640 with ratio 0.5 and vertical padding 140
+    boxes = BoundingBoxArray.from_xyxy([(0, 140, 640, 500), (100, 150, 200, 250), (0, 0, 640, 140)])
+    assert unletterbox(boxes, (1280, 720), (640, 640)) == BoundingBoxArray.from_xyxy([(0, 0, 1280, 720), (200, 20, 400, 220), (0, 0, 1280, 0)])
+    assert unletterbox(boxes[2:], (1280, 720), (640, 640), clipped=False) == BoundingBoxArray.from_xyxy([(0, -280, 1280, 0)])
+
+
+def test_scaling_in_subpixel_precision():
+    bbox = FloatBoundingBox.from_xyxy(0, 0, 5, 3)
+    assert scaling(bbox, top=2.0, right=1.5).to_xyxy() == (0, -1.5, 6.25, 3)
+    assert scaling_all(FloatBoundingBoxArray.from_boxes([bbox]), 0.5).to_xyxy().tolist() == [[1.25, 0.75, 3.75, 2.25]]
+    assert smallest_enclosing(bbox, FloatBoundingBox.from_xyxy(1, 1, 7, 2)).to_xyxy() == (0, 0, 7, 3)
+
+
+def test_transforms_in_subpixel_precision():
+    boxes = FloatBoundingBoxArray.from_xyxy([(0.5, 0.5, 10.25, 10.75), (-2.5, 3.25, 4.5, 8)])
+
+    moved = translate(boxes, 1.5, -0.25)
+    assert isinstance(moved, FloatBoundingBoxArray)
+    assert moved.to_xyxy().tolist() == [[2, 0.25, 11.75, 10.5], [-1, 3, 6, 7.75]]
+
+    clipped = clip(boxes, 8.5, 9)
+    assert isinstance(clipped, FloatBoundingBoxArray)
+    assert clipped.to_xyxy().tolist() == [[0.5, 0.5, 8.5, 9], [0, 3.25, 4.5, 8]]
+
+    # The corners are not rounded to the pixels
+    rescaled = rescale(boxes, (10, 10), (20, 5))
+    assert isinstance(rescaled, FloatBoundingBoxArray)
+    assert rescaled.to_xyxy().tolist() == [[1, 0.25, 20.5, 5.375], [-5, 1.625, 9, 4]]
+
+    # A 20x10 image is letterboxed into 10x10 with ratio 0.5 and vertical padding 2.5
+    restored = unletterbox(boxes, (20, 10), (10, 10))
+    assert isinstance(restored, FloatBoundingBoxArray)
+    assert restored.to_xyxy().tolist() == [[1, 0, 20, 10], [0, 1.5, 9, 10]]
+    assert unletterbox(boxes, (20, 10), (10, 10), clipped=False).to_xyxy().tolist() == [[1, -4, 20.5, 16.5], [-5, 1.5, 9, 11]]
+
+
+def test_smallest_enclosing_many_in_subpixel_precision():
+    boxes = FloatBoundingBoxArray.from_xyxy([(0.5, 0.5, 10.25, 10.75), (-2.5, 3.25, 4.5, 8), (20, 20, 21.5, 22)])
+    enclosing = smallest_enclosing_many(boxes)
+    assert isinstance(enclosing, FloatBoundingBox)
+    assert enclosing.to_xyxy() == (-2.5, 0.5, 21.5, 22)
+
+    labels, enclosing = smallest_enclosing_many(boxes, labels=[1, 1, 0])
+    assert labels.tolist() == [0, 1]
+    assert isinstance(enclosing, FloatBoundingBoxArray)
+    assert enclosing.to_xyxy().tolist() == [[20, 20, 21.5, 22], [-2.5, 0.5, 10.25, 10.75]]
+
+    labels, enclosing = smallest_enclosing_many(boxes[:0], labels=[])
+    assert isinstance(enclosing, FloatBoundingBoxArray) and len(enclosing) == 0
+
+    # A list of bounding boxes with any one in sub-pixel precision is enclosed in sub-pixel precision
+    assert smallest_enclosing_many([BoundingBox.from_xyxy(0, 0, 4, 4), FloatBoundingBox.from_xyxy(1, 1, 4.5, 2)]) == FloatBoundingBox.from_xyxy(0, 0, 4.5, 4)
@@ -0,0 +1,40 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from bbox import BoundingBoxArray
+
+
+def _random_boxes(
+    n: int, seed: int, low: int = -50, high: int = 50, min_size: int = 0, max_size: int = 40, even: bool = False
+) -> BoundingBoxArray:
+    """
+    Generate the random bounding boxes shared by the tests.
+
+    Args:
+        n (int): The number of the bounding boxes.
+        seed (int): The seed of the random generator.
+        low (int, optional): The lower bound of the top-left corners, inclusively. Defaults to -50.
+        high (int, optional): The upper bound of the top-left corners, exclusively. Defaults to 50.
+        min_size (int, optional): The lower bound of the widths and heights, inclusively. Defaults to 0.
+        max_size (int, optional): The upper bound of the widths and heights, exclusively. Defaults to 40.
+        even (bool, optional): Whether to double the widths and heights, so they are never snapped. Defaults to False.
+
+    Returns:
+        BoundingBoxArray: The bounding boxes.
+    """
+    rng = np.random.default_rng(seed)
+    xy = rng.integers(low, high, size=(n, 2))
+    wh = rng.integers(min_size, max_size, size=(n, 2))
+    if even:
+        wh *= 2
+    return BoundingBoxArray.from_xyxy(np.concatenate((xy, xy + wh), axis=1))
+
+
+@pytest.fixture(scope='session')
+def random_boxes() -> Callable[..., BoundingBoxArray]:
+    """
+    The generator of the random bounding boxes, the test modules override it with `functools.partial` to bind their ranges.
+    """
+    return _random_boxes